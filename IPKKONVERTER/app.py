@@ -1,30 +1,103 @@
-import streamlit as st
-
-def sort_numbers(a, b, c):
-    """Fungsi untuk mengurutkan tiga bilangan."""
-    numbers = [a, b, c]
-    # Menggunakan fungsi sort bawaan Python lebih sederhana dan efisien
-    numbers.sort()
-    return numbers
-
-st.title("🔢 Pengurut Tiga Bilangan Sederhana")
-
-st.write("Masukkan tiga bilangan di bawah ini:")
-
-# Input bilangan dari pengguna menggunakan widget number_input
-# st.number_input memungkinkan pengguna memasukkan angka
-a = st.number_input("Masukkan bilangan pertama (a):", value=0, step=1)
-b = st.number_input("Masukkan bilangan kedua (b):", value=0, step=1)
-c = st.number_input("Masukkan bilangan ketiga (c):", value=0, step=1)
-
-# Tombol untuk menjalankan pengurutan
-if st.button("Urutkan!"):
-    # Memastikan semua input telah diberikan (meskipun number_input selalu memiliki nilai)
-    if a is not None and b is not None and c is not None:
-        # Panggil fungsi pengurutan
-        sorted_list = sort_numbers(a, b, c)
-
-        # Tampilkan hasil
-        st.success(f"Urutan bilangan dari yang paling kecil adalah: {sorted_list[0]}, {sorted_list[1]}, {sorted_list[2]}")
-    else:
-        st.error("Pastikan Anda memasukkan ketiga bilangan.")
+import hashlib
+import sys
+from pathlib import Path
+import streamlit as st
+
+# Paket bersama virtual_lab berada di akar repo (ditambahkan sekali, bukan di setiap rerun)
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from virtual_lab.cache import get_cache
+from virtual_lab.debug import show_cache_panel
+from virtual_lab.metrics import begin_rerun, end_rerun, rerun_phase
+from virtual_lab.pengurut import load_sheet, rank_rows, sort_numbers, sort_rows
+from virtual_lab.session import session_owner
+from virtual_lab.tables import export_buttons, paged_table
+
+# Isi file unggahan (berkunci sha1) dan hasil pengurutannya, dipakai ulang antar-rerun dan sesi
+SHEET_CACHE = "pengurut: berkas"
+RESULT_CACHE = "pengurut: hasil"
+sheet_cache = get_cache(SHEET_CACHE, max_entries=16, max_bytes=512 * 1024**2)
+result_cache = get_cache(RESULT_CACHE, max_entries=32, max_bytes=512 * 1024**2)
+
+ROW_MODE = "Setiap baris"
+RANK_MODE = "Seluruh baris menurut kolom (peringkat)"
+
+def sorted_columns(sheet, mode, column, descending):
+    """Kolom tabel hasil {nama: array}: baris terurut, atau seluruh baris beserta peringkatnya"""
+    if mode == ROW_MODE:
+        values = sort_rows(sheet.values, descending)
+        columns = dict(sheet.labels)
+        columns.update({f"ke-{j + 1}": values[:, j] for j in range(values.shape[1])})
+        return columns
+    order, ranks = rank_rows(sheet.values[:, sheet.value_names.index(column)], descending)
+    columns = {"Peringkat": ranks[order]}
+    columns.update({name: cells[order] for name, cells in sheet.labels.items()})
+    columns.update({name: sheet.values[order, j] for j, name in enumerate(sheet.value_names)})
+    return columns
+
+# Waktu dan memori rerun ini dicatat per fase (ekspor VIRTUAL_LAB_METRICS)
+begin_rerun("pengurut", session_owner())
+
+st.title("🔢 Pengurut Tiga Bilangan Sederhana")
+
+rerun_phase("widget")
+mode = st.radio("Mode", ("Tiga Bilangan", "Massal (unggah CSV/XLSX)"), horizontal=True)
+
+if mode == "Tiga Bilangan":
+    st.write("Masukkan tiga bilangan di bawah ini:")
+
+    # Input bilangan dari pengguna menggunakan widget number_input
+    # st.number_input memungkinkan pengguna memasukkan angka. Ketiganya ada di satu form,
+    # jadi mengetik bilangan tidak menjalankan ulang skrip; hanya tombol Urutkan! yang mengirimnya.
+    with st.form("bilangan"):
+        a = st.number_input("Masukkan bilangan pertama (a):", value=0, step=1)
+        b = st.number_input("Masukkan bilangan kedua (b):", value=0, step=1)
+        c = st.number_input("Masukkan bilangan ketiga (c):", value=0, step=1)
+        # Tombol untuk menjalankan pengurutan
+        submitted = st.form_submit_button("Urutkan!")
+    rerun_phase("skrip")
+
+    if submitted:
+        # Memastikan semua input telah diberikan (meskipun number_input selalu memiliki nilai)
+        if a is not None and b is not None and c is not None:
+            # Panggil fungsi pengurutan
+            sorted_list = sort_numbers(a, b, c)
+
+            # Tampilkan hasil
+            st.success(f"Urutan bilangan dari yang paling kecil adalah: {sorted_list[0]}, {sorted_list[1]}, {sorted_list[2]}")
+        else:
+            st.error("Pastikan Anda memasukkan ketiga bilangan.")
+else:
+    # Mode massal: lembar nilai (misalnya satu baris per siswa) dengan lebar baris berapa pun
+    st.write("Unggah lembar nilai CSV (pemisah koma, titik koma, atau tab) atau XLSX.")
+    upload = st.file_uploader("File nilai", type=["csv", "xlsx"])
+    if upload is None:
+        rerun_phase("skrip")
+        st.info("Kolom teks (misalnya nama) ikut ditampilkan; sel kosong diletakkan di akhir urutan.")
+    else:
+        data = upload.getvalue()
+        digest = hashlib.sha1(data).hexdigest()
+        try:
+            sheet = sheet_cache.get_or_compute((digest, upload.name.lower().endswith(".xlsx")), lambda: load_sheet(data, upload.name))
+        except ValueError as e:
+            rerun_phase("skrip")
+            st.error(f"File tidak bisa dibaca: {e}")
+        else:
+            st.caption(f"{len(sheet.values):,} baris × {len(sheet.value_names)} kolom angka: {', '.join(sheet.value_names)}")
+            with st.form("massal"):
+                sort_mode = st.radio("Jenis Pengurutan", (ROW_MODE, RANK_MODE))
+                column = st.selectbox("Kolom acuan peringkat", sheet.value_names)
+                descending = st.toggle("Urutan turun (terbesar dulu)")
+                st.form_submit_button("Urutkan!")
+            rerun_phase("skrip")
+
+            key = (digest, sort_mode, column if sort_mode == RANK_MODE else None, descending)
+            # Waktu pengurutan tercatat sebagai fase "hitung" (otomatis di get_or_compute)
+            columns = result_cache.get_or_compute(key, lambda: sorted_columns(sheet, sort_mode, column, descending))
+            stem = Path(upload.name).stem
+            paged_table("pengurut", "massal", columns)
+            export_buttons(columns, f"{stem}-terurut", "massal")
+
+end_rerun()
+show_cache_panel()
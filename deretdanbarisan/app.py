@@ -1,14 +1,49 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.colors import SymLogNorm
+import sys
+from pathlib import Path
+
+# Paket bersama virtual_lab berada di akar repo (ditambahkan sekali, bukan di setiap rerun)
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from virtual_lab.barisan import calculate_sequences, calculate_sweep, calculate_term, format_term, parse_index
+from virtual_lab.cache import get_cache
+from virtual_lab.charts import chart_backend
+from virtual_lab.debug import show_cache_panel
+from virtual_lab.deret import (
+    SEQUENCE_CACHE, FIGURE_CACHE, render_sequence_pngs, sequence_charts, sequence_key,
+    sequence_figure_key
+)
+from virtual_lab.figures import figure_manager, figure_to_png
+from virtual_lab.fragments import lab_fragment
+from virtual_lab.jobs import cached_job, follow
+from virtual_lab.metrics import begin_rerun, end_rerun, rerun_phase, span
+from virtual_lab.session import session_owner
+from virtual_lab.store import get_store
+from virtual_lab.tables import PAGE_ROWS, export_buttons, paged_table
+from virtual_lab.warmer import start_warmer
 
 # --- Konfigurasi Halaman Streamlit ---
 st.set_page_config(layout="wide", page_title="Virtual Lab Deret dan Barisan")
+# Waktu dan memori rerun ini dicatat per fase (panel debug ?debug=1 dan ekspor VIRTUAL_LAB_METRICS)
+begin_rerun("deret", session_owner())
 
 st.title("🔢 Virtual Lab Deret & Barisan Interaktif")
 st.markdown("Eksplorasi Barisan Aritmatika dan Geometri, serta perhitungan Deretnya.")
 
+# --- Batas Tampilan ---
+MAX_N = 10_000_000        # Batas atas input N
+
+# --- Cache Bersama (semua sesi dalam satu proses, dan semua replika lewat disk) ---
+sequence_cache = get_cache(SEQUENCE_CACHE, max_entries=64, max_bytes=512 * 1024**2, store=get_store())
+figure_cache = get_cache(FIGURE_CACHE, max_entries=512, max_bytes=128 * 1024**2, store=get_store())
+# Kombinasi slider umum dihitung lebih dulu di proses latar (sekali per host)
+start_warmer("deret")
+
 # --- Sidebar untuk Pengaturan Utama ---
+rerun_phase("widget")
 st.sidebar.title("⚙️ Pengaturan Barisan")
 
 # Pilihan Jenis Barisan
@@ -19,7 +54,8 @@ sequence_type = st.sidebar.selectbox(
 
 st.sidebar.subheader("➡️ Parameter")
 a = st.sidebar.number_input("Suku Awal (a)", value=2)
-n_max = st.sidebar.slider("Batas Suku (N)", 5, 20, 10)
+# N bisa sampai jutaan suku karena perhitungan memakai rumus tertutup (vektor NumPy)
+n_max = int(st.sidebar.number_input("Batas Suku (N)", min_value=5, max_value=MAX_N, value=10, step=1))
 
 # Parameter Khusus
 if sequence_type == "Aritmatika":
@@ -30,34 +66,86 @@ elif sequence_type == "Geometri":
     diff_or_ratio = st.sidebar.slider("Rasio (r)", -2.0, 2.0, 1.5)
     r = diff_or_ratio
 
-# --- Fungsi Perhitungan Barisan dan Deret ---
+st.sidebar.markdown("---")
+backend = chart_backend()
+rerun_phase("skrip")
 
-def calculate_sequences(a, param, N, type):
-    """Menghitung suku (Un) dan jumlah deret (Sn)"""
-    U = np.zeros(N)
-    S = np.zeros(N)
-    
-    current_sum = 0
-    for i in range(N):
-        n = i + 1 # n dimulai dari 1
-        
-        if type == "Aritmatika":
-            # Un = a + (n-1)b
-            Un = a + (n - 1) * param 
-        elif type == "Geometri":
-            # Un = a * r^(n-1)
-            Un = a * (param ** (n - 1))
-            
-        U[i] = Un
-        current_sum += Un
-        S[i] = current_sum
-        
-    return U, S
+# --- Fungsi Sapuan Parameter (banyak a dan b/r sekaligus) ---
+
+MAX_SWEEP_CELLS = 4_000_000  # Batas ukuran array (jumlah a x jumlah b/r x N) pada mode sapuan
+
+def plot_sweep_heatmap(ax, values, extent, param_symbol, title):
+    """Heatmap nilai pada grid (a, b/r) dengan skala warna symlog"""
+    finite = values[np.isfinite(values)]
+    vmax = max(np.max(np.abs(finite)), 1.0) if finite.size else 1.0
+    image = ax.imshow(
+        values, origin="lower", aspect="auto", extent=extent, cmap="coolwarm",
+        norm=SymLogNorm(linthresh=1.0, vmin=-vmax, vmax=vmax)
+    )
+    ax.set_title(title)
+    ax.set_xlabel(f"${param_symbol}$")
+    ax.set_ylabel("$a$")
+    return image
+
+# --- Fungsi Gambar Sapuan (hasilnya disimpan sebagai PNG di cache) ---
+
+def render_sweep_figures(a_values, p_values, n_sweep, sequence_type, param_symbol, owner, on_chunk=None):
+    """Dua heatmap sapuan parameter sebagai pasangan PNG (kiri, kanan)"""
+    U_sweep, S_sweep = calculate_sweep(a_values, p_values, n_sweep, sequence_type, on_chunk)
+    S_last = S_sweep[:, :, -1]
+    extent = (p_values[0], p_values[-1], a_values[0], a_values[-1])
 
-# Hitung hasil
-U_n, S_n = calculate_sequences(a, diff_or_ratio, n_max, sequence_type)
+    # Heatmap jarang digambar ulang: figure sesi dipakai ulang, isinya dibangun dari kosong
+    with figure_manager.use(owner, "deret: sapuan kiri", (6, 5)) as (fig_sw, _):
+        fig_sw.clear()
+        ax_sw = fig_sw.subplots()
+        image = plot_sweep_heatmap(ax_sw, S_last, extent, param_symbol, f"$S_{{{n_sweep}}}$ untuk setiap ($a$, ${param_symbol}$)")
+        if sequence_type == "Geometri":
+            # Daerah konvergen |r| < 1 ditandai dengan arsiran
+            ax_sw.axvspan(max(-1, p_values[0]), min(1, p_values[-1]), facecolor="none", edgecolor="black", hatch="//", alpha=0.4, label="|r| < 1 (konvergen)")
+            ax_sw.legend(loc="upper right")
+        fig_sw.colorbar(image, ax=ax_sw)
+        png_left = figure_to_png(fig_sw)
+
+    with figure_manager.use(owner, "deret: sapuan kanan", (6, 5)) as (fig_sw2, _):
+        fig_sw2.clear()
+        ax_sw2 = fig_sw2.subplots()
+        if sequence_type == "Geometri":
+            # Seberapa dekat S_N ke S_inf = a / (1 - r) di daerah konvergen
+            convergent = np.abs(p_values) < 1
+            with np.errstate(divide="ignore", invalid="ignore"):
+                S_inf_grid = a_values[:, None] / (1 - p_values[None, :])
+                gap = np.log10(np.abs(S_last - S_inf_grid))
+            gap[:, ~convergent] = np.nan
+            image2 = ax_sw2.imshow(gap, origin="lower", aspect="auto", extent=extent, cmap="viridis_r")
+            ax_sw2.set_title(f"$\\log_{{10}}|S_{{{n_sweep}}} - S_\\infty|$ (hanya $|r| < 1$)")
+            ax_sw2.set_xlabel("$r$")
+            ax_sw2.set_ylabel("$a$")
+        else:
+            image2 = plot_sweep_heatmap(ax_sw2, U_sweep[:, :, -1], extent, param_symbol, f"$U_{{{n_sweep}}}$ untuk setiap ($a$, $b$)")
+        fig_sw2.colorbar(image2, ax=ax_sw2)
+        png_right = figure_to_png(fig_sw2)
+
+    return png_left, png_right
+
+# Hitung hasil (kunci cache = seluruh tuple parameter)
+U_n, S_n = sequence_cache.get_or_compute(
+    sequence_key(sequence_type, a, diff_or_ratio, n_max),
+    lambda: calculate_sequences(a, diff_or_ratio, n_max, sequence_type),
+)
 indices = np.arange(1, n_max + 1) # Indeks n = 1, 2, 3, ... N
 
+# Untuk N besar, grafik cukup memakai sebagian titik (dijarangkan merata)
+if backend == "vega":
+    # Grafik vektor: hanya data dan spesifikasi yang dikirim, browser yang menggambar
+    with span("vega"):
+        chart_u, chart_s = sequence_charts(U_n, S_n, sequence_type, diff_or_ratio)
+else:
+    png_u, png_s = figure_cache.get_or_compute(
+        sequence_figure_key(sequence_type, a, diff_or_ratio, n_max),
+        lambda: render_sequence_pngs(U_n, S_n, sequence_type, diff_or_ratio, session_owner()),
+    )
+
 # --- Bagian Utama: Visualisasi ---
 st.header(f"Visualisasi Barisan {sequence_type}")
 
@@ -65,51 +153,37 @@ col1, col2 = st.columns([1, 1])
 
 with col1:
     st.subheader("Grafik Nilai Suku ($U_n$)")
-    fig_u, ax_u = plt.subplots(figsize=(6, 4))
-    
-    # Plot Un vs n
-    if sequence_type == "Aritmatika":
-        ax_u.plot(indices, U_n, 'bo-', label='Barisan Aritmatika', linewidth=2)
-        ax_u.set_title(f'Pertumbuhan Linear (Beda = {b})')
+    if backend == "vega":
+        with span("vega"):
+            st.altair_chart(chart_u, width="stretch")
     else:
-        ax_u.plot(indices, U_n, 'ro-', label='Barisan Geometri', linewidth=2)
-        ax_u.set_title(f'Pertumbuhan Eksponensial (Rasio = {r})')
-        
-    ax_u.set_xlabel("Indeks Suku (n)")
-    ax_u.set_ylabel("Nilai Suku ($U_n$)")
-    ax_u.grid(True, linestyle=':', alpha=0.7)
-    ax_u.legend()
-    st.pyplot(fig_u)
-    
-
-[Image of geometric sequence and arithmetic sequence plots for comparison showing linear and exponential growth]
+        st.image(png_u, width="stretch")
 
+# [Image of geometric sequence and arithmetic sequence plots for comparison showing linear and exponential growth]
 
 
 with col2:
     st.subheader("Grafik Jumlah Deret ($S_n$)")
-    fig_s, ax_s = plt.subplots(figsize=(6, 4))
-    
-    # Plot Sn vs n
-    ax_s.plot(indices, S_n, 'g^-', label='Jumlah Deret', linewidth=2)
-    ax_s.set_title(f'Akumulasi {sequence_type}')
-    ax_s.set_xlabel("Indeks Suku (n)")
-    ax_s.set_ylabel("Jumlah Deret ($S_n$)")
-    ax_s.grid(True, linestyle=':', alpha=0.7)
-    ax_s.legend()
-    st.pyplot(fig_s)
+    if backend == "vega":
+        with span("vega"):
+            st.altair_chart(chart_s, width="stretch")
+    else:
+        st.image(png_s, width="stretch")
 
 # --- Detail Matematis dan Hasil ---
 st.markdown("---")
 st.header("📚 Detail Perhitungan")
 
-# 1. Matriks Hasil
-data = {
+# 1. Matriks Hasil: array U_n dan S_n dipakai langsung (Arrow, tanpa salinan), satu halaman per tampilan
+columns = {
     'n': indices,
-    f'Un (Suku ke-{sequence_type})': np.round(U_n, 4),
-    f'Sn (Jumlah Deret)': np.round(S_n, 4)
+    f'Un (Suku ke-{sequence_type})': U_n,
+    'Sn (Jumlah Deret)': S_n,
 }
-df_results = st.dataframe(data, height=300)
+if n_max > PAGE_ROWS:
+    st.caption(f"$U_N = {U_n[-1]:.6g}$, $S_N = {S_n[-1]:.6g}$.")
+paged_table("deret", "hasil", columns, digits=4)
+export_buttons(columns, f"deret-{sequence_type.lower()}-N{n_max}", "hasil")
 
 # 2. Rumus dan Penjelasan
 st.subheader("Rumus Utama")
@@ -117,12 +191,12 @@ st.subheader("Rumus Utama")
 if sequence_type == "Aritmatika":
     st.markdown(f"**Barisan Aritmatika** (Beda, $b = {b}$)")
     st.latex(f"U_n = a + (n-1)b \\rightarrow U_n = {a} + (n-1){b}")
-    st.latex(f"S_n = \\frac{{n}}{{2}} (a + U_n) \\text{ atau } S_n = \\frac{{n}}{{2}} (2a + (n-1)b)")
+    st.latex(f"S_n = \\frac{{n}}{{2}} (a + U_n) \\text{{ atau }} S_n = \\frac{{n}}{{2}} (2a + (n-1)b)")
 
 elif sequence_type == "Geometri":
     st.markdown(f"**Barisan Geometri** (Rasio, $r = {r}$)")
     st.latex(f"U_n = a \\cdot r^{{n-1}} \\rightarrow U_n = {a} \\cdot ({r})^{{n-1}}")
-    st.latex(f"S_n = \\frac{{a(r^n - 1)}}{{r-1}} \\text{ untuk } r \\ne 1")
+    st.latex(f"S_n = \\frac{{a(r^n - 1)}}{{r-1}} \\text{{ untuk }} r \\ne 1")
     
     # Konvergensi untuk Geometri Tak Hingga
     if np.abs(r) < 1:
@@ -134,8 +208,108 @@ elif sequence_type == "Geometri":
     else:
         st.info(f"Karena $|r| = |{r}| \\ge 1$, deret ini **Divergen** (tidak memiliki jumlah tak hingga yang terbatas).")
 
+# --- Lompat ke Suku ke-n ---
+st.markdown("---")
+st.header("🎯 Lompat ke Suku ke-n")
+st.markdown("Hitung $U_n$ dan $S_n$ untuk satu indeks $n$ yang sangat besar (misalnya $10^{12}$) langsung dari rumus tertutup, tanpa menghitung suku-suku sebelumnya.")
+
+TERM_MODES = {
+    "Eksak (pecahan)": "eksak",
+    "Float64": "float",
+    "Domain log": "log",
+}
+
+@lab_fragment("deret")
+def term_section(a, diff_or_ratio, sequence_type):
+    """Indeks n dan mode numerik hanya menjalankan ulang bagian ini, bukan grafik dan tabel"""
+    col_n, col_mode = st.columns([1, 1])
+    with col_n:
+        n_text = st.text_input("Indeks n", value="10^12", help="Bilangan bulat, boleh ditulis 1_000_000 atau 10^12")
+    with col_mode:
+        term_mode_label = st.radio("Mode Numerik", list(TERM_MODES), horizontal=True)
+    term_mode = TERM_MODES[term_mode_label]
+
+    fallback = None
+    try:
+        n_query = parse_index(n_text)
+        try:
+            U_query, S_query, term_notes = calculate_term(a, diff_or_ratio, n_query, sequence_type, term_mode)
+        except OverflowError as e:
+            if term_mode != "eksak":
+                raise
+            # Pangkat terlalu besar untuk disimpan eksak: tampilkan hasil domain log saja
+            fallback, term_mode = e, "log"
+            U_query, S_query, term_notes = calculate_term(a, diff_or_ratio, n_query, sequence_type, term_mode)
+    except (ValueError, OverflowError) as e:
+        st.error(f"Tidak dapat menghitung suku: {e}")
+    else:
+        if fallback is not None:
+            st.caption(f"Mode eksak tidak dipakai ({fallback}); hasil di bawah dihitung dalam domain log.")
+        col_uq, col_sq = st.columns(2)
+        col_uq.metric(f"U_n (n = {n_text.strip()})", format_term(U_query, term_mode))
+        col_sq.metric(f"S_n (n = {n_text.strip()})", format_term(S_query, term_mode))
+        for note in term_notes:
+            st.warning(note)
+
+term_section(a, diff_or_ratio, sequence_type)
+
+# --- Sapuan Parameter ---
+st.markdown("---")
+st.header("🗺️ Sapuan Parameter")
+st.markdown("Bandingkan banyak kombinasi **Suku Awal** ($a$) dan **" + ("Beda ($b$)" if sequence_type == "Aritmatika" else "Rasio ($r$)") + "** sekaligus dalam satu perhitungan.")
+
+@lab_fragment("deret")
+def sweep_section(sequence_type):
+    """Sapuan parameter sebagai fragmen: input sapuan tidak menjalankan ulang bagian lain halaman"""
+    if not st.toggle("Aktifkan sapuan parameter", value=False):
+        return
+    param_symbol = "b" if sequence_type == "Aritmatika" else "r"
+    param_limit = 5.0 if sequence_type == "Aritmatika" else 2.0
+
+    # Lima slider sapuan dikirim sekaligus: sapuan dihitung sekali per "Hitung Sapuan", bukan per slider
+    with st.form("sapuan"):
+        col_a, col_p, col_n = st.columns(3)
+        with col_a:
+            a_range = st.slider("Rentang a", -10.0, 10.0, (-5.0, 5.0))
+            a_count = st.slider("Jumlah nilai a", 2, 400, 200)
+        with col_p:
+            p_range = st.slider(f"Rentang {param_symbol}", -param_limit, param_limit, (-param_limit, param_limit))
+            p_count = st.slider(f"Jumlah nilai {param_symbol}", 2, 400, 200)
+        with col_n:
+            n_sweep = st.slider("Batas Suku Sapuan (N)", 2, 200, 20)
+        st.form_submit_button("Hitung Sapuan")
+
+    if a_count * p_count * n_sweep > MAX_SWEEP_CELLS:
+        st.error(f"Ukuran sapuan {a_count} x {p_count} x {n_sweep} melebihi batas {MAX_SWEEP_CELLS:,} sel. Kurangi jumlah nilai atau N.")
+    else:
+        a_values = np.linspace(*a_range, a_count)
+        p_values = np.linspace(*p_range, p_count)
+        # Sapuan besar berjalan sebagai job latar: mengirim sapuan baru membatalkan sapuan lama
+        owner = session_owner()
+        figures, job = cached_job(
+            figure_cache, owner, "deret: sapuan", ("sapuan", sequence_type, a_range, a_count, p_range, p_count, n_sweep),
+            lambda job: render_sweep_figures(a_values, p_values, n_sweep, sequence_type, param_symbol, owner, job.report),
+        )
+        if job is not None:
+            with span("tunggu"):
+                figures = follow(job, st.empty(), describe=lambda done, total: f"Sapuan: {done} dari {total} nilai a")
+        png_left, png_right = figures
+
+        col_left, col_right = st.columns(2)
+        col_left.image(png_left, width="stretch")
+        col_right.image(png_right, width="stretch")
+
+        st.caption(f"{a_count * p_count:,} kombinasi parameter x {n_sweep} suku dihitung dalam satu operasi array.")
+
+sweep_section(sequence_type)
+
 # --- Kesimpulan ---
 st.markdown("---")
 st.write(
     f"Dengan Lab ini, siswa dapat melihat bagaimana perubahan **Suku Awal** ($a$), **Beda** ($b$), atau **Rasio** ($r$) mengubah pola pertumbuhan barisan. Perhatikan perbedaan jelas antara pertumbuhan **Linear** (Aritmatika) dan **Eksponensial** (Geometri)!"
 )
+
+end_rerun()
+
+# Panel debug cache (?debug=1), di akhir skrip agar statistik rerun ini ikut terhitung
+show_cache_panel()
@@ -1,81 +1,161 @@
+import os
+import sys
+from pathlib import Path
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import norm # Modul ini yang butuh scipy di requirements.txt
+
+# Paket bersama virtual_lab berada di akar repo (ditambahkan sekali, bukan di setiap rerun)
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from virtual_lab.cache import get_cache
+from virtual_lab.charts import chart_backend
+from virtual_lab.debug import show_cache_panel
+from virtual_lab.fragments import lab_fragment
+from virtual_lab.grafik_clt import (
+    SIMULATION_CACHE, SWEEP_CACHE, FIGURE_CACHE, distribution_png, distribution_chart,
+    render_sweep_figures, distribution_key, distribution_figure_key, sweep_key
+)
+from virtual_lab.jobs import cached_job, follow
+from virtual_lab.metrics import begin_rerun, end_rerun, rerun_phase, span
+from virtual_lab.session import session_owner
+from virtual_lab.simulasi import simulate_histogram, sweep_sample_sizes
+from virtual_lab.store import get_store
+from virtual_lab.warmer import start_warmer
 
 # --- Konfigurasi Halaman Streamlit ---
 st.set_page_config(layout="wide", page_title="Virtual Lab Distribusi Normal")
+# Waktu dan memori rerun ini dicatat per fase (panel debug ?debug=1 dan ekspor VIRTUAL_LAB_METRICS)
+begin_rerun("clt", session_owner())
 
 st.title("🔔 Virtual Lab Distribusi Normal & Teorema Limit Pusat")
 st.markdown("Eksplorasi bagaimana ukuran sampel memengaruhi distribusi rata-rata sampel.")
 
+# --- Batas Simulasi ---
+SAMPLE_COUNT_OPTIONS = [
+    100, 500, 1_000, 5_000, 10_000, 50_000, 100_000,
+    500_000, 1_000_000, 5_000_000, 10_000_000, 20_000_000,
+]
+MEMORY_BUDGET_MB = 64  # Batas memori untuk satu blok sampel mentah (per proses)
+MAX_WORKERS = os.cpu_count() or 1
+RENDER_INTERVAL_S = 0.5        # Jeda minimum antar-gambar ulang pada mode streaming
+SWEEP_MAX_N = 100              # Ukuran sampel terbesar pada sapuan n
+SWEEP_MAX_SAMPLES = 200_000    # Batas jumlah sampel untuk sapuan n (matriks N x 100)
+
+# --- Cache Bersama (semua sesi dalam satu proses, dan semua replika lewat disk) ---
+# Hasil simulasi identik untuk seed yang sama berapa pun jumlah worker,
+# sehingga jumlah worker tidak ikut menjadi kunci cache.
+simulation_cache = get_cache(SIMULATION_CACHE, max_entries=256, max_bytes=128 * 1024**2, store=get_store())
+sweep_cache = get_cache(SWEEP_CACHE, max_entries=64, max_bytes=64 * 1024**2, store=get_store())
+figure_cache = get_cache(FIGURE_CACHE, max_entries=256, max_bytes=128 * 1024**2, store=get_store())
+# Kombinasi slider umum dihitung lebih dulu di proses latar (sekali per host)
+start_warmer("clt")
+
+# Bentuk populasi yang bisa dipilih (semua dibakukan ke rata-rata μ dan simpangan baku σ)
+POPULATIONS = {
+    "Normal": "normal",
+    "Seragam (Uniform)": "uniform",
+    "Eksponensial (miring)": "exponential",
+    "Bernoulli (p = 0.2)": "bernoulli",
+    "Lognormal (sangat miring)": "lognormal",
+    "Bimodal (dua puncak)": "bimodal",
+}
+
 # --- Sidebar Input Parameter ---
+rerun_phase("widget")
 st.sidebar.title("⚙️ Parameter Populasi")
 mu = st.sidebar.slider("Rata-rata Populasi (μ)", 0, 100, 50)
 sigma = st.sidebar.slider("Simpangan Baku Populasi (σ)", 1, 20, 10)
+population_label = st.sidebar.selectbox("Bentuk Populasi", list(POPULATIONS))
+population = POPULATIONS[population_label]
 
 st.sidebar.markdown("---")
 st.sidebar.subheader("🔬 Parameter Sampling")
 sample_size = st.sidebar.slider("Ukuran Sampel (n)", 2, 100, 5) # Ukuran n
-num_samples = st.sidebar.slider("Jumlah Sampel Simulasi", 100, 5000, 1000) # Jumlah pengulangan
+# Jumlah pengulangan: sampler blok vektor sanggup sampai puluhan juta sampel
+num_samples = st.sidebar.select_slider("Jumlah Sampel Simulasi", SAMPLE_COUNT_OPTIONS, 1000)
+
+# Mode streaming: histogram diperbarui bertahap dengan memori konstan berapa pun N
+streaming = st.sidebar.toggle("Tampilkan Hasil Bertahap (streaming)", value=True)
+# Seed dan jumlah proses diketik, jadi dikirim sekaligus lewat form (satu rerun, bukan dua)
+with st.sidebar.form("pengaturan_simulasi", border=False):
+    # Seed yang sama selalu menghasilkan histogram yang sama, berapa pun jumlah worker
+    seed = st.number_input("Seed Acak", min_value=0, max_value=2**32 - 1, value=42, step=1)
+    workers = st.number_input("Jumlah Proses Paralel", min_value=1, max_value=MAX_WORKERS, value=min(4, MAX_WORKERS), step=1)
+    st.form_submit_button("Terapkan Pengaturan")
+
+st.sidebar.markdown("---")
+backend = chart_backend()
+rerun_phase("skrip")
 
 # --- Fungsi Plotting dan Simulasi ---
 
-def plot_distributions(mu, sigma, n, N):
-    
-    # 1. Setup Plotting Space
-    x = np.linspace(mu - 4*sigma, mu + 4*sigma, 1000)
-    
-    # 2. Simulasi Pengambilan Sampel (Distribusi Rata-rata Sampel)
-    sample_means = []
-    for _ in range(N):
-        # Ambil sampel dari populasi normal
-        sample = np.random.normal(loc=mu, scale=sigma, size=n)
-        sample_means.append(np.mean(sample))
-        
-    sample_means = np.array(sample_means)
-    
+def plot_distributions(mu, sigma, n, N, seed, workers, population, streaming, backend, chart, progress, mean_metric):
+    """Menggambar hasil simulasi ke chart dan mengembalikan (rata-rata histogram, SE).
+
+    Hasil akhir diambil dari cache (memori atau disk) bila ada. Bila belum, simulasi berjalan
+    sebagai job latar (virtual_lab.jobs) dan skrip hanya menggambar progresnya: bila slider
+    digeser, rerun baru langsung berjalan dan job lama dibatalkan di batas blok berikutnya.
+    Sesi atau replika lain yang menghitung kombinasi yang sama ditunggu, bukan dihitung ulang.
+    """
     # Simpangan Baku Rata-rata Sampel (Standard Error)
     SE = sigma / np.sqrt(n)
-    
-    # --- Visualisasi ---
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Plot Histogram Rata-rata Sampel
-    ax.hist(sample_means, bins=30, density=True, alpha=0.6, color='skyblue', label=f'Rata-rata Sampel (n={n})')
-    
-    # Plot Kurva Normal Rata-rata Sampel (sesuai CLT)
-    y_clt = norm.pdf(x, mu, SE)
-    ax.plot(x, y_clt, 'red', linewidth=2, label=f'Kurva Teoritis (SE={SE:.2f})')
-    
-    # Plot Kurva Populasi (untuk perbandingan lebar)
-    y_pop = norm.pdf(x, mu, sigma)
-    ax.plot(x, y_pop, 'black', linestyle='--', alpha=0.5, label=f'Populasi (σ={sigma})')
-
-    
-    # Pengaturan Grafik
-    ax.set_title(f'Distribusi Rata-rata Sampel vs. Populasi (N={N} kali simulasi)')
-    ax.set_xlabel('Nilai Rata-rata')
-    ax.set_ylabel('Probabilitas Densitas')
-    ax.axvline(mu, color='green', linestyle='-', linewidth=1.5, label=f'μ = {mu}')
-    ax.legend(loc='upper right')
-    ax.grid(axis='y', alpha=0.5)
-    
-    st.pyplot(fig)
-    plt.close(fig) # Tutup figure Matplotlib
-
-    return sample_means, SE
+
+    def draw(count, density, edges):
+        if backend == "vega":
+            with span("vega"):
+                chart.altair_chart(distribution_chart(mu, sigma, n, count, population, density, edges), width="stretch")
+        else:
+            chart.image(distribution_png(mu, sigma, n, count, population, density, edges, session_owner()), width="stretch")
+
+    def show_partial(partial):
+        count, mean, density, edges = partial
+        draw(count, density, edges)
+        mean_metric.metric(f"Rata-rata Histogram ($\overline{{\mu}}$)", f"{mean:.2f}")
+
+    def simulate(job):
+        # Berjalan di thread job: progres dan hasil sementara diteruskan lewat job.report
+        return simulate_histogram(
+            mu, sigma, n, N, seed, workers, population, streaming, MEMORY_BUDGET_MB,
+            on_progress=lambda count, mean, density, edges: job.report(count, N, (count, mean, density, edges)),
+            render_interval_s=0, check_cancelled=job.check,
+        )
+
+    params = (mu, sigma, n, N, seed, population, streaming)
+    key = distribution_key(*params)
+    result, job = cached_job(simulation_cache, session_owner(), "clt: simulasi", key, simulate)
+    if job is not None:
+        # Gambar progres selama menunggu tercatat di fase "gambar"/"png", sisanya "tunggu"
+        with span("tunggu"):
+            result = follow(
+                job, progress, on_partial=show_partial, render_interval_s=RENDER_INTERVAL_S,
+                describe=lambda done, total: f"{done:,} dari {total:,} sampel",
+            )
+    mean_of_means, density, edges = result
+    if backend == "vega":
+        draw(N, density, edges)
+    else:
+        # Gambar akhir juga disimpan di cache: rerun dengan parameter sama tidak merender ulang
+        png = figure_cache.get_or_compute(
+            distribution_figure_key(*params),
+            lambda: distribution_png(mu, sigma, n, N, population, density, edges, session_owner()),
+        )
+        chart.image(png, width="stretch")
+    mean_metric.metric(f"Rata-rata Histogram ($\overline{{\mu}}$)", f"{mean_of_means:.2f}")
+    return mean_of_means, SE
 
 # --- Bagian Utama Streamlit ---
 
 st.header("Visualisasi Simulasi Sampling")
 
 
-[Image of a bell-shaped curve showing normal distribution with mean and standard deviation labeled]
+# [Image of a bell-shaped curve showing normal distribution with mean and standard deviation labeled]
 
 
-# Jalankan simulasi dan plot
-sample_means, SE = plot_distributions(mu, sigma, sample_size, num_samples)
+# Tempat grafik dan metrik disiapkan lebih dulu agar bisa diperbarui selama simulasi berjalan
+chart_placeholder = st.empty()
+progress_placeholder = st.empty()
+SE = sigma / np.sqrt(sample_size)
 
 
 st.header("📊 Hasil Analisis Teorema Limit Pusat (CLT)")
@@ -90,7 +170,7 @@ with col1:
 with col2:
     st.subheader("Rata-rata Sampel")
     st.metric(f"Ukuran Sampel (n)", f"{sample_size}")
-    st.metric(f"Rata-rata Histogram ($\overline{{\mu}}$)", f"{np.mean(sample_means):.2f}")
+    mean_placeholder = st.empty()
 
 
 with col3:
@@ -99,10 +179,62 @@ with col3:
     st.metric("Standard Error (SE)", f"{SE:.2f}")
     st.latex(f"SE = \\frac{{\\sigma}}{{\\sqrt{{n}}}} = \\frac{{{sigma}}}{{\\sqrt{{{sample_size}}}}} = {SE:.2f}")
 
+# Jalankan simulasi dan plot
+mean_of_means, SE = plot_distributions(
+    mu, sigma, sample_size, num_samples, int(seed), int(workers), population,
+    streaming, backend, chart_placeholder, progress_placeholder, mean_placeholder
+)
+
 
 st.markdown("---")
-st.subheader("Kesimpulan CLT:")
-st.markdown(
-    "1. **Bentuk Distribusi:** Saat $n$ meningkat, histogram rata-rata sampel akan semakin menyerupai **Kurva Normal**, bahkan jika populasi aslinya tidak normal (walaupun kita menggunakan populasi normal di sini).\n"
-    "2. **Akurasi:** Saat $n$ meningkat, **Standard Error (SE)** menurun, menyebabkan kurva rata-rata sampel menjadi **lebih ramping dan tinggi** di sekitar $\mu$. Ini menunjukkan bahwa rata-rata sampel lebih akurat mencerminkan rata-rata populasi."
-)
+st.header("📈 Sapuan Ukuran Sampel (n = 2 sampai 100)")
+st.markdown("Lihat perubahan distribusi rata-rata sampel untuk **setiap** $n$ sekaligus. Satu matriks sampel berukuran $N \\times 100$ diambil, lalu rata-rata untuk setiap $n$ didapat dari jumlah kumulatifnya.")
+
+@lab_fragment("clt")
+def sweep_section(mu, sigma, sample_size, num_samples, seed, population):
+    """Sapuan n sebagai fragmen: toggle-nya hanya menjalankan ulang bagian ini, bukan simulasi utama"""
+    if not st.toggle("Tampilkan sapuan n", value=False):
+        return
+    sweep_samples = min(num_samples, SWEEP_MAX_SAMPLES)
+    if sweep_samples < num_samples:
+        st.caption(f"Sapuan memakai {sweep_samples:,} sampel (batas sapuan), bukan {num_samples:,}.")
+
+    sweep_cache_key = sweep_key(mu, sigma, sweep_samples, seed, population)
+    sweep_result, sweep_job = cached_job(
+        sweep_cache, session_owner(), "clt: sapuan", sweep_cache_key,
+        lambda job: sweep_sample_sizes(
+            mu, sigma, SWEEP_MAX_N, sweep_samples, np.random.default_rng(seed),
+            MEMORY_BUDGET_MB, population, on_chunk=job.report,
+        ),
+    )
+    if sweep_job is not None:
+        with span("tunggu"):
+            sweep_result = follow(sweep_job, st.empty(), describe=lambda done, total: f"Sapuan: {done:,} dari {total:,} sampel")
+    png_se, png_hm = figure_cache.get_or_compute(
+        sweep_cache_key + (sample_size,),
+        lambda: render_sweep_figures(mu, sigma, sample_size, sweep_samples, *sweep_result, owner=session_owner()),
+    )
+
+    col_se, col_heat = st.columns(2)
+    col_se.image(png_se, width="stretch")
+    col_heat.image(png_hm, width="stretch")
+
+sweep_section(mu, sigma, sample_size, num_samples, int(seed), population)
+
+
+@lab_fragment("clt")
+def conclusion_section():
+    """Panel kesimpulan statis: fragmen sendiri, tanpa input dari sidebar maupun hasil simulasi"""
+    st.markdown("---")
+    st.subheader("Kesimpulan CLT:")
+    st.markdown(
+        "1. **Bentuk Distribusi:** Saat $n$ meningkat, histogram rata-rata sampel akan semakin menyerupai **Kurva Normal**, bahkan jika populasi aslinya tidak normal. Coba ganti **Bentuk Populasi** menjadi eksponensial atau lognormal, lalu naikkan $n$.\n"
+        "2. **Akurasi:** Saat $n$ meningkat, **Standard Error (SE)** menurun, menyebabkan kurva rata-rata sampel menjadi **lebih ramping dan tinggi** di sekitar $\mu$. Ini menunjukkan bahwa rata-rata sampel lebih akurat mencerminkan rata-rata populasi."
+    )
+
+conclusion_section()
+
+end_rerun()
+
+# Panel debug cache (?debug=1), di akhir skrip agar statistik rerun ini ikut terhitung
+show_cache_panel()
@@ -0,0 +1,31 @@
+"""Satu pintu masuk untuk semua Virtual Lab (aplikasi multipage).
+
+Jalankan dengan: streamlit run streamlit_app.py
+
+Setiap lab tetap berupa app.py di direktorinya dan masih bisa dijalankan sendiri. File ini
+hanya mengimpor streamlit: numpy, matplotlib dan modul lab baru diimpor saat halaman lab
+pertama kali dibuka, sehingga server cepat siap dan lab yang tidak dikunjungi tidak memakan
+memori. Laporan waktu impor per halaman: python -m virtual_lab.importtime
+"""
+
+from pathlib import Path
+
+import streamlit as st
+
+ROOT = Path(__file__).resolve().parent
+
+PAGES = {
+    "Matematika": [
+        st.Page(ROOT / "deretdanbarisan" / "app.py", title="Deret & Barisan", icon="🔢", url_path="deret", default=True),
+        st.Page(ROOT / "deret dan barisan" / "app.py", title="Deret & Barisan (versi 2)", icon="🔢", url_path="deret-dan-barisan"),
+        st.Page(ROOT / "transformasigeometri" / "app.py", title="Transformasi Geometri", icon="🔬", url_path="transformasi"),
+    ],
+    "Statistika": [
+        st.Page(ROOT / "spldv" / "app.py", title="Distribusi Normal & CLT", icon="🔔", url_path="clt"),
+    ],
+    "Alat": [
+        st.Page(ROOT / "IPKKONVERTER" / "app.py", title="Pengurut Tiga Bilangan", icon="🔢", url_path="pengurut"),
+    ],
+}
+
+st.navigation(PAGES).run()
@@ -0,0 +1,8 @@
+"""Paket virtual_lab diimpor dari akar repo, seperti oleh setiap app.py"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
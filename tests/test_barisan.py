@@ -0,0 +1,134 @@
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from virtual_lab.barisan import MAX_EXACT_BITS, calculate_sequences, calculate_term, format_term, parse_index
+
+def naive_sequences(a, param, N, type):
+    """Un dan Sn dengan perulangan biasa, suku demi suku"""
+    U, S = [], []
+    term, total = a, 0.0
+    for _ in range(N):
+        total += term
+        U.append(term)
+        S.append(total)
+        term = term + param if type == "Aritmatika" else term * param
+    return np.array(U), np.array(S)
+
+@pytest.mark.parametrize("type, a, param", [
+    ("Aritmatika", 3.0, 2.5),
+    ("Aritmatika", -1.0, -0.75),
+    ("Geometri", 2.0, 1.5),
+    ("Geometri", 5.0, 0.5),
+    ("Geometri", 1.5, -2.0),
+    ("Geometri", 4.0, -0.5),
+    ("Geometri", 3.0, 0.0),
+    ("Geometri", 3.0, 1.0),
+    ("Geometri", 3.0, -1.0),
+])
+def test_sequences_match_naive_loop(type, a, param):
+    U, S = calculate_sequences(a, param, 40, type)
+    expected_U, expected_S = naive_sequences(a, param, 40, type)
+    assert U.shape == S.shape == (40,)
+    np.testing.assert_allclose(U, expected_U, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(S, expected_S, rtol=1e-12, atol=1e-12)
+
+@pytest.mark.parametrize("param", [2.0, 3.0, -3.0, 10.0, 0.5])
+def test_integer_ratio_terms_are_exact(param):
+    # Selama r^(n-1) terwakili eksak oleh float64, hasilnya sama bit demi bit dengan perkalian berulang
+    N = int(52 / np.log2(max(abs(param), 1 / abs(param)))) + 1
+    U, _ = calculate_sequences(1.0, param, N, "Geometri")
+    np.testing.assert_array_equal(U, naive_sequences(1.0, param, N, "Geometri")[0])
+
+def test_sequences_overflow_to_inf():
+    U, _ = calculate_sequences(1.0, 10.0, 400, "Geometri")
+    assert np.isinf(U[-1]) and np.isfinite(U[300])
+
+def test_unknown_type():
+    with pytest.raises(ValueError):
+        calculate_sequences(1, 2, 3, "Harmonik")
+    with pytest.raises(ValueError):
+        calculate_term(1, 2, 3, "Harmonik")
+
+@pytest.mark.parametrize("type, a, param, n", [
+    ("Aritmatika", 1.5, -0.25, 1),
+    ("Aritmatika", 1.5, -0.25, 37),
+    ("Geometri", 1.5, 2.0, 37),
+    ("Geometri", 3.0, 0.5, 20),
+    ("Geometri", 2.0, -1.5, 15),
+    ("Geometri", 2.0, -1.5, 16),
+    ("Geometri", -3.0, 1.0, 12),
+    ("Geometri", 3.0, -1.0, 12),
+    ("Geometri", 3.0, 0.0, 12),
+])
+def test_term_modes_agree(type, a, param, n):
+    expected_U, expected_S = (values[n - 1] for values in naive_sequences(a, param, n, type))
+
+    U, S, notes = calculate_term(a, param, n, type, "eksak")
+    assert isinstance(U, (int, Fraction)) and not notes
+    assert float(U) == pytest.approx(expected_U, rel=1e-12)
+    assert float(S) == pytest.approx(expected_S, rel=1e-12)
+
+    U, S, notes = calculate_term(a, param, n, type, "float")
+    assert (U, S) == (pytest.approx(expected_U, rel=1e-12), pytest.approx(expected_S, rel=1e-12))
+    assert not notes
+
+    for (sign, log10_abs), expected in zip(calculate_term(a, param, n, type, "log")[:2], (expected_U, expected_S)):
+        assert sign == np.sign(expected)
+        if expected != 0:
+            assert log10_abs == pytest.approx(math.log10(abs(expected)), abs=1e-9)
+
+def test_exact_mode_is_exact():
+    U, S, _ = calculate_term(1, 3, 101, "Geometri", "eksak")
+    assert U == 3**100
+    assert S == (3**101 - 1) // 2
+    U, _, _ = calculate_term(1, 0.5, 11, "Geometri", "eksak")
+    assert U == Fraction(1, 1024)
+
+def test_exact_mode_overflow_guard():
+    n = MAX_EXACT_BITS // 2 + 2   # r = 3 butuh 2 bit per pangkat
+    with pytest.raises(OverflowError):
+        calculate_term(1, 3, n, "Geometri", "eksak")
+    # Mode log tetap bisa menghitung indeks yang sama
+    (sign, log10_abs), _, notes = calculate_term(1, 3, n, "Geometri", "log")
+    assert sign == 1
+    assert log10_abs == pytest.approx((n - 1) * math.log10(3))
+    assert notes and "overflow" in notes[0]
+
+def test_float_mode_reports_overflow_and_underflow():
+    _, _, notes = calculate_term(1, 10, 400, "Geometri", "float")
+    assert any("Un overflow" in note for note in notes)
+    _, _, notes = calculate_term(1, 0.1, 400, "Geometri", "float")
+    assert any("Un underflow" in note for note in notes)
+
+def test_log_mode_beyond_float_index():
+    n = parse_index("10^400")
+    (sign_u, log_u), (sign_s, log_s), notes = calculate_term(2, 1.5, n, "Geometri", "log")
+    expected = Decimal(n - 1) * Decimal(math.log10(1.5)) + Decimal(math.log10(2))
+    assert (sign_u, sign_s) == (1, 1)
+    assert abs(log_u / expected - 1) < Decimal("1e-12")
+    assert abs(log_s / expected - 1) < Decimal("1e-12")   # Sn ≈ 3 Un, tak terbedakan pada skala ini
+    assert len(notes) == 2 and all("overflow" in note for note in notes)
+    assert format_term((sign_u, log_u), "log") == "≈ 10^(1.76091e+399)"
+    assert format_term((-1, log_u), "log") == "≈ -10^(1.76091e+399)"
+
+    # Rasio |r| < 1: Un underflow, Sn menuju a / (1 - r)
+    (_, log_u), (sign_s, log_s), _ = calculate_term(2, -0.5, n, "Geometri", "log")
+    assert log_u < Decimal("-1e399")
+    assert sign_s == 1 and float(log_s) == pytest.approx(math.log10(4 / 3))
+
+    # Kasus khusus tetap eksak, dan mode float menolak n di luar jangkauannya
+    assert calculate_term(0, 2, n, "Geometri", "log")[:2] == ((0, -math.inf), (0, -math.inf))
+    assert format_term(calculate_term(2, 1, n, "Geometri", "log")[1], "log") == "2.00000 × 10^400"
+    with pytest.raises(OverflowError):
+        calculate_term(2, 1.5, n, "Geometri", "float")
+    # Mode eksak gagal dengan OverflowError (app lalu beralih ke mode log), juga untuk n terbesar
+    with pytest.raises(OverflowError):
+        calculate_term(2, 1.5, parse_index("10^10000"), "Geometri", "eksak")
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        calculate_term(1, 2, 3, "Geometri", "desimal")
@@ -0,0 +1,34 @@
+import numpy as np
+
+from virtual_lab.cache import MISSING, ResultCache
+
+def test_result_cache_round_trip_and_lru_eviction():
+    cache = ResultCache("uji", max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", np.arange(3))
+    assert cache.get("a") == 1          # "a" kini paling baru dipakai
+    cache.put("c", 3)
+    assert cache.get("b", MISSING) is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["entri"], stats["eviksi"], stats["miss"]) == (2, 1, 1)
+
+def test_result_cache_byte_limit_and_frozen_arrays():
+    cache = ResultCache("uji", max_bytes=1000)
+    big = cache.put("besar", np.zeros(1000))   # lebih besar dari batas: dikembalikan, tidak disimpan
+    assert big.flags.writeable and cache.get("besar") is None
+    stored = cache.put("kecil", (np.ones(10), [np.zeros(5)]))
+    assert not stored[0].flags.writeable and not stored[1][0].flags.writeable
+
+def test_result_cache_ttl():
+    cache = ResultCache("uji", ttl_s=0.0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["kedaluwarsa"] == 1
+
+def test_get_or_compute_computes_once():
+    cache = ResultCache("uji")
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("k", lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
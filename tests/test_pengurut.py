@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from virtual_lab.pengurut import load_sheet, rank_rows, sort_rows
+
+NAN = np.nan
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_sort_rows_matches_sorted_with_nan_last(descending):
+    values = np.array([[3.0, NAN, 1.0, 2.0], [NAN, NAN, 5.0, -1.0], [0.5, 0.5, 0.25, 4.0]])
+    result = sort_rows(values, descending, chunk_rows=2)   # dua potongan, yang terakhir tidak penuh
+    for row, original in zip(result, values):
+        present = original[~np.isnan(original)]
+        expected = sorted(present, reverse=descending)
+        np.testing.assert_array_equal(row[:len(expected)], expected)
+        assert np.isnan(row[len(expected):]).all()
+
+def test_rank_rows_keeps_file_order_for_ties():
+    column = np.array([3.0, 1.0, 3.0, NAN, 1.0, 2.0])
+    order, ranks = rank_rows(column)
+    np.testing.assert_array_equal(order, [1, 4, 5, 0, 2, 3])
+    np.testing.assert_array_equal(ranks, [4, 1, 5, 6, 2, 3])
+
+    order, ranks = rank_rows(column, descending=True)
+    np.testing.assert_array_equal(order, [0, 2, 5, 1, 4, 3])
+    np.testing.assert_array_equal(ranks, [1, 4, 2, 6, 5, 3])
+
+def test_load_sheet_reads_labels_and_decimal_comma():
+    sheet = load_sheet("nama;uts;uas\nAni;80,5;90\nBudi;;70\n".encode(), "nilai.csv")
+    assert list(sheet.labels) == ["nama"]
+    assert list(sheet.labels["nama"]) == ["Ani", "Budi"]
+    assert list(sheet.value_names) == ["uts", "uas"]
+    np.testing.assert_array_equal(sheet.values, [[80.5, 90.0], [NAN, 70.0]])
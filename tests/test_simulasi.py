@@ -0,0 +1,49 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from virtual_lab import simulasi
+from virtual_lab.simulasi import BLOCK_SAMPLES, PARALLEL_MIN_SAMPLES, simulate_sample_means
+
+def shutdown_pool():
+    if simulasi._pool is not None:
+        simulasi._pool.shutdown(cancel_futures=True)
+        simulasi._pool = None
+
+@pytest.fixture(scope="module", autouse=True)
+def pool_cleanup():
+    yield
+    shutdown_pool()
+
+@pytest.mark.parametrize("population", ["normal", "lognormal"])
+def test_sample_means_identical_across_workers(population):
+    N = PARALLEL_MIN_SAMPLES + BLOCK_SAMPLES // 2   # beberapa blok penuh dan satu blok sisa
+    serial = simulate_sample_means(10.0, 2.0, 3, N, seed=42, workers=1, population=population)
+    assert serial.shape == (N,)
+    for workers in (2, 4):
+        parallel = simulate_sample_means(10.0, 2.0, 3, N, seed=42, workers=workers, population=population)
+        np.testing.assert_array_equal(parallel, serial)
+
+def test_sample_means_depend_on_seed():
+    first = simulate_sample_means(0.0, 1.0, 5, 1000, seed=1)
+    np.testing.assert_array_equal(first, simulate_sample_means(0.0, 1.0, 5, 1000, seed=1))
+    assert not np.array_equal(first, simulate_sample_means(0.0, 1.0, 5, 1000, seed=2))
+
+def test_workers_do_not_rerun_main_script(tmp_path, monkeypatch):
+    # Seperti app.py di Streamlit: file __main__ yang tidak boleh ikut dijalankan worker
+    marker = tmp_path / "dijalankan"
+    script = tmp_path / "app.py"
+    script.write_text(f"open({str(marker)!r}, 'w').close()\n")
+    main = types.ModuleType("__main__")
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+
+    shutdown_pool()
+    pool = simulasi._get_pool(2)
+    assert len(pool._processes) == 2   # semua worker sudah dibuat saat pool dibuat
+    simulate_sample_means(0.0, 1.0, 2, PARALLEL_MIN_SAMPLES, seed=3, workers=2)
+    assert simulasi._pool is pool and len(pool._processes) == 2
+    assert not marker.exists()
+    assert sys.modules["__main__"] is main and main.__file__ == str(script)
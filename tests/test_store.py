@@ -0,0 +1,43 @@
+import numpy as np
+
+from virtual_lab import store as store_module
+from virtual_lab.cache import ResultCache
+from virtual_lab.store import DiskStore
+
+def test_disk_store_round_trip(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=10 * 1024**2)
+    value = (np.arange(5, dtype=np.int64), (1.5, "x", None, [True, 2], float("inf")), b"\x00\x01")
+    assert store.save("uji", ("k", 1), value)
+    counts, meta, raw = store.load("uji", ("k", 1))
+    np.testing.assert_array_equal(counts, value[0])
+    assert counts.dtype == np.int64
+    assert meta == value[1] and raw == value[2]
+    assert store.load("uji", ("k", 2)) is None
+    assert store.load("lain", ("k", 1)) is None
+    assert not store.save("uji", "objek", {"a": 1})   # tipe yang tidak didukung dilewati
+
+def test_disk_store_evicts_least_recently_used(tmp_path):
+    item = np.zeros(10_000)   # ~80 kB per file
+    store = DiskStore(str(tmp_path), max_bytes=int(2.5 * item.nbytes))
+    for key in range(3):
+        store.save("uji", key, item)
+    assert store.usage()[0] == 2 and store.evictions == 1
+    assert store.load("uji", 0) is None
+    assert store.load("uji", 2) is not None
+
+def test_result_cache_reads_through_disk_store(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=10 * 1024**2)
+    ResultCache("uji", store=store).put("k", np.arange(4.0))
+    other = ResultCache("uji", store=store)   # misalnya replika lain dengan direktori yang sama
+    np.testing.assert_array_equal(other.get("k"), np.arange(4.0))
+    assert other.stats()["hit disk"] == 1
+
+def test_disk_lock_is_exclusive_until_stale(tmp_path, monkeypatch):
+    store = DiskStore(str(tmp_path), max_bytes=1024**2)
+    assert store.acquire("uji", "k")
+    assert not store.acquire("uji", "k")
+    store.release("uji", "k")
+    assert store.acquire("uji", "k")
+    # Kunci milik proses yang berhenti tanpa melepasnya diambil alih setelah basi
+    monkeypatch.setattr(store_module, "LOCK_STALE_S", 0.0)
+    assert store.acquire("uji", "k")
@@ -0,0 +1,38 @@
+import io
+import tempfile
+
+import numpy as np
+import pytest
+
+from virtual_lab import tables
+from virtual_lab.tables import write_export
+
+COLUMNS = {"n": np.arange(1, 8), "Un": np.linspace(0.5, 3.5, 7)}
+
+def test_csv_export_in_batches_with_row_cap():
+    data = write_export(COLUMNS, "CSV", batch_rows=2, max_rows=5)
+    lines = data.decode().splitlines()
+    assert lines[0] == '"n","Un"'
+    assert lines[1:] == ["1,0.5", "2,1", "3,1.5", "4,2", "5,2.5"]
+
+def test_parquet_export_round_trip():
+    import pyarrow.parquet as pa_parquet
+
+    table = pa_parquet.read_table(io.BytesIO(write_export(COLUMNS, "Parquet", batch_rows=3)))
+    np.testing.assert_array_equal(table.column("Un").to_numpy(), COLUMNS["Un"])
+
+def test_export_closes_temporary_file_on_error(monkeypatch):
+    opened = []
+    new_file, window = tempfile.TemporaryFile, tables.arrow_window
+    def temporary_file():
+        opened.append(new_file())
+        return opened[-1]
+    def failing_window(columns, start, stop, digits=None):
+        if start > 0:
+            raise OSError("disk penuh")
+        return window(columns, start, stop, digits)
+    monkeypatch.setattr(tables.tempfile, "TemporaryFile", temporary_file)
+    monkeypatch.setattr(tables, "arrow_window", failing_window)
+    with pytest.raises(OSError):
+        write_export(COLUMNS, "CSV", batch_rows=2)
+    assert len(opened) == 1 and opened[0].closed
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from virtual_lab.transformasi import REFLECTION_AXES, apply_transform_frames, get_reflection_matrix, interpolate_matrices
+
+TRIANGLE = np.array([[1.0, 1.0], [5.0, 1.0], [3.0, 4.0]])
+FRAMES = 31
+
+def triangle_areas(frames_xy):
+    """Luas bertanda segitiga di setiap frame (T, 3, 2)"""
+    x, y = frames_xy[..., 0], frames_xy[..., 1]
+    return (x[:, 0] * (y[:, 1] - y[:, 2]) + x[:, 1] * (y[:, 2] - y[:, 0]) + x[:, 2] * (y[:, 0] - y[:, 1])) / 2
+
+@pytest.mark.parametrize("axis", REFLECTION_AXES)
+def test_reflection_frames_end_at_reflection(axis):
+    matrices = interpolate_matrices("Refleksi", (axis,), FRAMES)
+    np.testing.assert_allclose(matrices[0], np.identity(3), atol=1e-12)
+    np.testing.assert_allclose(matrices[-1], get_reflection_matrix(axis), atol=1e-12)
+
+def test_point_reflection_is_a_rotation():
+    matrices = interpolate_matrices("Refleksi", ("titik (0,0)",), FRAMES)
+    areas = triangle_areas(apply_transform_frames(matrices, TRIANGLE))
+    # Rotasi 180°: luas bertanda tetap sama di setiap frame, tidak pernah runtuh ke satu titik
+    np.testing.assert_allclose(areas, areas[0])
+    np.testing.assert_allclose(np.linalg.det(matrices[:, :2, :2]), 1.0)
+
+@pytest.mark.parametrize("axis", [axis for axis in REFLECTION_AXES if axis != "titik (0,0)"])
+def test_line_reflection_flips_about_the_mirror(axis):
+    matrices = interpolate_matrices("Refleksi", (axis,), FRAMES)
+    t = np.linspace(0.0, 1.0, FRAMES)
+    # Bidang dibalik terhadap garis cermin: determinan cos(πt), nol hanya di tengah animasi
+    determinants = np.linalg.det(matrices[:, :2, :2])
+    np.testing.assert_allclose(determinants, np.cos(np.pi * t), atol=1e-12)
+    assert np.count_nonzero(np.isclose(determinants, 0.0, atol=1e-12)) == 1
+
+    areas = triangle_areas(apply_transform_frames(matrices, TRIANGLE))
+    np.testing.assert_allclose(areas, areas[0] * determinants, atol=1e-9)
+
+    # Titik di garis cermin tetap diam sepanjang animasi
+    mirror = get_reflection_matrix(axis)
+    on_mirror = (TRIANGLE + apply_transform_frames(mirror[None], TRIANGLE)[0]) / 2
+    np.testing.assert_allclose(apply_transform_frames(matrices, on_mirror), np.broadcast_to(on_mirror, (FRAMES, 3, 2)), atol=1e-12)
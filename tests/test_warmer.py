@@ -0,0 +1,30 @@
+import os
+
+from virtual_lab import grafik_clt, store as store_module, warmer
+from virtual_lab.store import DiskStore
+
+PRESET = {
+    "mu": (50,), "sigma": (5, 10), "n": (2, 3), "N": (500,),
+    "seed": (42,), "population": ("normal",), "streaming": (True,),
+}
+
+def test_clt_warmer_simulates_each_combination_once(tmp_path, monkeypatch):
+    store = DiskStore(str(tmp_path), max_bytes=64 * 1024**2)
+    monkeypatch.setattr(store_module, "_store", store)
+    monkeypatch.setitem(grafik_clt.WARM_PRESETS, "uji", PRESET)
+    calls = []
+    simulate = grafik_clt.simulate_histogram
+    monkeypatch.setattr(grafik_clt, "simulate_histogram", lambda *args: calls.append(args) or simulate(*args))
+
+    status = warmer.warm("clt", "uji", store)
+    assert (status["dihitung"], status["gagal"]) == (8, 0)
+    assert len(calls) == 4   # gambar memakai hasil simulasi yang baru dihitung
+
+    # Gambar hilang tetapi simulasinya ada di disk: simulasi dibaca, tidak diulang
+    for namespace, key, _ in grafik_clt.warm_tasks("uji"):
+        if namespace == grafik_clt.FIGURE_CACHE:
+            os.remove(store.path_for(namespace, key))
+    calls.clear()
+    status = warmer.warm("clt", "uji", store)
+    assert (status["dihitung"], status["sudah ada"], status["gagal"]) == (4, 4, 0)
+    assert not calls
@@ -1,9 +1,37 @@
+import hashlib
+import sys
+from pathlib import Path
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+
+# Paket bersama virtual_lab berada di akar repo (ditambahkan sekali, bukan di setiap rerun)
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from virtual_lab.cache import get_cache
+from virtual_lab.charts import chart_backend
+from virtual_lab.debug import show_cache_panel
+from virtual_lab.fragments import lab_fragment
+from virtual_lab.grafik_transformasi import (
+    FIGURE_CACHE, MAX_LABELS, LOD_THRESHOLD, DEFAULT_TRIANGLE, triangle_points, transformation_png, transformation_chart,
+    triangle_key, file_key, figure_key
+)
+from virtual_lab.jobs import cached_job, follow
+from virtual_lab.metrics import begin_rerun, end_rerun, rerun_phase, span
+from virtual_lab.session import session_owner
+from virtual_lab.store import get_store
+from virtual_lab.tables import export_buttons, paged_table
+from virtual_lab.transformasi import (
+    TRANSFORM_TYPES, REFLECTION_AXES, apply_transform, apply_transform_xy, compose_transforms,
+    get_translation_matrix, get_rotation_matrix, get_reflection_matrix, get_dilation_matrix, load_points,
+    pipeline_frame_matrices, apply_transform_frames, frames_to_svg, apply_transform_memmap
+)
+from virtual_lab.warmer import start_warmer
 
 # --- Konfigurasi Halaman Streamlit ---
 st.set_page_config(layout="wide", page_title="Virtual Lab Transformasi Geometri")
+# Waktu dan memori rerun ini dicatat per fase (panel debug ?debug=1 dan ekspor VIRTUAL_LAB_METRICS)
+begin_rerun("transformasi", session_owner())
 
 st.title("🔬 Virtual Lab Transformasi Geometri Interaktif")
 st.markdown("Eksplorasi Translasi, Rotasi, Refleksi, dan Dilatasi secara visual.")
@@ -13,180 +41,116 @@ st.markdown("Eksplorasi Translasi, Rotasi, Refleksi, dan Dilatasi secara visual.
 # Baris 1: Koordinat X
 # Baris 2: Koordinat Y
 # Baris 3: Untuk perhitungan homogen (Translasi/geser)
-DEFAULT_POINTS = np.array([
-    [1, 5, 3],
-    [1, 1, 4],
-    [1, 1, 1]
-])
-
-# --- Fungsi Transformasi Geometri ---
-
-def apply_transform(points, matrix):
-    """Menerapkan matriks transformasi ke koordinat titik."""
-    # Mengalikan Matriks Transformasi dengan Matriks Koordinat
-    transformed_points = matrix @ points
-    return transformed_points
-
-# 1. Translasi (Pergeseran)
-def get_translation_matrix(tx, ty):
-    """Matriks Translasi 3x3"""
-    return np.array([
-        [1, 0, tx],
-        [0, 1, ty],
-        [0, 0, 1]
-    ])
-
-# 2. Rotasi (Perputaran)
-def get_rotation_matrix(angle_deg, cx=0, cy=0):
-    """Matriks Rotasi 3x3 terhadap titik (cx, cy)"""
-    angle_rad = np.radians(angle_deg)
-    cos_a = np.cos(angle_rad)
-    sin_a = np.sin(angle_rad)
-    
-    # 1. Geser ke Pusat (cx, cy)
-    T_to_center = get_translation_matrix(-cx, -cy)
-    # 2. Rotasi di Origin
-    R = np.array([
-        [cos_a, -sin_a, 0],
-        [sin_a, cos_a, 0],
-        [0, 0, 1]
-    ])
-    # 3. Geser kembali
-    T_from_center = get_translation_matrix(cx, cy)
-    
-    # Kombinasi: T_from_center @ R @ T_to_center
-    return T_from_center @ R @ T_to_center
-
-# 3. Refleksi (Pencerminan)
-def get_reflection_matrix(axis_type):
-    """Matriks Refleksi 3x3"""
-    if axis_type == "sumbu-X": # Refleksi thd y=0
-        return np.array([
-            [1, 0, 0],
-            [0, -1, 0],
-            [0, 0, 1]
-        ])
-    elif axis_type == "sumbu-Y": # Refleksi thd x=0
-        return np.array([
-            [-1, 0, 0],
-            [0, 1, 0],
-            [0, 0, 1]
-        ])
-    elif axis_type == "garis y=x":
-        return np.array([
-            [0, 1, 0],
-            [1, 0, 0],
-            [0, 0, 1]
-        ])
-    elif axis_type == "garis y=-x":
-        return np.array([
-            [0, -1, 0],
-            [-1, 0, 0],
-            [0, 0, 1]
-        ])
-    # Bisa ditambahkan refleksi terhadap titik (0,0) / Origin
-    elif axis_type == "titik (0,0)":
-        return np.array([
-            [-1, 0, 0],
-            [0, -1, 0],
-            [0, 0, 1]
-        ])
-
-# 4. Dilatasi (Perkalian)
-def get_dilation_matrix(k, cx=0, cy=0):
-    """Matriks Dilatasi 3x3 terhadap titik (cx, cy)"""
-    # 1. Geser ke Pusat (cx, cy)
-    T_to_center = get_translation_matrix(-cx, -cy)
-    # 2. Dilatasi di Origin
-    D = np.array([
-        [k, 0, 0],
-        [0, k, 0],
-        [0, 0, 1]
-    ])
-    # 3. Geser kembali
-    T_from_center = get_translation_matrix(cx, cy)
-    
-    # Kombinasi: T_from_center @ D @ T_to_center
-    return T_from_center @ D @ T_to_center
+DEFAULT_POINTS = triangle_points(*DEFAULT_TRIANGLE)
 
+MAX_PIPELINE_STEPS = 6    # Jumlah langkah maksimum pada mode pipeline
+MAX_ANIMATION_POINTS = 300  # Jumlah titik maksimum per frame animasi (bentuk besar dijarangkan)
+JOB_MIN_POINTS = 1_000_000  # Mulai jumlah titik ini, transformasi berjalan sebagai job latar
+JOB_CHUNK_POINTS = 250_000  # Jumlah titik per potongan job (batas pembatalan dan progres)
+
+# --- Cache Bersama (semua sesi dalam satu proses) ---
+# Titik unggahan hanya disimpan di memori; gambar juga dibagi ke replika lain lewat disk
+points_cache = get_cache("transformasi: titik", max_entries=128, max_bytes=512 * 1024**2)
+figure_cache = get_cache(FIGURE_CACHE, max_entries=512, max_bytes=128 * 1024**2, store=get_store())
+# Kombinasi slider umum dihitung lebih dulu di proses latar (sekali per host)
+start_warmer("transformasi")
 
 # --- Fungsi Plotting ---
-def plot_transformation(original, transformed, title, explanation):
-    """Fungsi untuk memvisualisasikan transformasi"""
-    
-    # Batas plot
-    all_points = np.hstack((original, transformed))
-    min_x, max_x = np.min(all_points[0, :]), np.max(all_points[0, :])
-    min_y, max_y = np.min(all_points[1, :]), np.max(all_points[1, :])
-    
-    # Tambahkan padding untuk batas
-    padding = 2
-    x_min, x_max = min_x - padding, max_x + padding
-    y_min, y_max = min_y - padding, max_y + padding
-    
-    # Buat plot
-    fig, ax = plt.subplots(figsize=(8, 8))
-    
-    # Plot bentuk awal (biru)
-    ax.plot(
-        np.append(original[0, :], original[0, 0]), 
-        np.append(original[1, :], original[1, 0]), 
-        'b-', marker='o', label='Bentuk Awal (P)'
-    )
-    # Label titik awal
-    for i in range(original.shape[1]):
-        ax.text(original[0, i], original[1, i] + 0.2, f'P{i+1}', color='blue')
-        
-    # Plot bentuk transformasi (merah)
-    ax.plot(
-        np.append(transformed[0, :], transformed[0, 0]), 
-        np.append(transformed[1, :], transformed[1, 0]), 
-        'r--', marker='x', label='Hasil Transformasi (P\')'
-    )
-    # Label titik transformasi
-    for i in range(transformed.shape[1]):
-        ax.text(transformed[0, i], transformed[1, i] - 0.3, f'P\'{i+1}', color='red')
-        
-    # Pengaturan plot
-    ax.axhline(0, color='gray', linewidth=0.5)
-    ax.axvline(0, color='gray', linewidth=0.5)
-    ax.grid(True, linestyle=':', alpha=0.6)
-    ax.set_title(title)
-    ax.set_xlabel("Sumbu X")
-    ax.set_ylabel("Sumbu Y")
-    ax.set_xlim(min(x_min, -10), max(x_max, 10))
-    ax.set_ylim(min(y_min, -10), max(y_max, 10))
-    ax.set_aspect('equal', adjustable='box')
-    ax.legend()
-    
-    st.pyplot(fig)
+def plot_transformation(original, transformed, title, explanation, points_key, matrix, backend):
+    """Fungsi untuk memvisualisasikan transformasi (PNG diambil dari cache bila ada)"""
+    if backend == "vega":
+        # Grafik vektor: ukuran tetap agar skala sumbu X dan Y sama
+        with span("vega"):
+            chart, drawn = transformation_chart(original, transformed, title)
+            st.altair_chart(chart, width="content")
+    else:
+        png, drawn = figure_cache.get_or_compute(
+            figure_key(title, points_key, matrix), lambda: transformation_png(original, transformed, title, session_owner())
+        )
+        st.image(png, width="stretch")
+    count = original.shape[1]
+    if count > LOD_THRESHOLD:
+        st.caption(f"Level detail: {drawn:,} dari {count:,} titik digambar (resolusi layar), label dibatasi {MAX_LABELS} titik.")
     st.markdown(explanation)
     
 
+# --- Fungsi Input Langkah Pipeline ---
+def center_input(name, key):
+    """Pusat (cx, cy) dalam satu form: kedua koordinat dikirim sekaligus, satu rerun per pusat baru"""
+    with st.sidebar.form(key, border=False):
+        cx = st.number_input(f"Pusat {name} X (cx)", value=0, key=f"{key}_cx")
+        cy = st.number_input(f"Pusat {name} Y (cy)", value=0, key=f"{key}_cy")
+        st.form_submit_button(f"Terapkan Pusat {name}")
+    return cx, cy
+
+def pipeline_step_input(step_type, i):
+    """Widget parameter untuk langkah ke-i pipeline; mengembalikan (parameter, deskripsi)"""
+    if step_type == "Translasi":
+        tx = st.sidebar.slider("Pergeseran X (tx)", -10, 10, 3, key=f"step_tx_{i}")
+        ty = st.sidebar.slider("Pergeseran Y (ty)", -10, 10, 2, key=f"step_ty_{i}")
+        return (tx, ty), f"Translasi sejauh $({tx}, {ty})$"
+    elif step_type == "Rotasi":
+        angle = st.sidebar.slider("Sudut Rotasi (derajat)", -360, 360, 90, key=f"step_angle_{i}")
+        cx, cy = center_input("Rotasi", f"step_rpusat_{i}")
+        return (angle, cx, cy), f"Rotasi ${angle}^\\circ$ terhadap $({cx}, {cy})$"
+    elif step_type == "Refleksi":
+        axis = st.sidebar.selectbox("Pencerminan terhadap:", REFLECTION_AXES, key=f"step_axis_{i}")
+        return (axis,), f"Refleksi terhadap {axis}"
+    elif step_type == "Dilatasi":
+        k = st.sidebar.slider("Faktor Skala (k)", 0.1, 5.0, 2.0, key=f"step_k_{i}")
+        cx, cy = center_input("Dilatasi", f"step_dpusat_{i}")
+        return (k, cx, cy), f"Dilatasi dengan $k = {k}$ dari pusat $({cx}, {cy})$"
+
+
 # --- Sidebar untuk Pilihan dan Pengaturan ---
+rerun_phase("widget")
 st.sidebar.title("⚙️ Pengaturan Transformasi")
 
+# Mode Pipeline: beberapa transformasi digabung menjadi satu matriks
+pipeline_mode = st.sidebar.toggle("Mode Pipeline (gabungan transformasi)", value=False)
+
 # Pilihan Transformasi
-transform_type = st.sidebar.selectbox(
-    "Pilih Jenis Transformasi",
-    ("Translasi", "Rotasi", "Refleksi", "Dilatasi")
-)
+if pipeline_mode:
+    transform_type = "Pipeline"
+else:
+    transform_type = st.sidebar.selectbox(
+        "Pilih Jenis Transformasi",
+        TRANSFORM_TYPES
+    )
 
 # Input Koordinat Awal
-st.sidebar.subheader("📍 Titik Awal Segitiga (P)")
-p1_x = st.sidebar.number_input("P1 (x)", value=1)
-p1_y = st.sidebar.number_input("P1 (y)", value=1)
-p2_x = st.sidebar.number_input("P2 (x)", value=5)
-p2_y = st.sidebar.number_input("P2 (y)", value=1)
-p3_x = st.sidebar.number_input("P3 (x)", value=3)
-p3_y = st.sidebar.number_input("P3 (y)", value=4)
-
-# Update Koordinat Awal
-original_points = np.array([
-    [p1_x, p2_x, p3_x],
-    [p1_y, p2_y, p3_y],
-    [1, 1, 1]
-])
+st.sidebar.subheader("📍 Titik Awal (P)")
+point_source = st.sidebar.radio("Sumber Titik", ("Segitiga (P1-P3)", "Unggah File (CSV/.npy)"))
+uploaded_xy = None
+
+if point_source == "Unggah File (CSV/.npy)":
+    uploaded_file = st.sidebar.file_uploader("File titik (satu titik x, y per baris)", type=["csv", "npy"])
+    if uploaded_file is not None:
+        data = uploaded_file.getvalue()
+        digest = hashlib.sha1(data).hexdigest()
+        try:
+            uploaded_xy = points_cache.get_or_compute(
+                ("muat", digest, uploaded_file.name), lambda: load_points(data, uploaded_file.name)
+            )
+        except ValueError as e:
+            st.sidebar.error(f"File tidak dapat dibaca: {e}")
+    if uploaded_xy is None:
+        st.sidebar.info("Belum ada file yang valid, segitiga bawaan dipakai.")
+    # Titik awal berbentuk (2, M); baris homogen tidak dibuat untuk data besar
+    original_points = uploaded_xy.T if uploaded_xy is not None else DEFAULT_POINTS
+else:
+    # Enam koordinat dikirim sekaligus: grafik, tabel dan matriks digambar ulang sekali per segitiga baru
+    with st.sidebar.form("segitiga", border=False):
+        p1_x = st.number_input("P1 (x)", value=1)
+        p1_y = st.number_input("P1 (y)", value=1)
+        p2_x = st.number_input("P2 (x)", value=5)
+        p2_y = st.number_input("P2 (y)", value=1)
+        p3_x = st.number_input("P3 (x)", value=3)
+        p3_y = st.number_input("P3 (y)", value=4)
+        st.form_submit_button("Terapkan Titik")
+
+    # Update Koordinat Awal
+    original_points = triangle_points((p1_x, p1_y), (p2_x, p2_y), (p3_x, p3_y))
 
 # --- Logika Transformasi Berdasarkan Pilihan ---
 
@@ -198,6 +162,7 @@ if transform_type == "Translasi":
     tx = st.sidebar.slider("Pergeseran X (tx)", -10, 10, 3)
     ty = st.sidebar.slider("Pergeseran Y (ty)", -10, 10, 2)
     
+    steps = [("Translasi", (tx, ty))]
     transform_matrix = get_translation_matrix(tx, ty)
     explanation = (
         f"**Translasi (Pergeseran)**: Setiap titik digeser sejauh **${tx}$** satuan horizontal (kanan/kiri) dan **${ty}$** satuan vertikal (atas/bawah)."
@@ -208,9 +173,9 @@ if transform_type == "Translasi":
 elif transform_type == "Rotasi":
     st.sidebar.subheader("🔄 Parameter Rotasi")
     angle = st.sidebar.slider("Sudut Rotasi (derajat)", -360, 360, 90)
-    cx = st.sidebar.number_input("Pusat Rotasi X (cx)", value=0)
-    cy = st.sidebar.number_input("Pusat Rotasi Y (cy)", value=0)
+    cx, cy = center_input("Rotasi", "rotasi_pusat")
     
+    steps = [("Rotasi", (angle, cx, cy))]
     transform_matrix = get_rotation_matrix(angle, cx, cy)
     explanation = (
         f"**Rotasi (Perputaran)**: Bentuk diputar sebesar **${angle}^\circ$** berlawanan arah jarum jam (jika positif) mengelilingi titik pusat **$({cx}, {cy})$**."
@@ -224,6 +189,7 @@ elif transform_type == "Refleksi":
         ("sumbu-X", "sumbu-Y", "garis y=x", "garis y=-x", "titik (0,0)")
     )
     
+    steps = [("Refleksi", (reflection_axis,))]
     transform_matrix = get_reflection_matrix(reflection_axis)
     explanation = (
         f"**Refleksi (Pencerminan)**: Bentuk dicerminkan terhadap **{reflection_axis}**.\n\n"
@@ -234,9 +200,9 @@ elif transform_type == "Refleksi":
 elif transform_type == "Dilatasi":
     st.sidebar.subheader("🔍 Parameter Dilatasi")
     k = st.sidebar.slider("Faktor Skala (k)", 0.1, 5.0, 2.0)
-    cx = st.sidebar.number_input("Pusat Dilatasi X (cx)", value=0)
-    cy = st.sidebar.number_input("Pusat Dilatasi Y (cy)", value=0)
+    cx, cy = center_input("Dilatasi", "dilatasi_pusat")
     
+    steps = [("Dilatasi", (k, cx, cy))]
     transform_matrix = get_dilation_matrix(k, cx, cy)
     explanation = (
         f"**Dilatasi (Perkalian)**: Bentuk diperbesar/diperkecil dengan faktor skala **$k = {k}$** dari pusat **$({cx}, {cy})$**."
@@ -244,29 +210,112 @@ elif transform_type == "Dilatasi":
         f"Matriks Skala Saja (pusat (0,0)):\n$$\\begin{{pmatrix}} {k} & 0 & 0 \\\\ 0 & {k} & 0 \\\\ 0 & 0 & 1 \\end{{pmatrix}}$$"
     )
 
+elif transform_type == "Pipeline":
+    st.sidebar.subheader("🔗 Langkah Pipeline")
+    num_steps = st.sidebar.slider("Jumlah Langkah", 1, MAX_PIPELINE_STEPS, 2)
+
+    steps = []
+    descriptions = []
+    for i in range(num_steps):
+        step_type = st.sidebar.selectbox(f"Langkah {i + 1}", TRANSFORM_TYPES, index=(1, 0)[i % 2], key=f"step_type_{i}")
+        params, description = pipeline_step_input(step_type, i)
+        steps.append((step_type, params))
+        descriptions.append(f"{i + 1}. {description}")
+
+    # Semua langkah digabung dulu menjadi satu matriks, lalu titik dikalikan sekali saja
+    transform_matrix = compose_transforms(steps)
+    explanation = (
+        f"**Pipeline Transformasi**: {num_steps} langkah diterapkan berurutan:\n\n"
+        + "\n".join(descriptions)
+        + "\n\nMatriks gabungan $T = M_k \\cdots M_2 M_1$ dihitung sekali, lalu semua titik dikalikan dengan $T$ dalam satu perkalian matriks."
+    )
+
+st.sidebar.markdown("---")
+backend = chart_backend()
+rerun_phase("skrip")
+
 # --- Penerapan dan Visualisasi Hasil Transformasi ---
 
-transformed_points = apply_transform(original_points, transform_matrix)
+# Kunci cache: isi titik (hash file unggahan atau koordinat segitiga) dan matriks transformasi
+if uploaded_xy is not None:
+    points_key = file_key(digest)
+else:
+    points_key = triangle_key(original_points)
+result_key = points_key + (transform_matrix.tobytes(),)
+
+if uploaded_xy is not None and len(uploaded_xy) >= JOB_MIN_POINTS:
+    # File besar: dihitung per potongan di job latar, sehingga mengganti matriks di tengah jalan
+    # membatalkan transformasi lama alih-alih menunggunya selesai
+    def transform_large(job):
+        target = np.empty((len(uploaded_xy), 2))
+        apply_transform_memmap(uploaded_xy, target, transform_matrix, JOB_CHUNK_POINTS, on_chunk=job.report)
+        return target.T
+
+    transformed_points, job = cached_job(points_cache, session_owner(), "transformasi: titik", ("hasil",) + result_key, transform_large)
+    if job is not None:
+        with span("tunggu"):
+            transformed_points = follow(job, st.empty(), describe=lambda done, total: f"{done:,} dari {total:,} titik")
+elif uploaded_xy is not None:
+    # Titik (M, 2) dari file: satu perkalian matriks untuk semua titik
+    transformed_points = points_cache.get_or_compute(
+        ("hasil",) + result_key, lambda: apply_transform_xy(uploaded_xy, transform_matrix).T
+    )
+else:
+    transformed_points = points_cache.get_or_compute(
+        ("hasil",) + result_key, lambda: apply_transform(original_points, transform_matrix)
+    )
 
 st.header(f"Hasil {transform_type}")
-plot_transformation(original_points, transformed_points, f"Transformasi: {transform_type}", explanation)
+plot_transformation(original_points, transformed_points, f"Transformasi: {transform_type}", explanation, points_key, transform_matrix, backend)
+
+# Animasi dari identitas ke transformasi pilihan
+st.subheader("▶️ Animasi Transformasi")
+
+@lab_fragment("transformasi")
+def animation_section(original_points, steps, points_key):
+    """Toggle dan slider animasi hanya menjalankan ulang bagian ini, bukan grafik dan tabel"""
+    if not st.toggle("Putar animasi", value=False):
+        return
+    col_frames, col_duration = st.columns(2)
+    frames_per_step = col_frames.slider("Jumlah Frame per Langkah", 10, 120, 40)
+    duration = col_duration.slider("Durasi (detik)", 1.0, 10.0, 3.0)
+
+    def render_animation():
+        # Semua matriks frame dibuat sebagai satu tensor (T, 3, 3) lalu diterapkan dengan satu einsum
+        anim_step = -(-original_points.shape[1] // MAX_ANIMATION_POINTS)
+        anim_xy = original_points[:2, ::anim_step].T
+        frame_matrices = pipeline_frame_matrices(steps, frames_per_step)
+        frames_xy = apply_transform_frames(frame_matrices, anim_xy)
+        return frames_to_svg(anim_xy, frames_xy, duration_s=duration * len(steps)), frames_xy.shape[:2]
+
+    svg, (frame_count, point_count) = figure_cache.get_or_compute(
+        ("animasi",) + points_key + (tuple(steps), frames_per_step, duration), render_animation
+    )
+    # Animasi SVG dijalankan di browser, tanpa menggambar ulang tiap frame di server
+    st.image(svg)
+    st.caption(f"{frame_count} frame x {point_count} titik, dianimasikan di browser.")
+
+animation_section(original_points, steps, points_key)
 
 # Tampilkan Koordinat Hasil
 st.subheader("📚 Detail Koordinat")
 
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("**Titik Awal (P)**")
-    st.dataframe(original_points[:2, :].T, columns=['X', 'Y'], height=150)
-    
-with col2:
-    st.markdown("**Titik Hasil (P')**")
-    # Tampilkan hasil pembulatan agar lebih mudah dibaca
-    rounded_transformed = np.round(transformed_points[:2, :].T, 2)
-    st.dataframe(rounded_transformed, columns=['X\'', 'Y\''], height=150)
+# Titik awal dan hasil dalam satu tabel Arrow (satu halaman per tampilan); hasil dibulatkan agar mudah dibaca
+columns = {
+    'X': original_points[0],
+    'Y': original_points[1],
+    'X\'': transformed_points[0],
+    'Y\'': transformed_points[1],
+}
+paged_table("transformasi", "koordinat", columns, digits={'X\'': 2, 'Y\'': 2}, height=250)
+export_buttons(columns, f"transformasi-{transform_type.lower()}", "koordinat")
 
 # Tampilkan Matriks Transformasi yang Digunakan
 st.subheader("📝 Matriks Transformasi")
 st.markdown(f"Matriks **${transform_type}$** 3x3 yang digunakan:")
 st.latex(f"T = {transform_matrix}")
+
+end_rerun()
+
+# Panel debug cache (?debug=1), di akhir skrip agar statistik rerun ini ikut terhitung
+show_cache_panel()
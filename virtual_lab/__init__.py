@@ -0,0 +1 @@
+"""Komponen bersama untuk semua Virtual Lab (cache hasil, render gambar, panel debug)."""
@@ -0,0 +1,286 @@
+"""Perhitungan barisan dan deret aritmatika/geometri, dipakai bersama oleh kedua app deret.
+
+Modul ini hanya memakai NumPy dan pustaka standar (tanpa Streamlit maupun matplotlib), sehingga
+bisa diimpor dan diukur tanpa UI, misalnya oleh python -m virtual_lab.benchmark_core.
+"""
+
+import math
+import sys
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+
+SEQUENCE_TYPES = ("Aritmatika", "Geometri")
+SWEEP_CHUNK_ROWS = 25   # Jumlah nilai a per potongan sapuan yang bisa dibatalkan
+
+def calculate_sequences(a, param, N, type):
+    """Menghitung suku (Un) dan jumlah deret (Sn) untuk n = 1..N sekaligus"""
+    k = np.arange(N)  # k = n - 1, dengan n dimulai dari 1
+
+    if type == "Aritmatika":
+        # Un = a + (n-1)b
+        U = a + k * float(param)
+        # Sn = n/2 (2a + (n-1)b)
+        S = (k + 1) / 2 * (2 * a + k * float(param))
+    elif type == "Geometri":
+        # Suku yang melewati batas float64 menjadi inf (tanpa peringatan)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            # r^(n-1) sekaligus untuk semua n; eksak untuk rasio bulat selama hasilnya
+            # masih terwakili float64 (tidak seperti exp((n-1) ln|r|))
+            powers = np.power(float(param), k)
+
+            # Un = a * r^(n-1)
+            U = a * powers
+            if param == 1:
+                # Sn = n * a untuk r = 1
+                S = a * (k + 1.0)
+            else:
+                # Sn = a(r^n - 1) / (r - 1), dengan r^n = r * r^(n-1)
+                S = a * (powers * param - 1) / (param - 1)
+    else:
+        raise ValueError(f"Jenis barisan tidak dikenal: {type}")
+
+    return U, S
+
+# --- Suku ke-n Tunggal (tanpa membangun array) ---
+
+MAX_EXACT_BITS = 500_000     # Batas ukuran pembilang/penyebut r^n pada mode eksak
+MAX_INDEX_EXPONENT = 10_000  # Batas k pada input indeks berbentuk 10^k
+FLOAT_MAX_LOG10 = math.log10(sys.float_info.max)   # ~308.25
+FLOAT_MIN_LOG10 = math.log10(sys.float_info.min)   # ~-307.65 (bilangan normal terkecil)
+
+def power_by_squaring(x, n):
+    """Menghitung x^n (n >= 0) dengan pemangkatan kuadrat berulang: O(log n) perkalian"""
+    result = x ** 0
+    while n > 0:
+        if n & 1:
+            result = result * x
+        n >>= 1
+        if n:
+            x = x * x
+    return result
+
+def parse_index(text):
+    """Membaca indeks n dari teks, misalnya '1000000', '1_000_000' atau '10^12'"""
+    text = text.strip().replace("_", "").replace(" ", "")
+    if "^" in text:
+        base, exponent = text.split("^", 1)
+        if int(exponent) > MAX_INDEX_EXPONENT:
+            raise ValueError(f"pangkat indeks maksimal {MAX_INDEX_EXPONENT}")
+        n = int(base) ** int(exponent)
+    else:
+        n = int(text)
+    if n < 1:
+        raise ValueError("n harus bilangan bulat >= 1")
+    return n
+
+def _int_log10(x):
+    """log10 dari bilangan bulat positif sebesar apa pun (tanpa konversi ke float)"""
+    shift = max(x.bit_length() - 64, 0)
+    return math.log10(x >> shift) + shift * math.log10(2)
+
+def _exact_to_log(x):
+    """Mengubah int/Fraction eksak menjadi pasangan (tanda, log10|x|)"""
+    x = Fraction(x)
+    if x == 0:
+        return 0, -math.inf
+    sign = 1 if x > 0 else -1
+    return sign, _int_log10(abs(x.numerator)) - _int_log10(x.denominator)
+
+def _log_status(name, value):
+    """Catatan overflow/underflow float64 untuk nilai dalam domain log"""
+    sign, log10_abs = value
+    if sign != 0 and log10_abs > FLOAT_MAX_LOG10:
+        return f"{name} overflow: |{name}| ≈ 10^{log10_abs:.4g} melebihi batas float64"
+    if sign != 0 and log10_abs < FLOAT_MIN_LOG10:
+        return f"{name} underflow: |{name}| ≈ 10^{log10_abs:.4g} di bawah batas float64"
+    return None
+
+def _log10_affine(offset, count, slope):
+    """(offset + count * slope) / ln 10 untuk bilangan bulat count sebesar apa pun.
+
+    Bila hasilnya melampaui float64, perhitungan diulang dengan Decimal (tanpa mengubah
+    count ke float), dan log10 dikembalikan sebagai Decimal.
+    """
+    try:
+        value = offset + count * slope
+        if math.isfinite(value):
+            return value / math.log(10)
+    except OverflowError:
+        pass
+    return (Decimal(offset) + Decimal(count) * Decimal(slope)) / Decimal(math.log(10))
+
+def calculate_term(a, param, n, type, mode="eksak"):
+    """Menghitung Un dan Sn untuk satu indeks n (boleh sangat besar) dengan rumus tertutup.
+
+    mode "eksak" memakai int/Fraction, "float" memakai float64, dan "log" mengembalikan
+    pasangan (tanda, log10|nilai|); log10 berupa Decimal bila melampaui float64 (n sangat
+    besar). Hasil: (Un, Sn, catatan overflow/underflow).
+    """
+    notes = []
+
+    if mode == "eksak":
+        # Nilai desimal dari input diubah ke pecahan eksak (1.5 -> 3/2)
+        a_q, r_q = Fraction(str(a)), Fraction(str(param))
+        if type == "Aritmatika":
+            U = a_q + (n - 1) * r_q
+            S = Fraction(n, 2) * (2 * a_q + (n - 1) * r_q)
+        elif type == "Geometri":
+            # r^(n-1) untuk a = 0 (semua suku nol) dan r = 1, -1, 0 tidak perlu dipangkatkan
+            if a_q == 0:
+                r_pow = Fraction(0)
+            elif r_q == 1:
+                r_pow = Fraction(1)
+            elif r_q == -1:
+                r_pow = Fraction(-1 if (n - 1) % 2 else 1)
+            elif r_q == 0:
+                r_pow = Fraction(1 if n == 1 else 0)
+            else:
+                bits = (n - 1) * max(abs(r_q.numerator).bit_length(), r_q.denominator.bit_length())
+                if bits > MAX_EXACT_BITS:
+                    raise OverflowError(
+                        f"r^(n-1) butuh lebih dari {MAX_EXACT_BITS:,} bit untuk disimpan eksak; gunakan mode log"
+                    )
+                # Pembilang dan penyebut sudah koprima, jadi cukup dipangkatkan masing-masing
+                r_pow = Fraction(
+                    power_by_squaring(r_q.numerator, n - 1),
+                    power_by_squaring(r_q.denominator, n - 1),
+                )
+            U = a_q * r_pow
+            S = a_q * n if r_q == 1 else a_q * (r_pow * r_q - 1) / (r_q - 1)
+        else:
+            raise ValueError(f"Jenis barisan tidak dikenal: {type}")
+        U = U.numerator if U.denominator == 1 else U
+        S = S.numerator if S.denominator == 1 else S
+
+    elif mode == "float":
+        a_f, r_f = float(a), float(param)
+        if n.bit_length() > sys.float_info.max_exp:
+            raise OverflowError("n melebihi batas float64; gunakan mode log")
+        if type == "Aritmatika":
+            U = a_f + (n - 1) * r_f
+            S = n / 2 * (2 * a_f + (n - 1) * r_f)
+        elif type == "Geometri":
+            r_pow = power_by_squaring(r_f, n - 1)
+            U = a_f * r_pow
+            S = a_f * n if r_f == 1 else a_f * (r_pow * r_f - 1) / (r_f - 1)
+        else:
+            raise ValueError(f"Jenis barisan tidak dikenal: {type}")
+        # Laporkan nilai yang jatuh ke inf/nan/0 alih-alih menampilkannya diam-diam
+        for name, value in (("Un", U), ("Sn", S)):
+            if math.isinf(value) or math.isnan(value):
+                notes.append(f"{name} overflow: hasil float64 menjadi {value}")
+        if type == "Geometri" and U == 0 and a_f != 0 and r_f != 0:
+            notes.append("Un underflow: hasil float64 menjadi 0")
+
+    elif mode == "log":
+        if type == "Aritmatika":
+            # Un dan Sn berupa polinom dalam n: cukup dihitung eksak lalu diambil log-nya
+            U, S, _ = calculate_term(a, param, n, type, "eksak")
+            U, S = _exact_to_log(U), _exact_to_log(S)
+        elif type == "Geometri":
+            a_f, r_f = float(a), float(param)
+            if a_f == 0 or r_f == 0 or r_f == 1 or r_f == -1:
+                # Kasus khusus yang tidak tumbuh secara eksponensial
+                U, S, _ = calculate_term(a, param, n, type, "eksak")
+                U, S = _exact_to_log(U), _exact_to_log(S)
+            else:
+                ln_a, ln_r = math.log(abs(a_f)), math.log(abs(r_f))
+                sign_a = 1 if a_f > 0 else -1
+                sign_r_pow = -1 if (r_f < 0 and (n - 1) % 2 == 1) else 1
+
+                # ln|Un| = ln|a| + (n-1) ln|r|
+                U = (sign_a * sign_r_pow, _log10_affine(ln_a, n - 1, ln_r))
+
+                # r^n - 1 dalam domain log, tanpa pernah menghitung r^n secara langsung
+                try:
+                    L = float(n) * ln_r
+                except OverflowError:
+                    L = math.copysign(math.inf, ln_r)  # |r^n| jauh dari 1: koreksi log1p menjadi 0
+                sign_rn = -1 if (r_f < 0 and n % 2 == 1) else 1
+                ln_r1 = math.log(abs(r_f - 1))
+
+                # ln|Sn| = ln|a| + ln|r^n - 1| - ln|r - 1|
+                if L > 0:
+                    sign_diff = sign_rn
+                    # ln|r^n - 1| = n ln|r| + log1p(-(tanda r^n) / |r|^n)
+                    S_log10 = _log10_affine(ln_a + math.log1p(-sign_rn * math.exp(-L)) - ln_r1, n, ln_r)
+                else:
+                    sign_diff = -1
+                    S_log10 = (ln_a + math.log1p(-sign_rn * math.exp(L)) - ln_r1) / math.log(10)
+                sign_s = sign_a * sign_diff * (1 if r_f > 1 else -1)
+                S = (sign_s, S_log10)
+        else:
+            raise ValueError(f"Jenis barisan tidak dikenal: {type}")
+        notes = [note for note in (_log_status("Un", U), _log_status("Sn", S)) if note]
+
+    else:
+        raise ValueError(f"Mode numerik tidak dikenal: {mode}")
+
+    return U, S, notes
+
+def format_term(value, mode, digits=6):
+    """Menampilkan hasil calculate_term sebagai teks yang mudah dibaca"""
+    if mode == "float":
+        return f"{value + 0.0:.{digits}g}"  # + 0.0 menghindari tampilan "-0"
+    sign, log10_abs = value if mode == "log" else _exact_to_log(value)
+    if sign == 0:
+        return "0"
+    if mode == "eksak" and log10_abs < 15:
+        # Bilangan eksak yang kecil ditampilkan apa adanya (pecahan bila perlu)
+        return str(value) if isinstance(value, int) or value.denominator < 10**6 else f"{float(value):.{digits}g}"
+    if abs(log10_abs) >= 1e15:
+        # Eksponen sendiri lebih panjang dari presisi float64: tampilkan dalam notasi ilmiah
+        return f"≈ {'-' if sign < 0 else ''}10^({log10_abs:.6g})"
+    exponent = math.floor(log10_abs)
+    # log10 float64 hanya punya ~15 digit bermakna, dan sebagian terpakai oleh eksponen;
+    # sisanya menentukan berapa digit mantissa yang masih benar
+    digits = min(digits, 15 - len(str(abs(exponent))))
+    if digits < 1:
+        return f"≈ {'-' if sign < 0 else ''}10^{exponent}"
+    mantissa = 10 ** (log10_abs - exponent)
+    return f"{'-' if sign < 0 else ''}{mantissa:.{digits - 1}f} × 10^{exponent}"
+
+# --- Sapuan Parameter (banyak a dan b/r sekaligus) ---
+
+def calculate_sweep(a_values, param_values, N, type, on_chunk=None):
+    """Menghitung Un dan Sn untuk setiap kombinasi (a, b/r) sekaligus.
+
+    Hasil berupa dua array berbentuk (jumlah a, jumlah b/r, N) dari satu perhitungan broadcast.
+    Bila on_chunk diberikan, baris a dihitung per potongan SWEEP_CHUNK_ROWS dan on_chunk
+    dipanggil dengan (baris selesai, jumlah baris) sebelum setiap potongan (boleh melempar).
+    """
+    a_values = np.asarray(a_values, dtype=float)
+    if on_chunk is None:
+        return _sweep_block(a_values, param_values, N, type)
+
+    U = np.empty((len(a_values), len(param_values), N))
+    S = np.empty_like(U)
+    for start in range(0, len(a_values), SWEEP_CHUNK_ROWS):
+        on_chunk(start, len(a_values))
+        stop = start + SWEEP_CHUNK_ROWS
+        U[start:stop], S[start:stop] = _sweep_block(a_values[start:stop], param_values, N, type)
+    return U, S
+
+def _sweep_block(a_values, param_values, N, type):
+    a_grid = a_values[:, None, None]                              # (A, 1, 1)
+    p_grid = np.asarray(param_values, dtype=float)[None, :, None]  # (1, P, 1)
+    k = np.arange(N)[None, None, :]                               # (1, 1, N), k = n - 1
+
+    if type == "Aritmatika":
+        # Un = a + (n-1)b, Sn = n/2 (2a + (n-1)b)
+        U = a_grid + k * p_grid
+        S = (k + 1) / 2 * (2 * a_grid + k * p_grid)
+    elif type == "Geometri":
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            # r^(n-1) cukup dihitung sekali untuk semua a: (1, P, N)
+            powers = np.power(p_grid, k)
+            U = a_grid * powers
+            # Sn = a(r^n - 1) / (r - 1), dan Sn = n * a untuk r = 1
+            ratio_sum = np.where(p_grid == 1, k + 1.0, (powers * p_grid - 1) / (p_grid - 1))
+            S = a_grid * ratio_sum
+    else:
+        raise ValueError(f"Jenis barisan tidak dikenal: {type}")
+
+    return U, S
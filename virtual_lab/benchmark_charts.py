@@ -0,0 +1,103 @@
+"""Benchmark mesin grafik: PNG matplotlib vs. grafik vektor Vega-Lite (Altair), per rerun.
+
+Untuk setiap grafik utama lab (Un/Sn, histogram CLT, transformasi) diukur waktu CPU server
+dan ukuran data yang dikirim ke browser:
+
+- matplotlib: render figure (pool figure sudah hangat) ke PNG; payload = byte PNG.
+- vega: membangun grafik Altair lalu menyerialisasinya seperti st.altair_chart
+  (spesifikasi JSON + data sebagai Arrow IPC); payload = ukuran pesan VegaLiteChart.
+
+Pada mesin matplotlib, PNG disimpan di cache sehingga rerun dengan parameter yang sama tidak
+merender ulang (kolom "hit cache"); grafik vektor selalu dibangun ulang, tetapi jauh lebih murah.
+
+Jalankan dengan: python -m virtual_lab.benchmark_charts
+"""
+
+import json
+import time
+
+import numpy as np
+
+from virtual_lab.deret import calculate_sequences, render_sequence_pngs, sequence_charts
+from virtual_lab.grafik_clt import distribution_png, distribution_chart
+from virtual_lab.grafik_transformasi import DEFAULT_TRIANGLE, triangle_points, transformation_png, transformation_chart
+from virtual_lab.simulasi import simulate_histogram
+from virtual_lab.transformasi import apply_transform, get_rotation_matrix
+
+
+def vega_payload(*charts):
+    """Ukuran pesan VegaLiteChart (byte) yang dikirim st.altair_chart untuk grafik-grafik ini"""
+    # Fungsi internal Streamlit yang sama dengan yang dipakai st.altair_chart
+    from streamlit.elements.vega_charts import _convert_altair_to_vega_lite_spec, _marshall_chart_data
+    from streamlit.proto.VegaLiteChart_pb2 import VegaLiteChart
+
+    total = 0
+    for chart in charts:
+        proto = VegaLiteChart()
+        spec = _convert_altair_to_vega_lite_spec(chart)
+        _marshall_chart_data(proto, spec)
+        proto.spec = json.dumps(spec)
+        total += proto.ByteSize()
+    return total
+
+
+def best_cpu(fn, repeat=3):
+    """Waktu CPU terbaik (detik) dan hasil dari beberapa kali pemanggilan"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        result = fn()
+        best = min(best, time.process_time() - start)
+    return best, result
+
+
+def cases():
+    """(nama, fungsi PNG -> daftar byte PNG, fungsi vega -> daftar grafik Altair)"""
+    for sequence_type, param, n_max in (("Aritmatika", 3.0, 10), ("Geometri", 1.5, 1_000), ("Geometri", 0.9, 1_000_000)):
+        U_n, S_n = calculate_sequences(2, param, n_max, sequence_type)
+        yield (
+            f"deret {sequence_type} N={n_max:,}",
+            lambda U_n=U_n, S_n=S_n, t=sequence_type, p=param: render_sequence_pngs(U_n, S_n, t, p),
+            lambda U_n=U_n, S_n=S_n, t=sequence_type, p=param: sequence_charts(U_n, S_n, t, p),
+        )
+
+    for population, N in (("normal", 1_000), ("bernoulli", 100_000), ("lognormal", 1_000_000)):
+        _, density, edges = simulate_histogram(50, 10, 5, N, 42, 1, population, True)
+        yield (
+            f"CLT {population} N={N:,}",
+            lambda d=density, e=edges, p=population, N=N: (distribution_png(50, 10, 5, N, p, d, e),),
+            lambda d=density, e=edges, p=population, N=N: (distribution_chart(50, 10, 5, N, p, d, e),),
+        )
+
+    rotation = get_rotation_matrix(30)
+    angles = np.linspace(0, 2 * np.pi, 100_000, endpoint=False)
+    shapes = {
+        "segitiga": triangle_points(*DEFAULT_TRIANGLE),
+        "elips 100.000 titik": np.vstack([5 * np.cos(angles), 3 * np.sin(angles), np.ones_like(angles)]),
+    }
+    for name, points in shapes.items():
+        transformed = apply_transform(points, rotation)
+        yield (
+            f"transformasi {name}",
+            lambda P=points, T=transformed: (transformation_png(P, T, "Rotasi")[0],),
+            lambda P=points, T=transformed: (transformation_chart(P, T, "Rotasi")[0],),
+        )
+
+
+def main():
+    print(f"{'grafik':<32} {'PNG CPU (ms)':>13} {'PNG (KB)':>9} {'vega CPU (ms)':>14} {'vega (KB)':>10} {'CPU x':>7} {'ukuran x':>9}")
+    for name, make_pngs, make_charts in cases():
+        make_pngs()  # figure pool dan font cache dihangatkan dulu
+        t_png, pngs = best_cpu(make_pngs)
+        t_vega, payload = best_cpu(lambda: vega_payload(*make_charts()))
+        png_bytes = sum(len(png) for png in pngs)
+        print(
+            f"{name:<32} {t_png * 1e3:13.1f} {png_bytes / 1024:9.1f} {t_vega * 1e3:14.1f} {payload / 1024:10.1f} "
+            f"{t_png / t_vega:6.1f}x {png_bytes / payload:8.1f}x"
+        )
+    print()
+    print("PNG: pada rerun dengan parameter yang sama (hit cache) CPU render = 0, tetapi byte PNG tetap dikirim ulang.")
+
+
+if __name__ == "__main__":
+    main()
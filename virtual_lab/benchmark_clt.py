@@ -0,0 +1,74 @@
+"""Benchmark sampler rata-rata sampel: loop Python lama vs. blok vektor (simulasi.sample_means),
+jalur cepat distribusi eksak per populasi, serta simulasi paralel (simulasi.simulate_sample_means) dengan beberapa jumlah worker.
+
+Jalankan dengan: python -m virtual_lab.benchmark_clt
+"""
+
+import os
+import time
+
+import numpy as np
+
+from virtual_lab.simulasi import sample_means, simulate_sample_means
+
+
+def sample_means_loop(mu, sigma, n, N):
+    """Sampler lama dari plot_distributions: satu np.random.normal per sampel"""
+    sample_means = []
+    for _ in range(N):
+        sample = np.random.normal(loc=mu, scale=sigma, size=n)
+        sample_means.append(np.mean(sample))
+    return np.array(sample_means)
+
+
+def best_time(fn, repeat=3):
+    """Waktu terbaik (detik) dari beberapa kali pemanggilan"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    mu, sigma = 50, 10
+    print(f"{'n':>5} {'N':>10} {'loop (s)':>10} {'blok (s)':>10} {'percepatan':>11}")
+    for n in (5, 30, 100):
+        for N in (1_000, 5_000, 100_000, 1_000_000):
+            rng = np.random.default_rng(0)
+            t_block = best_time(lambda: sample_means(mu, sigma, n, N, rng, fast_path=False))
+            if N <= 100_000:
+                t_loop = best_time(lambda: sample_means_loop(mu, sigma, n, N), repeat=1)
+                speedup = f"{t_loop / t_block:10.1f}x"
+                loop_text = f"{t_loop:10.4f}"
+            else:
+                # Loop lama terlalu lambat untuk N sebesar ini
+                speedup, loop_text = f"{'-':>11}", f"{'-':>10}"
+            print(f"{n:>5} {N:>10} {loop_text} {t_block:10.4f} {speedup}")
+
+    print()
+    print("Jalur cepat vs. blok (n=30, N=1.000.000)")
+    print(f"{'populasi':>12} {'blok (s)':>10} {'cepat (s)':>10} {'percepatan':>11}")
+    for population in ("normal", "exponential", "bernoulli", "bimodal"):
+        rng = np.random.default_rng(0)
+        t_block = best_time(lambda: sample_means(mu, sigma, 30, 1_000_000, rng, population=population, fast_path=False))
+        t_fast = best_time(lambda: sample_means(mu, sigma, 30, 1_000_000, rng, population=population))
+        print(f"{population:>12} {t_block:10.4f} {t_fast:10.4f} {t_block / t_fast:10.1f}x")
+
+    print()
+    print(f"Paralel (n=30, N=5.000.000, seed=0, {os.cpu_count()} CPU)")
+    print(f"{'worker':>7} {'waktu (s)':>10} {'identik':>8}")
+    reference = None
+    for workers in (1, 2, 4):
+        # Pemanggilan pertama ikut menyalakan process pool, jadi tidak diukur
+        simulate_sample_means(mu, sigma, 30, 5_000_000, seed=0, workers=workers)
+        start = time.perf_counter()
+        means = simulate_sample_means(mu, sigma, 30, 5_000_000, seed=0, workers=workers)
+        elapsed = time.perf_counter() - start
+        reference = means if reference is None else reference
+        print(f"{workers:>7} {elapsed:10.4f} {str(np.array_equal(means, reference)):>8}")
+
+
+if __name__ == "__main__":
+    main()
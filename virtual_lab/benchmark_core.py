@@ -0,0 +1,144 @@
+"""Benchmark inti perhitungan semua lab (tanpa UI): latensi dan memori per ukuran masukan.
+
+Yang diukur hanya modul perhitungan murni, yang bisa diimpor tanpa Streamlit dan matplotlib:
+
+- virtual_lab.barisan: calculate_sequences, calculate_term, calculate_sweep (kedua app deret)
+- virtual_lab.simulasi: simulate_histogram (sampling plot_distributions), sweep_sample_sizes
+- virtual_lab.transformasi: apply_transform, compose_transforms, pembuat matriks
+- virtual_lab.pengurut: sort_numbers
+
+Seperti asv, jumlah pemanggilan per pengukuran dipilih otomatis (timeit autorange) dan yang
+dilaporkan adalah waktu terbaik per pemanggilan. Memori = puncak alokasi satu pemanggilan
+(tracemalloc, termasuk array NumPy). Hasil bisa disimpan lalu dibandingkan dengan baseline:
+
+    python -m virtual_lab.benchmark_core --json baseline.json
+    python -m virtual_lab.benchmark_core --baseline baseline.json   # keluar dengan kode 1 bila ada regresi
+
+Opsi --filter memilih benchmark berdasarkan potongan nama, misalnya --filter barisan.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from virtual_lab.barisan import calculate_sequences, calculate_sweep, calculate_term
+from virtual_lab.formatting import format_bytes, format_time
+from virtual_lab.pengurut import sort_numbers
+from virtual_lab.simulasi import simulate_histogram, sweep_sample_sizes
+from virtual_lab.transformasi import (
+    apply_transform, compose_transforms, get_dilation_matrix, get_reflection_matrix, get_rotation_matrix,
+    get_translation_matrix
+)
+
+# Inti perhitungan harus bisa diimpor tanpa modul UI (dicek sebelum benchmark berjalan)
+UI_MODULES = ("streamlit", "matplotlib", "altair", "pandas")
+
+REPEAT = 3                   # Jumlah pengukuran; yang terbaik dilaporkan
+DEFAULT_THRESHOLD = 1.3      # Lebih lambat/boros dari baseline sebesar faktor ini = regresi
+MIN_COMPARE_S = 1e-6         # Di bawah ini, selisih waktu dianggap derau pengukuran
+
+def cases():
+    """(nama, ukuran, fungsi tanpa argumen) untuk setiap benchmark"""
+    for sequence_type, param in (("Aritmatika", 3.0), ("Geometri", 0.9)):
+        for N in (1_000, 100_000, 1_000_000, 10_000_000):
+            yield f"barisan.calculate_sequences {sequence_type}", f"N={N:,}", lambda p=param, N=N, t=sequence_type: calculate_sequences(2, p, N, t)
+
+    for mode, n in (("eksak", 1_000), ("eksak", 100_000), ("float", 10**12), ("log", 10**12), ("log", 10**100)):
+        yield f"barisan.calculate_term Geometri {mode}", f"n=10^{len(str(n)) - 1}", lambda m=mode, n=n: calculate_term(2, 1.5, n, "Geometri", m)
+
+    for count, N in ((50, 20), (200, 20), (400, 25)):
+        values = np.linspace(-2, 2, count)
+        yield "barisan.calculate_sweep Geometri", f"{count}x{count}x{N}", lambda v=values, N=N: calculate_sweep(v, v, N, "Geometri")
+
+    for population in ("normal", "lognormal"):
+        for N in (1_000, 100_000, 1_000_000):
+            yield f"simulasi.simulate_histogram {population}", f"N={N:,}", lambda p=population, N=N: simulate_histogram(50, 10, 30, N, 42, 1, p, True)
+
+    for N in (10_000, 100_000):
+        yield "simulasi.sweep_sample_sizes", f"N={N:,}", lambda N=N: sweep_sample_sizes(50, 10, 100, N, np.random.default_rng(42))
+
+    matrix = compose_transforms([("Rotasi", (30, 0, 0)), ("Dilatasi", (2, 0, 0)), ("Translasi", (3, 2))])
+    for M in (1_000, 100_000, 1_000_000, 10_000_000):
+        points = np.vstack([np.random.default_rng(0).random((2, M)), np.ones(M)])
+        yield "transformasi.apply_transform", f"M={M:,}", lambda P=points: apply_transform(P, matrix)
+
+    yield "transformasi.get_*_matrix", "4 matriks", lambda: (
+        get_translation_matrix(3, 2), get_rotation_matrix(30, 1, 1), get_reflection_matrix("garis y=x"),
+        get_dilation_matrix(2, 1, 1),
+    )
+    for steps in (3, 30):
+        pipeline = [("Rotasi", (30, 0, 0)), ("Dilatasi", (1.1, 0, 0)), ("Translasi", (1, 1))] * (steps // 3)
+        yield "transformasi.compose_transforms", f"{steps} langkah", lambda s=pipeline: compose_transforms(s)
+
+    yield "pengurut.sort_numbers", "3 bilangan", lambda: sort_numbers(3, -1, 2)
+
+def measure(fn):
+    """(detik per pemanggilan terbaik, jumlah pemanggilan per pengukuran, puncak memori byte)"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, number, peak
+
+def compare(result, base, threshold):
+    """Teks perbandingan dengan baseline dan apakah hasil ini regresi"""
+    if base is None:
+        return "baru", False
+    time_ratio = result["seconds"] / base["seconds"]
+    memory_ratio = (result["peak_bytes"] + 1) / (base["peak_bytes"] + 1)
+    slower = time_ratio > threshold and result["seconds"] - base["seconds"] > MIN_COMPARE_S
+    bigger = memory_ratio > threshold and result["peak_bytes"] - base["peak_bytes"] > 64 * 1024
+    return f"{time_ratio:.2f}x waktu, {memory_ratio:.2f}x memori", slower or bigger
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inti perhitungan semua lab (latensi dan memori)")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (misalnya sebagai baseline)")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Faktor regresi waktu/memori")
+    parser.add_argument("--filter", default="", help="Hanya benchmark yang namanya memuat teks ini")
+    args = parser.parse_args()
+
+    loaded = [name for name in UI_MODULES if name in sys.modules]
+    if loaded:
+        sys.exit(f"Inti perhitungan ikut mengimpor modul UI: {', '.join(loaded)}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(item["name"], item["size"]): item for item in json.load(f)["results"]}
+
+    results, regressions = [], []
+    print(f"{'benchmark':<44} {'ukuran':<14} {'waktu':>10} {'memori':>10}  {'vs. baseline' if baseline else ''}")
+    for name, size, fn in cases():
+        if args.filter not in name:
+            continue
+        seconds, number, peak = measure(fn)
+        result = {"name": name, "size": size, "seconds": seconds, "number": number, "peak_bytes": peak}
+        results.append(result)
+        note = ""
+        if baseline:
+            note, regressed = compare(result, baseline.get((name, size)), args.threshold)
+            if regressed:
+                regressions.append(f"{name} [{size}]")
+                note += "  <- REGRESI"
+        print(f"{name:<44} {size:<14} {format_time(seconds):>10} {format_bytes(peak):>10}  {note}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "numpy": np.__version__, "results": results}, f, indent=2)
+        print(f"\nHasil disimpan ke {args.json}")
+    if regressions:
+        print(f"\n{len(regressions)} regresi (> {args.threshold}x baseline): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Cache hasil perhitungan dan gambar, berkunci tuple parameter.
+
+Satu proses Streamlit melayani banyak sesi siswa sekaligus, dan modul ini hanya diimpor
+sekali per proses. Cache di sini dipakai bersama oleh semua sesi, sehingga kombinasi
+slider yang sama cukup dihitung dan digambar satu kali. Cache yang diberi store (DiskStore)
+juga membaca/menulis ke disk, sehingga replika lain di host yang sama ikut memakai hasilnya.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+from virtual_lab.metrics import span
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024   # 256 MB per cache
+DEFAULT_TTL_S = 3600.0                  # Entri kedaluwarsa setelah 1 jam
+WAIT_POLL_S = 0.05                      # Jeda pemeriksaan check() saat menunggu sesi lain
+
+MISSING = object()  # Penanda "belum ada di cache" (None bisa saja hasil yang sah)
+
+def estimate_size(value):
+    """Perkiraan ukuran memori (byte) sebuah nilai yang akan disimpan"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+def _freeze(value):
+    """Array yang disimpan dijadikan read-only agar tidak terubah oleh sesi lain"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    return value
+
+class ResultCache:
+    """Cache LRU dengan batas jumlah entri, batas ukuran (byte) dan TTL; aman untuk banyak thread.
+
+    Bila store diberikan, entri yang tidak ada di memori dicari di disk, dan setiap hasil
+    baru juga ditulis ke disk.
+    """
+
+    def __init__(self, name, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, ttl_s=DEFAULT_TTL_S, store=None):
+        self.name = name
+        self.store = store
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._entries = OrderedDict()   # kunci -> (nilai, ukuran, waktu simpan)
+        self._inflight = {}             # kunci -> Event, untuk perhitungan yang sedang berjalan
+        self._disk_locks = set()        # kunci yang kunci file disk-nya dipegang proses ini
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key, default=None):
+        """Mengambil nilai tersimpan (dan mencatat hit/miss); default bila tidak ada atau kedaluwarsa"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] > self.ttl_s:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        # Tidak ada di memori: coba disk (mungkin dihitung oleh replika lain)
+        value = self.store.load(self.name, key) if self.store is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self.disk_hits += 1
+        return self.put(key, value, persist=False)
+
+    def put(self, key, value, persist=True):
+        """Menyimpan nilai lalu membuang entri paling lama tidak dipakai bila melewati batas"""
+        if persist and self.store is not None:
+            self.store.save(self.name, key, value)
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value  # terlalu besar untuk disimpan; tetap dikembalikan apa adanya
+        _freeze(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    @contextmanager
+    def claim(self, key, counted=False, check=None):
+        """Mengklaim hak menghitung key.
+
+        Menghasilkan nilai yang sudah tersimpan, atau MISSING bila pemanggil harus menghitung
+        lalu memanggil put(). Selama klaim berjalan, sesi lain (dan replika lain lewat kunci
+        file di disk) yang meminta key yang sama menunggu hasilnya alih-alih ikut menghitung.
+        counted=True berarti miss untuk key ini sudah dicatat oleh get() sebelumnya. check()
+        dipanggil berkala selama menunggu dan boleh melempar (misalnya JobCancelled).
+        """
+        while True:
+            value = self.get(key, MISSING)
+            if counted and value is MISSING:
+                with self._lock:
+                    self.misses -= 1
+            counted = False
+            if value is not MISSING:
+                yield value
+                return
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+            with span("tunggu"):
+                while not event.wait(WAIT_POLL_S):
+                    if check is not None:
+                        check()
+            with self._lock:
+                # Hasil sesi lain sudah tersimpan: hitungan miss tadi diganti menjadi hit
+                if key in self._entries:
+                    self.misses -= 1
+
+        locked = False
+        try:
+            if self.store is not None:
+                locked = self.store.acquire(self.name, key)
+                if locked:
+                    with self._lock:
+                        self._disk_locks.add(key)
+                else:
+                    # Replika lain sedang menghitung key ini: tunggu hasilnya di disk
+                    with span("tunggu"):
+                        value = self.store.wait(self.name, key, check)
+                    if value is not None:
+                        with self._lock:
+                            self.misses -= 1
+                            self.disk_hits += 1
+                        yield self.put(key, value, persist=False)
+                        return
+            yield MISSING
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._disk_locks.discard(key)
+            if locked:
+                self.store.release(self.name, key)
+            event.set()
+
+    def touch(self, key):
+        """Menandai perhitungan key masih berjalan (kunci disk tidak menjadi basi bagi replika lain)"""
+        with self._lock:
+            held = key in self._disk_locks
+        if held:
+            self.store.touch_lock(self.name, key)
+
+    def get_or_compute(self, key, compute, counted=False, check=None):
+        """Mengembalikan nilai untuk key; compute() hanya dipanggil bila belum tersimpan"""
+        with self.claim(key, counted, check) as value:
+            if value is MISSING:
+                with span("hitung"):
+                    value = compute()
+                value = self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Ringkasan isi dan statistik cache untuk panel debug"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "cache": self.name,
+                "entri": len(self._entries),
+                "ukuran (MB)": round(self._bytes / 1024**2, 2),
+                "hit": self.hits,
+                "hit disk": self.disk_hits,
+                "miss": self.misses,
+                "rasio hit": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "eviksi": self.evictions,
+                "kedaluwarsa": self.expirations,
+            }
+
+# --- Registri Cache per Proses ---
+
+_caches = {}
+_registry_lock = threading.Lock()
+
+def get_cache(name, **limits):
+    """Cache bernama yang sama untuk semua sesi dan rerun dalam satu proses"""
+    with _registry_lock:
+        if name not in _caches:
+            _caches[name] = ResultCache(name, **limits)
+        return _caches[name]
+
+def all_caches():
+    with _registry_lock:
+        return list(_caches.values())
@@ -0,0 +1,28 @@
+"""Pilihan mesin grafik: PNG matplotlib dari server, atau grafik vektor Vega-Lite (Altair).
+
+Pada mesin vektor, server hanya mengirim array data dan spesifikasi grafik, lalu browser
+yang menggambarnya. Spesifikasi grafik tiap lab ada di modul grafiknya masing-masing
+(virtual_lab.deret, virtual_lab.grafik_clt, virtual_lab.grafik_transformasi).
+"""
+
+import os
+
+import streamlit as st
+
+CHARTS_ENV = "VIRTUAL_LAB_CHARTS"   # Mesin grafik awal: "matplotlib" atau "vega"
+DEFAULT_BACKEND = "matplotlib"
+
+BACKENDS = {
+    "Matplotlib (PNG dari server)": "matplotlib",
+    "Vektor (digambar browser)": "vega",
+}
+
+def chart_backend():
+    """Pilihan mesin grafik di sidebar; nilai awalnya dari variabel lingkungan VIRTUAL_LAB_CHARTS"""
+    default = os.environ.get(CHARTS_ENV, DEFAULT_BACKEND)
+    values = list(BACKENDS.values())
+    label = st.sidebar.radio(
+        "🖼️ Mesin Grafik", list(BACKENDS), index=values.index(default) if default in values else 0,
+        help="Grafik vektor digambar oleh browser: server hanya mengirim data, tanpa merender gambar.",
+    )
+    return BACKENDS[label]
@@ -0,0 +1,99 @@
+"""Panel debug Streamlit, aktif bila URL memuat ?debug=1.
+
+Siapa pun bisa membuka panel ini lewat URL, jadi panel hanya menampilkan statistik. Tombol
+pengosongan cache hanya muncul bila server menyalakan VIRTUAL_LAB_DEBUG_ADMIN=1, dan hanya
+mengosongkan cache memori proses ini, tidak pernah penyimpanan disk bersama semua replika.
+"""
+
+import os
+
+import streamlit as st
+
+from virtual_lab.cache import all_caches
+from virtual_lab.figures import figure_manager
+from virtual_lab.jobs import get_scheduler
+from virtual_lab.metrics import PHASES, exporters, last_rerun, page_summary
+from virtual_lab.session import session_owner
+from virtual_lab.store import get_store
+from virtual_lab.warmer import read_status, coverage, rate
+
+ADMIN_ENV = "VIRTUAL_LAB_DEBUG_ADMIN"   # "1" untuk menampilkan tombol "Kosongkan cache"
+
+def debug_enabled():
+    return st.query_params.get("debug") == "1"
+
+def show_rerun_panel():
+    """Waktu dan memori per fase rerun terakhir sesi ini, serta ringkasan per halaman"""
+    with st.sidebar.expander("⏱️ Debug Rerun", expanded=True):
+        rerun = last_rerun(session_owner())
+        if rerun is None:
+            st.caption("Belum ada rerun yang tercatat.")
+            return
+        phases = sorted(rerun["fase"].items(), key=lambda item: PHASES.index(item[0]) if item[0] in PHASES else len(PHASES))
+        table = {
+            "fase": [name for name, _ in phases],
+            "ms": [phase["ms"] for _, phase in phases],
+            "%": [round(100 * phase["ms"] / rerun["durasi_ms"], 1) if rerun["durasi_ms"] else 0.0 for _, phase in phases],
+            "panggilan": [phase["panggilan"] for _, phase in phases],
+            "RSS Δ (KB)": [phase["rss_delta_kb"] for _, phase in phases],
+        }
+        if "alokasi_puncak_mb" in rerun:
+            table["alokasi Δ (KB)"] = [phase["alokasi_delta_kb"] for _, phase in phases]
+        st.dataframe(table, hide_index=True)
+        st.caption(
+            f"Rerun {rerun['halaman']}: {rerun['durasi_ms']:.1f} ms, RSS {rerun['rss_awal_mb']:.1f} → {rerun['rss_akhir_mb']:.1f} MB"
+            + (f", puncak alokasi {rerun['alokasi_puncak_mb']:.1f} MB" if "alokasi_puncak_mb" in rerun else "")
+        )
+        st.dataframe(page_summary(), hide_index=True)
+        active = exporters()
+        prometheus = f"http://127.0.0.1:{active['prometheus']}/metrics" if active["prometheus"] else "mati"
+        jsonl = f"`{active['jsonl']}`" if active["jsonl"] else "mati"
+        st.caption(f"Ekspor (VIRTUAL_LAB_METRICS): Prometheus {prometheus}, JSONL {jsonl}")
+
+def show_cache_panel():
+    """Tabel hit/miss semua cache di sidebar (hanya pada mode debug)"""
+    if not debug_enabled():
+        return
+    show_rerun_panel()
+    with st.sidebar.expander("🐞 Debug Cache", expanded=True):
+        caches = all_caches()
+        if not caches:
+            st.caption("Belum ada cache yang dipakai.")
+            return
+        rows = [cache.stats() for cache in caches]
+        st.dataframe({key: [row[key] for row in rows] for key in rows[0]}, hide_index=True)
+
+        store = get_store()
+        if store is not None:
+            count, total = store.usage()
+            st.caption(
+                f"Disk `{store.directory}`: {count} file, {total / 1024**2:.1f} / {store.max_bytes / 1024**2:.0f} MB "
+                f"(baca {store.reads}, tulis {store.writes}, eviksi {store.evictions} oleh proses ini)"
+            )
+        figures = figure_manager.stats()
+        st.caption(
+            f"Figure matplotlib: {figures['figure di pool']} di pool (maks. {figure_manager.max_figures}, "
+            f"{figures['sedang dipakai']} sedang dipakai, {figures['pemilik']} sesi), "
+            f"dibuat {figures['dibuat']}, dipakai ulang {figures['dipakai ulang']}, eviksi {figures['eviksi']}, "
+            f"dilepas saat sesi berakhir {figures['dilepas']}; "
+            f"figure pyplot terbuka {figures['figure pyplot terbuka']}"
+        )
+        jobs = get_scheduler().stats()
+        st.caption(
+            f"Job latar: {jobs['berjalan']} berjalan, {jobs['antre']} antre (batas {jobs['batas per host']} per host, "
+            f"VIRTUAL_LAB_JOBS); dikirim {jobs['dikirim']}, dipakai bersama {jobs['dipakai bersama']}, "
+            f"dibatalkan {jobs['dibatalkan']}"
+        )
+        for status in read_status(store):
+            st.progress(
+                coverage(status),
+                text=f"Pemanas {status['lab']} ({status['preset']}, {status['state']}): cakupan {coverage(status):.1%}",
+            )
+            st.caption(
+                f"{status['selesai']:,}/{status['total']:,} kombinasi, dihitung {status['dihitung']:,}, "
+                f"sudah ada {status['sudah ada']:,}, gagal {status['gagal']}, {rate(status):.1f}/s"
+            )
+        if os.environ.get(ADMIN_ENV) == "1" and st.button("Kosongkan cache proses ini"):
+            for cache in caches:
+                cache.clear()
+            st.rerun()
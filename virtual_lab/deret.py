@@ -0,0 +1,138 @@
+"""Grafik dan kunci cache barisan/deret yang dipakai bersama oleh kedua app deret.
+
+Perhitungannya ada di virtual_lab.barisan. Modul ini tidak mengimpor Streamlit, sehingga bisa
+dipakai juga oleh pemanas cache (virtual_lab.warmer) yang berjalan di proses terpisah.
+"""
+
+import json
+
+import numpy as np
+
+from virtual_lab.barisan import SEQUENCE_TYPES, calculate_sequences
+from virtual_lab.figures import DEFAULT_OWNER, figure_manager, figure_to_png
+
+PARAM_RANGES = {"Aritmatika": (-5.0, 5.0), "Geometri": (-2.0, 2.0)}  # Rentang slider beda/rasio
+MAX_PLOT_POINTS = 2000    # Jumlah titik maksimum yang digambar per grafik
+MAX_MARKER_POINTS = 50    # Di atas ini, penanda titik (marker) tidak digambar
+
+# Nama cache (juga namespace di disk) yang dipakai app dan pemanas
+SEQUENCE_CACHE = "deret: barisan"
+FIGURE_CACHE = "deret: gambar"
+
+# Subset domain slider yang dihitung lebih dulu oleh pemanas cache
+WARM_PRESETS = {
+    "kecil": {"a": (2,), "n": range(5, 21), "step": 0.1},
+    "penuh": {"a": (2,), "n": range(5, 21), "step": 0.01},  # langkah bawaan st.slider float
+}
+
+def _build_sequence_axes(fig, ylabel):
+    """Axes dan satu garis kosong; dibuat sekali per slot lalu diisi ulang di setiap render"""
+    ax = fig.subplots()
+    line, = ax.plot([], [], linewidth=2)
+    ax.set_xlabel("Indeks Suku (n)")
+    ax.set_ylabel(ylabel)
+    ax.grid(True, linestyle=':', alpha=0.7)
+    return ax, line
+
+def _update_line(ax, line, x, y, style, marker, label, title):
+    """Mengganti data, gaya dan judul garis di tempat, lalu menyesuaikan batas sumbu"""
+    line.set_data(x, y)
+    line.set_color(style)
+    line.set_marker(marker)
+    line.set_label(label)
+    ax.set_title(title)
+    ax.relim()
+    ax.autoscale_view()
+    ax.legend()
+
+def render_terms_png(plot_idx, U_values, sequence_type, param, marker, owner=DEFAULT_OWNER):
+    """Grafik nilai suku Un terhadap n (PNG)"""
+    with figure_manager.use(owner, "deret: suku", (6, 4), lambda fig: _build_sequence_axes(fig, "Nilai Suku ($U_n$)")) as (fig, (ax, line)):
+        if sequence_type == "Aritmatika":
+            _update_line(ax, line, plot_idx, U_values, 'b', marker, 'Barisan Aritmatika', f'Pertumbuhan Linear (Beda = {param})')
+        else:
+            _update_line(ax, line, plot_idx, U_values, 'r', marker, 'Barisan Geometri', f'Pertumbuhan Eksponensial (Rasio = {param})')
+        return figure_to_png(fig)
+
+def render_sums_png(plot_idx, S_values, sequence_type, marker, owner=DEFAULT_OWNER):
+    """Grafik jumlah deret Sn terhadap n (PNG)"""
+    with figure_manager.use(owner, "deret: jumlah", (6, 4), lambda fig: _build_sequence_axes(fig, "Jumlah Deret ($S_n$)")) as (fig, (ax, line)):
+        _update_line(ax, line, plot_idx, S_values, 'g', marker, 'Jumlah Deret', f'Akumulasi {sequence_type}')
+        return figure_to_png(fig)
+
+def plot_points(n_max):
+    """(langkah penjarangan, indeks n yang digambar, tampilkan penanda titik) untuk N suku"""
+    plot_step = max(1, n_max // MAX_PLOT_POINTS)
+    return plot_step, np.arange(1, n_max + 1)[::plot_step], n_max <= MAX_MARKER_POINTS
+
+def render_sequence_pngs(U_n, S_n, sequence_type, param, owner=DEFAULT_OWNER):
+    """Grafik Un dan Sn sebagai pasangan PNG; untuk N besar titik dijarangkan merata"""
+    plot_step, plot_idx, markers = plot_points(len(U_n))
+    png_u = render_terms_png(plot_idx, U_n[::plot_step], sequence_type, param, 'o' if markers else '', owner)
+    png_s = render_sums_png(plot_idx, S_n[::plot_step], sequence_type, '^' if markers else '', owner)
+    return png_u, png_s
+
+# --- Grafik Vektor (Vega-Lite, digambar oleh browser) ---
+
+def _sequence_chart(plot_idx, values, title, label, color, y_title, point_shape):
+    """Satu garis Un atau Sn; nilai tak hingga dikirim sebagai null (tidak digambar)"""
+    # altair dan pandas baru diimpor saat mesin grafik vektor dipakai (start dingin lebih cepat)
+    import altair as alt
+    import pandas as pd
+
+    data = pd.DataFrame({"n": plot_idx, "nilai": values})
+    point = alt.OverlayMarkDef(shape=point_shape) if point_shape else False
+    return alt.Chart(data, title=title).mark_line(strokeWidth=2, point=point).transform_calculate(
+        seri=json.dumps(label)
+    ).encode(
+        x=alt.X("n:Q", title="Indeks Suku (n)"),
+        y=alt.Y("nilai:Q", title=y_title, scale=alt.Scale(zero=False)),
+        color=alt.Color("seri:N", scale=alt.Scale(range=[color]), legend=alt.Legend(title=None, orient="top-left")),
+        tooltip=["n:Q", "nilai:Q"],
+    )
+
+def sequence_charts(U_n, S_n, sequence_type, param):
+    """Grafik Un dan Sn sebagai pasangan grafik Altair, dengan penjarangan yang sama seperti PNG"""
+    plot_step, plot_idx, markers = plot_points(len(U_n))
+    if sequence_type == "Aritmatika":
+        chart_u = _sequence_chart(plot_idx, U_n[::plot_step], f'Pertumbuhan Linear (Beda = {param})',
+                                  'Barisan Aritmatika', 'blue', "Nilai Suku (Uₙ)", 'circle' if markers else None)
+    else:
+        chart_u = _sequence_chart(plot_idx, U_n[::plot_step], f'Pertumbuhan Eksponensial (Rasio = {param})',
+                                  'Barisan Geometri', 'red', "Nilai Suku (Uₙ)", 'circle' if markers else None)
+    chart_s = _sequence_chart(plot_idx, S_n[::plot_step], f'Akumulasi {sequence_type}',
+                              'Jumlah Deret', 'green', "Jumlah Deret (Sₙ)", 'triangle-up' if markers else None)
+    return chart_u, chart_s
+
+# --- Kunci Cache (harus sama persis antara app dan pemanas) ---
+
+def sequence_key(sequence_type, a, param, n_max):
+    return ("barisan", sequence_type, a, param, n_max)
+
+def sequence_figure_key(sequence_type, a, param, n_max):
+    return ("grafik", sequence_type, a, param, n_max)
+
+def slider_values(low, high, step):
+    """Semua nilai slider float dari low sampai high, dibulatkan seperti nilai dari browser"""
+    decimals = max(0, -int(np.floor(np.log10(step))))
+    count = int(round((high - low) / step)) + 1
+    return [round(low + i * step, decimals) + 0.0 for i in range(count)]
+
+def warm_tasks(preset="kecil"):
+    """Daftar (nama cache, kunci, fungsi hitung) untuk semua kombinasi slider pada preset"""
+    spec = WARM_PRESETS[preset]
+    tasks = []
+    for sequence_type in SEQUENCE_TYPES:
+        for param in slider_values(*PARAM_RANGES[sequence_type], spec["step"]):
+            for a in spec["a"]:
+                for n_max in spec["n"]:
+                    def compute_sequences(sequence_type=sequence_type, a=a, param=param, n_max=n_max):
+                        return calculate_sequences(a, param, n_max, sequence_type)
+
+                    def compute_figures(sequence_type=sequence_type, a=a, param=param, n_max=n_max):
+                        U_n, S_n = calculate_sequences(a, param, n_max, sequence_type)
+                        return render_sequence_pngs(U_n, S_n, sequence_type, param)
+
+                    tasks.append((SEQUENCE_CACHE, sequence_key(sequence_type, a, param, n_max), compute_sequences))
+                    tasks.append((FIGURE_CACHE, sequence_figure_key(sequence_type, a, param, n_max), compute_figures))
+    return tasks
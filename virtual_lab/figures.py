@@ -0,0 +1,122 @@
+"""Pengelola figure matplotlib dan render ke byte PNG yang bisa disimpan di cache.
+
+Figure dibuat langsung dari matplotlib.figure.Figure (tanpa pyplot), sehingga tidak pernah
+masuk registri figure global pyplot. Setiap sesi memakai ulang Figure/Axes miliknya per slot
+(misalnya "deret: suku"): data garis diperbarui di tempat (set_data, relim) alih-alih
+membangun figure baru di setiap rerun. Jumlah figure hidup dibatasi; figure yang paling
+lama tidak dipakai (dari sesi mana pun) ditutup lebih dulu. Figure sesi yang sudah berakhir
+ditutup oleh release_owner (dipanggil dari session.end_session).
+"""
+
+import io
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from matplotlib.figure import Figure
+
+from virtual_lab.metrics import span
+
+# Sama dengan pengaturan bawaan st.pyplot agar tampilan tidak berubah
+PNG_DPI = 200
+
+MAX_LIVE_FIGURES = 64   # Batas figure hidup di pool (semua sesi dalam satu proses)
+DEFAULT_OWNER = "lokal" # Pemilik figure di luar sesi Streamlit (pemanas, skrip benchmark)
+
+def figure_to_png(fig):
+    """Menyimpan figure sebagai byte PNG (figure tetap hidup untuk dipakai ulang)"""
+    buffer = io.BytesIO()
+    with span("png"):
+        fig.savefig(buffer, format="png", dpi=PNG_DPI, bbox_inches="tight")
+    return buffer.getvalue()
+
+def _close(fig):
+    """Menutup figure secara eksplisit: semua Axes dan artist dilepas saat itu juga"""
+    fig.clear()
+
+class FigureManager:
+    """Pool figure per (pemilik, slot) dengan batas jumlah dan eviksi LRU yang deterministik"""
+
+    def __init__(self, max_figures=MAX_LIVE_FIGURES):
+        self.max_figures = max_figures
+        self._figures = OrderedDict()   # (pemilik, slot) -> [figure, handle artist, sedang dipakai]
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.evictions = 0
+        self.released = 0
+
+    def _evict(self):
+        """Menutup figure paling lama tidak dipakai (yang tidak sedang dipakai) sampai di bawah batas"""
+        for key in list(self._figures):
+            if len(self._figures) <= self.max_figures:
+                break
+            fig, _, in_use = self._figures[key]
+            if not in_use:
+                del self._figures[key]
+                _close(fig)
+                self.evictions += 1
+
+    @contextmanager
+    def use(self, owner, slot, figsize, build=None):
+        """Meminjam figure untuk (owner, slot); dibuat sekali dengan build(fig) lalu dipakai ulang.
+
+        Menghasilkan (fig, handles) dengan handles = hasil build(fig). Selama dipinjam, figure
+        tidak akan dievict oleh sesi lain.
+        """
+        # Waktu membangun dan menggambar figure dicatat sebagai fase "gambar" (PNG sebagai "png")
+        with span("gambar"):
+            key = (owner, slot)
+            with self._lock:
+                entry = self._figures.get(key)
+                if entry is not None and not entry[2] and tuple(entry[0].get_size_inches()) == tuple(figsize):
+                    self._figures.move_to_end(key)
+                    entry[2] = True
+                    self.reused += 1
+                else:
+                    entry = None
+            if entry is None:
+                fig = Figure(figsize=figsize)
+                entry = [fig, build(fig) if build is not None else None, True]
+                with self._lock:
+                    old = self._figures.pop(key, None)
+                    if old is not None and not old[2]:
+                        _close(old[0])
+                    self._figures[key] = entry
+                    self.created += 1
+                    self._evict()
+            try:
+                yield entry[0], entry[1]
+            finally:
+                with self._lock:
+                    entry[2] = False
+                    self._evict()
+
+    def release_owner(self, owner):
+        """Menutup semua figure milik satu pemilik (sesi yang sudah berakhir)"""
+        with self._lock:
+            for key in [key for key in self._figures if key[0] == owner]:
+                fig, _, in_use = self._figures[key]
+                if not in_use:
+                    del self._figures[key]
+                    _close(fig)
+                    self.released += 1
+
+    def stats(self):
+        """Jumlah figure hidup (pool dan pyplot) untuk panel debug"""
+        # pyplot tidak diimpor di sini (impor mahal); hanya dihitung bila modul lain sudah memakainya
+        pyplot = sys.modules.get("matplotlib.pyplot")
+        with self._lock:
+            return {
+                "figure di pool": len(self._figures),
+                "sedang dipakai": sum(1 for entry in self._figures.values() if entry[2]),
+                "pemilik": len({key[0] for key in self._figures}),
+                "dibuat": self.created,
+                "dipakai ulang": self.reused,
+                "eviksi": self.evictions,
+                "dilepas": self.released,
+                "figure pyplot terbuka": len(pyplot.get_fignums()) if pyplot is not None else 0,
+            }
+
+figure_manager = FigureManager()
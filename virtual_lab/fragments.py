@@ -0,0 +1,47 @@
+"""Fragmen Streamlit (st.fragment) untuk bagian lab yang bisa dijalankan ulang sendiri.
+
+Widget di dalam fragmen hanya menjalankan ulang fungsi fragmen itu, bukan seluruh skrip.
+Semua data yang dipakai fragmen diberikan sebagai argumen (parameter sidebar, hasil cache),
+sehingga ketergantungannya eksplisit: Streamlit memanggil ulang fragmen dengan argumen dari
+rerun penuh terakhir, dan perubahan input sidebar tetap menjalankan ulang seluruh skrip.
+
+Pada rerun fragmen saja, bagian awal dan akhir skrip (begin_rerun/end_rerun) tidak berjalan,
+jadi lab_fragment mencatat rerun itu sendiri di metrics dengan halaman "{halaman}/{fragmen}".
+"""
+
+import functools
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from virtual_lab.metrics import begin_rerun, end_rerun, rerun_phase
+from virtual_lab.session import session_owner
+
+def fragment_rerun():
+    """True bila yang sedang berjalan hanya fragmen (bukan seluruh skrip)"""
+    ctx = get_script_run_ctx()
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
+
+@contextmanager
+def fragment_metrics(page, name):
+    """Mencatat rerun fragmen saja sebagai halaman "{page}/{name}"; tanpa efek pada rerun penuh"""
+    if not fragment_rerun():
+        yield
+        return
+    begin_rerun(f"{page}/{name}", session_owner())
+    rerun_phase("skrip")
+    try:
+        yield
+    finally:
+        end_rerun()
+
+def lab_fragment(page):
+    """Dekorator st.fragment untuk bagian lab di halaman page, dengan pencatatan metrics"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with fragment_metrics(page, fn.__name__):
+                return fn(*args, **kwargs)
+        return st.fragment(run)
+    return decorate
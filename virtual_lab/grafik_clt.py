@@ -0,0 +1,238 @@
+"""Grafik dan kunci cache untuk Virtual Lab Distribusi Normal (tanpa Streamlit).
+
+Dipakai oleh app.py dan oleh pemanas cache (virtual_lab.warmer) yang berjalan di proses
+terpisah, sehingga kunci cache dan gambar yang dihasilkan keduanya selalu sama.
+"""
+
+import json
+
+import numpy as np
+
+from virtual_lab.simulasi import simulate_histogram, population_pdf, bernoulli_support, normal_pdf
+from virtual_lab.figures import DEFAULT_OWNER, figure_manager, figure_to_png
+from virtual_lab.store import get_store
+
+# Nama cache (juga namespace di disk) yang dipakai app dan pemanas
+SIMULATION_CACHE = "clt: simulasi"
+SWEEP_CACHE = "clt: sapuan n"
+FIGURE_CACHE = "clt: gambar"
+
+CURVE_POINTS = 400  # Titik kurva pada grafik vektor (cukup halus, payload tetap kecil)
+
+# Subset domain slider yang dihitung lebih dulu oleh pemanas cache (nilai bawaan sidebar)
+WARM_PRESETS = {
+    "kecil": {
+        "mu": (50,), "sigma": range(1, 21), "n": range(2, 101), "N": (1000,),
+        "seed": (42,), "population": ("normal",), "streaming": (True,),
+    },
+    "penuh": {
+        "mu": range(0, 101), "sigma": range(1, 21), "n": range(2, 101), "N": (1000,),
+        "seed": (42,), "population": ("normal",), "streaming": (True,),
+    },
+}
+
+
+def _build_distribution_axes(fig):
+    """Artist grafik distribusi yang dibuat sekali per slot lalu diperbarui di tempat"""
+    ax = fig.subplots()
+    artists = {
+        "histogram": ax.stairs([0.0], [0.0, 1.0], fill=True, alpha=0.6, color='skyblue'),
+        "clt": ax.plot([], [], 'red', linewidth=2)[0],
+        "population": ax.plot([], [], 'black', linestyle='--', alpha=0.5)[0],
+        "population_discrete": ax.vlines([], 0, [], colors='black', linestyles='--', alpha=0.5),
+        "mu": ax.axvline(0, color='green', linestyle='-', linewidth=1.5),
+    }
+    ax.set_xlabel('Nilai Rata-rata')
+    ax.set_ylabel('Probabilitas Densitas')
+    ax.grid(axis='y', alpha=0.5)
+    return ax, artists
+
+def render_distribution_figure(fig_handles, mu, sigma, n, N, SE, population, density, edges):
+    """Mengisi grafik histogram rata-rata sampel beserta kurva teoritis dan kurva populasi.
+
+    fig_handles berasal dari figure_manager.use(..., _build_distribution_axes); histogram
+    diberikan sebagai (density, edges), baik dari semua rata-rata maupun dihitung bertahap.
+    """
+    ax, artists = fig_handles
+    # 1. Setup Plotting Space
+    x = np.linspace(mu - 4*sigma, mu + 4*sigma, 1000)
+
+    # --- Visualisasi ---
+    # Plot Histogram Rata-rata Sampel
+    artists["histogram"].set_data(density, edges)
+    artists["histogram"].set_label(f'Rata-rata Sampel (n={n})')
+
+    # Plot Kurva Normal Rata-rata Sampel (sesuai CLT)
+    y_clt = normal_pdf(x, mu, SE)
+    artists["clt"].set_data(x, y_clt)
+    artists["clt"].set_label(f'Kurva Teoritis (SE={SE:.2f})')
+
+    # Plot Kurva Populasi (untuk perbandingan lebar dan bentuk)
+    y_pop = population_pdf(x, population, mu, sigma)
+    continuous, discrete = artists["population"], artists["population_discrete"]
+    if y_pop is not None:
+        continuous.set_data(x, y_pop)
+        continuous.set_label(f'Populasi (σ={sigma})')
+        discrete.set_segments([])
+        discrete.set_label('_populasi diskret')
+    else:
+        # Populasi diskret: tinggi garis sebanding dengan peluang tiap nilai
+        support, probs = bernoulli_support(mu, sigma)
+        discrete.set_segments([[(s, 0), (s, h)] for s, h in zip(support, probs * y_clt.max())])
+        discrete.set_label(f'Populasi diskret (σ={sigma})')
+        continuous.set_data([], [])
+        continuous.set_label('_populasi')
+
+    # Pengaturan Grafik
+    ax.set_title(f'Distribusi Rata-rata Sampel vs. Populasi (N={N} kali simulasi)')
+    artists["mu"].set_xdata([mu, mu])
+    artists["mu"].set_label(f'μ = {mu}')
+    ax.relim()
+    ax.autoscale_view()
+    ax.legend(handles=[
+        artist for artist in (artists["histogram"], artists["clt"], continuous, discrete, artists["mu"])
+        if not artist.get_label().startswith('_')
+    ], loc='upper right')
+
+
+def distribution_png(mu, sigma, n, N, population, density, edges, owner=DEFAULT_OWNER):
+    """Grafik histogram rata-rata sampel sebagai PNG (figure milik owner dipakai ulang)"""
+    # Simpangan Baku Rata-rata Sampel (Standard Error)
+    SE = sigma / np.sqrt(n)
+    with figure_manager.use(owner, "clt: distribusi", (10, 6), _build_distribution_axes) as (fig, handles):
+        render_distribution_figure(handles, mu, sigma, n, N, SE, population, density, edges)
+        return figure_to_png(fig)
+
+
+def distribution_chart(mu, sigma, n, N, population, density, edges):
+    """Grafik histogram rata-rata sampel sebagai grafik Altair (digambar oleh browser)"""
+    import altair as alt  # diimpor saat dipakai, seperti di virtual_lab.deret
+    import pandas as pd
+
+    SE = sigma / np.sqrt(n)
+    x = np.linspace(mu - 4*sigma, mu + 4*sigma, CURVE_POINTS)
+    y_clt = normal_pdf(x, mu, SE)
+    y_pop = population_pdf(x, population, mu, sigma)
+
+    labels = [f'Rata-rata Sampel (n={n})', f'Kurva Teoritis (SE={SE:.2f})',
+              f'Populasi (σ={sigma})' if y_pop is not None else f'Populasi diskret (σ={sigma})', f'μ = {mu}']
+    color = alt.Color("seri:N", scale=alt.Scale(domain=labels, range=['skyblue', 'red', 'black', 'green']),
+                      legend=alt.Legend(title=None, orient="top-right"))
+
+    bars = alt.Chart(pd.DataFrame({"x0": edges[:-1], "x1": edges[1:], "densitas": density})).mark_rect(opacity=0.6).transform_calculate(
+        seri=json.dumps(labels[0])
+    ).encode(
+        x=alt.X("x0:Q", title='Nilai Rata-rata'), x2="x1:Q",
+        y=alt.Y("densitas:Q", title='Probabilitas Densitas'), y2=alt.datum(0), color=color,
+    )
+    clt_curve = alt.Chart(pd.DataFrame({"x": x, "y": y_clt})).mark_line(strokeWidth=2).transform_calculate(
+        seri=json.dumps(labels[1])
+    ).encode(x="x:Q", y="y:Q", color=color)
+    if y_pop is not None:
+        population_layer = alt.Chart(pd.DataFrame({"x": x, "y": y_pop})).mark_line(strokeDash=[6, 4], opacity=0.5).encode(
+            x="x:Q", y="y:Q", color=color
+        )
+    else:
+        # Populasi diskret: tinggi garis sebanding dengan peluang tiap nilai
+        support, probs = bernoulli_support(mu, sigma)
+        population_layer = alt.Chart(pd.DataFrame({"x": support, "y": probs * y_clt.max()})).mark_rule(
+            strokeDash=[6, 4], opacity=0.5
+        ).encode(x="x:Q", y="y:Q", y2=alt.datum(0), color=color)
+    population_layer = population_layer.transform_calculate(seri=json.dumps(labels[2]))
+    mu_rule = alt.Chart(pd.DataFrame({"x": [mu]})).mark_rule(strokeWidth=1.5).transform_calculate(
+        seri=json.dumps(labels[3])
+    ).encode(x="x:Q", color=color)
+
+    return alt.layer(bars, clt_curve, population_layer, mu_rule).properties(
+        title=f'Distribusi Rata-rata Sampel vs. Populasi (N={N} kali simulasi)', height=400
+    )
+
+
+def render_sweep_figures(mu, sigma, sample_size, sweep_samples, n_values, se_empirical, sweep_edges, sweep_counts,
+                         owner=DEFAULT_OWNER):
+    """Grafik SE vs n dan heatmap histogram per n, sebagai pasangan PNG"""
+    # Sapuan jarang digambar ulang: figure dipakai ulang, isinya dibangun ulang dari kosong
+    with figure_manager.use(owner, "clt: sapuan SE", (6, 5)) as (fig_se, _):
+        fig_se.clear()
+        ax_se = fig_se.subplots()
+        ax_se.plot(n_values, se_empirical, 'o', color='skyblue', markersize=4, label='SE empiris')
+        ax_se.plot(n_values, sigma / np.sqrt(n_values), 'red', linewidth=2, label='SE teoritis σ/√n')
+        ax_se.axvline(sample_size, color='green', linestyle=':', label=f'n terpilih = {sample_size}')
+        ax_se.set_title('Standard Error vs. Ukuran Sampel')
+        ax_se.set_xlabel('Ukuran Sampel (n)')
+        ax_se.set_ylabel('Standard Error')
+        ax_se.legend()
+        ax_se.grid(alpha=0.5)
+        png_se = figure_to_png(fig_se)
+
+    with figure_manager.use(owner, "clt: sapuan heatmap", (6, 5)) as (fig_hm, _):
+        fig_hm.clear()
+        ax_hm = fig_hm.subplots()
+        # Setiap baris dinormalisasi menjadi kepadatan agar n kecil dan besar sebanding
+        bin_width = sweep_edges[1] - sweep_edges[0]
+        density = sweep_counts / (sweep_samples * bin_width)
+        image = ax_hm.imshow(
+            density, origin='lower', aspect='auto', cmap='magma',
+            extent=(sweep_edges[0], sweep_edges[-1], n_values[0] - 0.5, n_values[-1] + 0.5)
+        )
+        ax_hm.plot(mu + 2 * sigma / np.sqrt(n_values), n_values, 'c--', linewidth=1, label='μ ± 2σ/√n')
+        ax_hm.plot(mu - 2 * sigma / np.sqrt(n_values), n_values, 'c--', linewidth=1)
+        ax_hm.set_title('Histogram Rata-rata Sampel untuk Setiap n')
+        ax_hm.set_xlabel('Nilai Rata-rata')
+        ax_hm.set_ylabel('Ukuran Sampel (n)')
+        ax_hm.legend(loc='upper right')
+        fig_hm.colorbar(image, ax=ax_hm, label='Probabilitas Densitas')
+        png_hm = figure_to_png(fig_hm)
+
+    return png_se, png_hm
+
+
+# --- Kunci Cache (harus sama persis antara app dan pemanas) ---
+
+def distribution_key(mu, sigma, n, N, seed, population, streaming):
+    # Jumlah worker tidak ikut: hasil identik untuk seed yang sama berapa pun jumlah worker
+    return ("histogram", mu, sigma, n, N, seed, population, streaming)
+
+
+def distribution_figure_key(mu, sigma, n, N, seed, population, streaming):
+    return ("grafik", mu, sigma, n, N, seed, population, streaming)
+
+
+def sweep_key(mu, sigma, sweep_samples, seed, population):
+    return ("sapuan", mu, sigma, sweep_samples, seed, population)
+
+
+def warm_tasks(preset="kecil"):
+    """Daftar (nama cache, kunci, fungsi hitung) untuk semua kombinasi slider pada preset"""
+    spec = WARM_PRESETS[preset]
+    tasks = []
+    # Hasil simulasi yang baru dihitung, diambil oleh tugas gambar yang berjalan tepat sesudahnya
+    fresh = {}
+    for population in spec["population"]:
+        for streaming in spec["streaming"]:
+            for seed in spec["seed"]:
+                for N in spec["N"]:
+                    for mu in spec["mu"]:
+                        for sigma in spec["sigma"]:
+                            for n in spec["n"]:
+                                params = (mu, sigma, n, N, seed, population, streaming)
+                                key = distribution_key(*params)
+
+                                def compute_histogram(key=key, mu=mu, sigma=sigma, n=n, N=N, seed=seed, population=population, streaming=streaming):
+                                    fresh[key] = simulate_histogram(mu, sigma, n, N, seed, 1, population, streaming)
+                                    return fresh[key]
+
+                                def compute_figure(key=key, mu=mu, sigma=sigma, n=n, N=N, seed=seed, population=population, streaming=streaming):
+                                    # Simulasi yang dilewati pemanas (sudah ada di disk) dibaca dari disk, tidak diulang
+                                    result = fresh.pop(key, None)
+                                    store = get_store()
+                                    if result is None and store is not None:
+                                        result = store.load(SIMULATION_CACHE, key)
+                                    if result is None:
+                                        result = simulate_histogram(mu, sigma, n, N, seed, 1, population, streaming)
+                                    _, density, edges = result
+                                    return distribution_png(mu, sigma, n, N, population, density, edges)
+
+                                tasks.append((SIMULATION_CACHE, key, compute_histogram))
+                                tasks.append((FIGURE_CACHE, distribution_figure_key(*params), compute_figure))
+    return tasks
@@ -0,0 +1,243 @@
+"""Grafik dan kunci cache untuk Virtual Lab Transformasi Geometri (tanpa Streamlit).
+
+Dipakai oleh app.py dan oleh pemanas cache (virtual_lab.warmer) yang berjalan di proses
+terpisah, sehingga kunci cache dan gambar yang dihasilkan keduanya selalu sama.
+"""
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from virtual_lab.transformasi import (
+    REFLECTION_AXES, apply_transform, get_translation_matrix, get_rotation_matrix, get_reflection_matrix,
+    get_dilation_matrix
+)
+from virtual_lab.figures import DEFAULT_OWNER, figure_manager, figure_to_png
+
+MAX_LABELED_POINTS = 50   # Di atas ini, penanda titik tidak digambar dan label dibatasi
+MAX_LABELS = 12           # Jumlah label maksimum untuk bentuk dengan banyak titik
+LOD_THRESHOLD = 2000      # Di atas ini, bentuk digambar dengan level detail (koleksi + penjarangan)
+MAX_RENDER_POINTS = 4000  # Jumlah titik maksimum yang digambar per bentuk pada level detail
+CHART_PIXELS = 600        # Lebar/tinggi grafik vektor (piksel), juga resolusi penjarangan level detail
+
+# Nama cache (juga namespace di disk) yang dipakai app dan pemanas
+FIGURE_CACHE = "transformasi: gambar"
+
+# Segitiga bawaan P1-P3 (sama dengan nilai awal input di sidebar)
+DEFAULT_TRIANGLE = ((1, 1), (5, 1), (3, 4))
+
+# Subset domain slider yang dihitung lebih dulu oleh pemanas cache (untuk segitiga bawaan)
+WARM_PRESETS = {
+    "kecil": {"translation": range(-10, 11), "angle_step": 15, "dilation_step": 0.1},
+    "penuh": {"translation": range(-10, 11), "angle_step": 1, "dilation_step": 0.01},
+}
+
+def triangle_points(p1, p2, p3):
+    """Matriks koordinat homogen (3, 3) dari tiga titik (x, y)"""
+    return np.array([
+        [p1[0], p2[0], p3[0]],
+        [p1[1], p2[1], p3[1]],
+        [1, 1, 1]
+    ])
+
+# --- Fungsi Plotting ---
+def decimate_to_screen(points, x_lim, y_lim, pixels):
+    """Menjarangkan titik ke resolusi layar: titik berurutan yang jatuh di piksel sama dibuang"""
+    px = ((points[0] - x_lim[0]) / (x_lim[1] - x_lim[0]) * pixels).astype(np.int64)
+    py = ((points[1] - y_lim[0]) / (y_lim[1] - y_lim[0]) * pixels).astype(np.int64)
+    keep = np.ones(points.shape[1], dtype=bool)
+    keep[1:] = (px[1:] != px[:-1]) | (py[1:] != py[:-1])
+    visible = points[:2, keep]
+
+    # Awan titik yang acak tetap dibatasi jumlahnya agar waktu render tidak ikut membesar
+    step = -(-visible.shape[1] // MAX_RENDER_POINTS)
+    return visible[:, ::step]
+
+def label_indices(count):
+    """Indeks titik yang diberi label: semua bila sedikit, selain itu MAX_LABELS titik tersebar merata"""
+    if count <= MAX_LABELED_POINTS:
+        return range(count)
+    return np.unique(np.linspace(0, count - 1, MAX_LABELS).astype(int))
+
+def _build_transformation_axes(fig):
+    """Artist grafik transformasi yang dibuat sekali per slot lalu diperbarui di tempat.
+
+    Bentuk kecil memakai garis (lines), bentuk besar memakai koleksi poligon (polys); hanya
+    salah satu pasangan yang tampil.
+    """
+    ax = fig.subplots()
+    lines = (ax.plot([], [], 'b-')[0], ax.plot([], [], 'r--')[0])
+    polys = tuple(
+        ax.add_collection(PolyCollection([], closed=True, facecolors='none', edgecolors=color, linestyles=style))
+        for color, style in (('blue', '-'), ('red', '--'))
+    )
+    # Pengaturan plot
+    ax.axhline(0, color='gray', linewidth=0.5)
+    ax.axvline(0, color='gray', linewidth=0.5)
+    ax.grid(True, linestyle=':', alpha=0.6)
+    ax.set_xlabel("Sumbu X")
+    ax.set_ylabel("Sumbu Y")
+    ax.set_aspect('equal', adjustable='box')
+    return ax, lines, polys
+
+def plot_limits(original, transformed):
+    """Batas sumbu (x_lim, y_lim) yang memuat kedua bentuk, minimal -10..10"""
+    # Batas plot (min/max per bentuk, tanpa menyalin semua titik ke satu array)
+    min_x, max_x = min(np.min(original[0, :]), np.min(transformed[0, :])), max(np.max(original[0, :]), np.max(transformed[0, :]))
+    min_y, max_y = min(np.min(original[1, :]), np.min(transformed[1, :])), max(np.max(original[1, :]), np.max(transformed[1, :]))
+    
+    # Tambahkan padding untuk batas
+    padding = 2
+    x_min, x_max = min_x - padding, max_x + padding
+    y_min, y_max = min_y - padding, max_y + padding
+    return (min(x_min, -10), max(x_max, 10)), (min(y_min, -10), max(y_max, 10))
+
+def render_transformation(fig, handles, original, transformed, title):
+    """Menggambar bentuk awal dan hasil transformasi ke figure pool; mengembalikan jumlah titik tergambar"""
+    ax, lines, polys = handles
+    x_lim, y_lim = plot_limits(original, transformed)
+    count = original.shape[1]
+    drawn = count
+    # Bentuk dengan banyak titik digambar tanpa penanda titik
+    labeled = count <= MAX_LABELED_POINTS
+    shapes = (
+        (original, 'o', 'Bentuk Awal (P)'),
+        (transformed, 'x', 'Hasil Transformasi (P\')'),
+    )
+
+    if count > LOD_THRESHOLD:
+        # Level detail: titik dijarangkan ke resolusi layar dan digambar sebagai satu koleksi poligon
+        pixels = int(max(fig.get_size_inches()) * fig.dpi)
+        drawn = 0
+        for (shape, _, label), poly, line in zip(shapes, polys, lines):
+            visible = decimate_to_screen(shape, x_lim, y_lim, pixels)
+            drawn = max(drawn, visible.shape[1])
+            poly.set_verts([visible.T])
+            poly.set_label(label)
+            line.set_data([], [])
+            line.set_label('_' + label)
+    else:
+        # Bentuk awal (biru) dan hasil transformasi (merah), ditutup kembali ke titik pertama
+        for (shape, marker, label), poly, line in zip(shapes, polys, lines):
+            line.set_data(np.append(shape[0, :], shape[0, 0]), np.append(shape[1, :], shape[1, 0]))
+            line.set_marker(marker if labeled else '')
+            line.set_label(label)
+            poly.set_verts([])
+            poly.set_label('_' + label)
+
+    # Label titik awal dan hasil transformasi (dibatasi untuk bentuk besar)
+    for text in list(ax.texts):
+        text.remove()
+    for i in label_indices(count):
+        ax.text(original[0, i], original[1, i] + 0.2, f'P{i+1}', color='blue')
+        ax.text(transformed[0, i], transformed[1, i] - 0.3, f'P\'{i+1}', color='red')
+        
+    ax.set_title(title)
+    ax.set_xlim(*x_lim)
+    ax.set_ylim(*y_lim)
+    ax.legend()
+    return drawn
+
+def transformation_png(original, transformed, title, owner=DEFAULT_OWNER):
+    """Gambar transformasi sebagai (PNG, jumlah titik tergambar)"""
+    with figure_manager.use(owner, "transformasi: bidang", (8, 8), _build_transformation_axes) as (fig, handles):
+        drawn = render_transformation(fig, handles, original, transformed, title)
+        return figure_to_png(fig), drawn
+
+# --- Grafik Vektor (Vega-Lite, digambar oleh browser) ---
+
+def transformation_chart(original, transformed, title):
+    """Gambar transformasi sebagai (grafik Altair, jumlah titik tergambar)"""
+    import altair as alt  # diimpor saat dipakai, seperti di virtual_lab.deret
+    import pandas as pd
+
+    x_lim, y_lim = plot_limits(original, transformed)
+    # Skala sama di kedua sumbu (seperti set_aspect('equal')): rentang yang lebih sempit dilebarkan
+    half = max(x_lim[1] - x_lim[0], y_lim[1] - y_lim[0]) / 2
+    x_mid, y_mid = sum(x_lim) / 2, sum(y_lim) / 2
+    x_scale = alt.Scale(domain=[x_mid - half, x_mid + half], nice=False, zero=False)
+    y_scale = alt.Scale(domain=[y_mid - half, y_mid + half], nice=False, zero=False)
+
+    count = original.shape[1]
+    labeled = count <= MAX_LABELED_POINTS
+    names = ['Bentuk Awal (P)', 'Hasil Transformasi (P\')']
+    frames = []
+    drawn = 0
+    for shape, name in zip((original, transformed), names):
+        # Level detail yang sama dengan PNG: titik dijarangkan ke resolusi grafik
+        visible = decimate_to_screen(shape, x_lim, y_lim, CHART_PIXELS) if count > LOD_THRESHOLD else shape[:2]
+        drawn = max(drawn, visible.shape[1])
+        closed = np.hstack([visible, visible[:, :1]])  # ditutup kembali ke titik pertama
+        frames.append(pd.DataFrame({
+            "x": closed[0], "y": closed[1], "urutan": np.arange(closed.shape[1]),
+            "bentuk": pd.Categorical([name] * closed.shape[1], categories=names),
+        }))
+    shapes = pd.concat(frames, ignore_index=True)
+
+    x = alt.X("x:Q", title="Sumbu X", scale=x_scale)
+    y = alt.Y("y:Q", title="Sumbu Y", scale=y_scale)
+    color = alt.Color("bentuk:N", scale=alt.Scale(domain=names, range=['blue', 'red']), legend=alt.Legend(title=None))
+    outline = alt.Chart(shapes).mark_line(clip=True).encode(
+        x=x, y=y, order="urutan:Q", color=color,
+        strokeDash=alt.StrokeDash("bentuk:N", scale=alt.Scale(domain=names, range=[[1, 0], [6, 4]]), legend=None),
+    )
+    layers = [outline]
+    if labeled:
+        layers.append(alt.Chart(shapes).mark_point(clip=True, filled=True).encode(
+            x=x, y=y, color=color,
+            shape=alt.Shape("bentuk:N", scale=alt.Scale(domain=names, range=['circle', 'cross']), legend=None),
+        ))
+
+    # Label titik awal dan hasil transformasi (dibatasi untuk bentuk besar)
+    index = np.asarray(label_indices(count))
+    labels = pd.DataFrame({
+        "x": np.concatenate([original[0, index], transformed[0, index]]),
+        "y": np.concatenate([original[1, index] + 0.2, transformed[1, index] - 0.3]),
+        "teks": [f'P{i+1}' for i in index] + [f'P\'{i+1}' for i in index],
+        "bentuk": pd.Categorical([names[0]] * len(index) + [names[1]] * len(index), categories=names),
+    })
+    layers.append(alt.Chart(labels).mark_text(align='left', baseline='bottom', clip=True).encode(
+        x=x, y=y, text="teks:N", color=alt.Color("bentuk:N", scale=alt.Scale(domain=names, range=['blue', 'red']), legend=None),
+    ))
+    axes = alt.Chart(pd.DataFrame({"nol": [0]}))
+    layers.append(axes.mark_rule(color='gray', strokeWidth=0.5).encode(x=alt.X("nol:Q", scale=x_scale)))
+    layers.append(axes.mark_rule(color='gray', strokeWidth=0.5).encode(y=alt.Y("nol:Q", scale=y_scale)))
+
+    chart = alt.layer(*layers).properties(title=title, width=CHART_PIXELS, height=CHART_PIXELS)
+    return chart, drawn
+
+# --- Kunci Cache (harus sama persis antara app dan pemanas) ---
+
+def triangle_key(points):
+    return ("segitiga", points.tobytes())
+
+def file_key(digest):
+    return ("file", digest)
+
+def figure_key(title, points_key, matrix):
+    return ("gambar", title) + points_key + (matrix.tobytes(),)
+
+def warm_tasks(preset="kecil"):
+    """Daftar (nama cache, kunci, fungsi hitung) untuk semua kombinasi slider pada preset"""
+    spec = WARM_PRESETS[preset]
+    original = triangle_points(*DEFAULT_TRIANGLE)
+    points_key = triangle_key(original)
+
+    # Parameter input pusat (cx, cy) bernilai bawaan 0, seperti di sidebar
+    matrices = [("Translasi", get_translation_matrix(tx, ty)) for tx in spec["translation"] for ty in spec["translation"]]
+    matrices += [("Rotasi", get_rotation_matrix(angle, 0, 0)) for angle in range(-360, 361, spec["angle_step"])]
+    matrices += [("Refleksi", get_reflection_matrix(axis)) for axis in REFLECTION_AXES]
+    dilation_count = int(round((5.0 - 0.1) / spec["dilation_step"])) + 1
+    matrices += [
+        ("Dilatasi", get_dilation_matrix(round(0.1 + i * spec["dilation_step"], 2), 0, 0))
+        for i in range(dilation_count)
+    ]
+
+    tasks = []
+    for transform_type, matrix in matrices:
+        title = f"Transformasi: {transform_type}"
+
+        def compute(matrix=matrix, title=title):
+            return transformation_png(original, apply_transform(original, matrix), title)
+
+        tasks.append((FIGURE_CACHE, figure_key(title, points_key, matrix), compute))
+    return tasks
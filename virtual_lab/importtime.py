@@ -0,0 +1,104 @@
+"""Laporan waktu impor dan memori start dingin per halaman (gaya python -X importtime).
+
+Setiap halaman dijalankan di proses Python baru dengan -X importtime (mode "bare" Streamlit,
+tanpa server), lalu dicatat:
+
+- total waktu impor (jumlah kolom "self" dari -X importtime) dan paket teratas terberat,
+- waktu sampai skrip halaman selesai dijalankan,
+- RSS maksimum proses, kira-kira memori satu replika yang baru melayani halaman itu.
+
+Baris "launcher" hanya mengimpor streamlit (biaya streamlit_app.py sebelum lab dibuka), dan
+baris "semua lab" menjalankan semua halaman di satu proses (replika yang sudah dikunjungi
+semua lab). Pemanas dan store disk dimatikan agar hanya biaya halaman yang terukur.
+
+Jalankan dengan: python -m virtual_lab.importtime [--json hasil.json] [--top 5]
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import runpy
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Halaman yang sama dengan streamlit_app.py
+PAGES = [
+    "deretdanbarisan/app.py",
+    "deret dan barisan/app.py",
+    "transformasigeometri/app.py",
+    "spldv/app.py",
+    "IPKKONVERTER/app.py",
+]
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+def run_pages(paths):
+    """Dijalankan di proses anak: impor streamlit, jalankan halaman, cetak hasil sebagai JSON"""
+    start = time.perf_counter()
+    import streamlit  # noqa: F401  (biaya dasar launcher)
+    for path in paths:
+        runpy.run_path(str(REPO_ROOT / path), run_name="__main__")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB di Linux, byte di macOS
+    print(json.dumps({
+        "run_ms": (time.perf_counter() - start) * 1e3,
+        "rss_mb": rss / (1024**2 if sys.platform == "darwin" else 1024),
+    }))
+
+def parse_importtime(stderr, top=5):
+    """(total ms, [(paket teratas, ms)] terberat) dari keluaran -X importtime"""
+    per_package = defaultdict(int)
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, _, _, name = match.groups()
+            per_package[name.split(".")[0]] += int(self_us)
+    total = sum(per_package.values())
+    heaviest = sorted(per_package.items(), key=lambda item: -item[1])[:top]
+    return total / 1e3, [(name, us / 1e3) for name, us in heaviest]
+
+def measure(paths, top=5):
+    """Mengukur satu proses baru yang menjalankan halaman-halaman ini"""
+    env = dict(os.environ, VIRTUAL_LAB_WARM="off", VIRTUAL_LAB_STORE="off", MPLBACKEND="Agg")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "virtual_lab.importtime", "--run", *paths],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    import_ms, heaviest = parse_importtime(result.stderr, top)
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    return {"import_ms": import_ms, **stats, "heaviest": heaviest}
+
+def main():
+    parser = argparse.ArgumentParser(description="Laporan waktu impor dan memori start dingin per halaman")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (untuk dibandingkan antar-versi)")
+    parser.add_argument("--top", type=int, default=5, help="Jumlah paket terberat yang ditampilkan")
+    parser.add_argument("--run", nargs="*", help=argparse.SUPPRESS)  # mode proses anak
+    args = parser.parse_args()
+
+    if args.run is not None:
+        run_pages(args.run)
+        return
+
+    targets = [("launcher", [])] + [(page, [page]) for page in PAGES] + [("semua lab", PAGES)]
+    report = {}
+    print(f"{'halaman':<30} {'impor (ms)':>11} {'jalan (ms)':>11} {'RSS (MB)':>9}  paket terberat (ms)")
+    for name, paths in targets:
+        report[name] = measure(paths, args.top)
+        row = report[name]
+        heaviest = ", ".join(f"{package} {ms:.0f}" for package, ms in row["heaviest"])
+        print(f"{name:<30} {row['import_ms']:11.0f} {row['run_ms']:11.0f} {row['rss_mb']:9.1f}  {heaviest}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "pages": report}, f, indent=2)
+        print(f"\nHasil disimpan ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Penjadwal perhitungan berat di latar, dengan pembatalan kooperatif dan batas per host.
+
+Perhitungan panjang (simulasi CLT, sapuan deret, transformasi titik besar) dijalankan di
+thread latar, bukan di thread skrip Streamlit. Skrip hanya menunggu sambil menggambar
+progres (follow); bila siswa menggeser slider, Streamlit menghentikan skrip lama di
+pemanggilan st.* berikutnya dan rerun baru langsung berjalan.
+
+- Setiap job berkunci tuple parameter dan ditandai dengan sesi (serta slot, misalnya
+  "clt: simulasi"). Sesi yang meminta kunci yang sama ikut menunggu job yang sudah berjalan.
+- Job baru di slot yang sama menggantikan job lama sesi itu. Job lama dibatalkan bila tidak
+  ada sesi lain yang masih menunggunya: job.check() melempar JobCancelled di batas potongan
+  (chunk) berikutnya.
+- Jumlah job yang berjalan bersamaan dibatasi per host (semua replika) lewat file slot yang
+  dikunci dengan flock (VIRTUAL_LAB_JOBS, bawaan jumlah CPU). Job yang menunggu slot tetap
+  bisa dibatalkan, dan setiap sesi hanya punya satu job per slot, sehingga satu sesi tidak
+  bisa menghabiskan semua slot dengan antrean job usang.
+
+Modul ini tidak mengimpor Streamlit; follow() menerima placeholder progres dari app.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from virtual_lab.cache import MISSING
+
+try:
+    import fcntl
+except ImportError:  # Windows: batas hanya berlaku per proses
+    fcntl = None
+
+JOBS_ENV = "VIRTUAL_LAB_JOBS"            # Jumlah job berjalan bersamaan per host
+JOBS_DIR_ENV = "VIRTUAL_LAB_JOBS_DIR"    # Direktori file slot
+DEFAULT_JOBS_DIR = os.path.join(tempfile.gettempdir(), "virtual_lab_jobs")
+SLOT_POLL_S = 0.05       # Jeda antar-percobaan mengambil slot host
+POLL_INTERVAL_S = 0.1    # Jeda pembaruan progres saat skrip menunggu job
+FINISHED_JOBS = 64       # Job selesai terakhir yang disimpan untuk statistik
+
+class JobCancelled(Exception):
+    """Job dibatalkan karena digantikan job baru dan tidak ada sesi lain yang menunggunya"""
+
+class Job:
+    """Satu perhitungan latar: progres, hasil parsial terakhir, dan hasil akhir"""
+
+    def __init__(self, key, slot):
+        self.key = key
+        self.slot = slot
+        self.sessions = set()
+        self.state = "antre"          # antre -> berjalan -> selesai / dibatalkan / gagal
+        self.done_count = 0
+        self.total = 0
+        self.partial = None
+        self.heartbeat = None         # Dipanggil di setiap check(), misalnya untuk memperbarui kunci disk
+        self.submitted = time.monotonic()
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._result = None
+        self._error = None
+
+    def check(self):
+        """Dipanggil fungsi job di batas setiap potongan; melempar JobCancelled bila dibatalkan"""
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+        if self.heartbeat is not None:
+            self.heartbeat()
+
+    def report(self, done, total, partial=None):
+        """Progres job (dari thread latar); partial = hasil sementara untuk digambar"""
+        self.check()
+        self.done_count, self.total = done, total
+        if partial is not None:
+            self.partial = partial
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def done(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def result(self):
+        """Hasil akhir; melempar ulang error job, atau JobCancelled bila job dibatalkan"""
+        self._finished.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+class HostSlots:
+    """Semaphore antar-proses di satu host: count file slot, masing-masing dikunci dengan flock.
+
+    Kunci flock dilepas otomatis oleh sistem operasi bila proses mati, jadi slot tidak
+    pernah tertinggal terkunci oleh replika yang crash.
+    """
+
+    def __init__(self, directory, count):
+        self.directory = directory
+        self.count = count
+        self._local = threading.BoundedSemaphore(count)  # juga membatasi thread di proses ini
+        if fcntl is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def acquire(self, check):
+        """Menunggu sampai ada slot bebas; check() dipanggil di setiap percobaan (boleh melempar)"""
+        while not self._local.acquire(timeout=SLOT_POLL_S):
+            check()
+        if fcntl is None:
+            return None
+        try:
+            while True:
+                for i in range(self.count):
+                    fd = os.open(os.path.join(self.directory, f"slot-{i}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        return fd
+                    except OSError:
+                        os.close(fd)  # slot dipakai replika lain
+                check()
+                time.sleep(SLOT_POLL_S)
+        except BaseException:
+            self._local.release()
+            raise
+
+    def release(self, fd):
+        if fd is not None:
+            os.close(fd)  # menutup fd juga melepas flock
+        self._local.release()
+
+class JobScheduler:
+    """Menjalankan job di thread latar; satu job per (sesi, slot), job sama kunci dipakai bersama"""
+
+    def __init__(self, max_jobs, directory=DEFAULT_JOBS_DIR):
+        self.max_jobs = max_jobs
+        self.slots = HostSlots(directory, max_jobs)
+        # Thread lebih banyak dari slot: job yang antre tetap bisa memeriksa pembatalan
+        self._executor = ThreadPoolExecutor(max_workers=2 * max_jobs, thread_name_prefix="virtual-lab-job")
+        self._lock = threading.Lock()
+        self._jobs = {}          # (slot, kunci) -> Job yang belum selesai
+        self._by_session = {}    # (sesi, slot) -> Job
+        self._finished = []
+        self.submitted = 0
+        self.shared = 0
+        self.cancelled = 0
+
+    def submit(self, session, slot, key, fn):
+        """Job untuk kunci ini (baru, atau yang sudah berjalan); fn(job) mengembalikan hasil"""
+        with self._lock:
+            current = self._by_session.get((session, slot))
+            if current is not None and current.key == key and not current.cancelled():
+                return current  # rerun dengan parameter sama: job yang sama ditunggu lagi
+            if current is not None:
+                self._detach(current, session)
+
+            job = self._jobs.get((slot, key))
+            if job is not None and not job.cancelled():
+                self.shared += 1
+            else:
+                job = self._jobs[(slot, key)] = Job(key, slot)
+                self.submitted += 1
+                self._executor.submit(self._run, job, fn)
+            job.sessions.add(session)
+            self._by_session[(session, slot)] = job
+            return job
+
+    def _detach(self, job, session):
+        """Sesi berhenti menunggu job; job dibatalkan bila tidak ada sesi lain (lock dipegang)"""
+        job.sessions.discard(session)
+        if not job.sessions and not job.done():
+            job._cancel.set()
+            self.cancelled += 1
+
+    def cancel_session(self, session):
+        """Membatalkan semua job milik satu sesi (dipanggil saat sesi berakhir, lihat session.py)"""
+        with self._lock:
+            for key in [key for key in self._by_session if key[0] == session]:
+                self._detach(self._by_session.pop(key), session)
+
+    def _run(self, job, fn):
+        acquired, fd = False, None
+        try:
+            job.check()
+            fd = self.slots.acquire(job.check)
+            acquired = True
+            job.state = "berjalan"
+            job.check()
+            job._result = fn(job)
+            job.state = "selesai"
+        except JobCancelled as e:
+            job._error, job.state = e, "dibatalkan"
+        except BaseException as e:
+            job._error, job.state = e, "gagal"
+        finally:
+            if acquired:
+                self.slots.release(fd)
+            with self._lock:
+                if self._jobs.get((job.slot, job.key)) is job:
+                    del self._jobs[(job.slot, job.key)]
+                # Hasil dipegang oleh skrip yang menunggu (dan cache), bukan oleh penjadwal
+                for key in [key for key, other in self._by_session.items() if other is job]:
+                    del self._by_session[key]
+                self._finished = (self._finished + [job])[-FINISHED_JOBS:]
+            job._finished.set()
+
+    def stats(self):
+        """Ringkasan antrean untuk panel debug"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            return {
+                "batas per host": self.max_jobs,
+                "berjalan": sum(job.state == "berjalan" for job in jobs),
+                "antre": sum(job.state == "antre" for job in jobs),
+                "dikirim": self.submitted,
+                "dipakai bersama": self.shared,
+                "dibatalkan": self.cancelled,
+            }
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Penjadwal bersama untuk semua sesi dan lab dalam satu proses"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            max_jobs = int(os.environ.get(JOBS_ENV, os.cpu_count() or 1))
+            _scheduler = JobScheduler(max(1, max_jobs), os.environ.get(JOBS_DIR_ENV, DEFAULT_JOBS_DIR))
+        return _scheduler
+
+def cancel_session(session):
+    """Membatalkan job sesi yang sudah berakhir (penjadwal tidak dibuat bila belum ada)"""
+    with _scheduler_lock:
+        scheduler = _scheduler
+    if scheduler is not None:
+        scheduler.cancel_session(session)
+
+def cached_job(cache, session, slot, key, compute):
+    """(hasil, None) bila key sudah ada di cache; selain itu (None, job) yang menghitungnya di latar.
+
+    compute(job) dijalankan lewat cache.get_or_compute di thread job, jadi hanya job yang
+    selesai yang menyimpan hasil, dan sesi atau replika lain yang menghitung key yang sama
+    tetap ditunggu alih-alih dihitung ulang. Setiap progres job memperbarui kunci disk key,
+    sehingga job yang lebih lama dari LOCK_STALE_S tidak dianggap basi oleh replika lain;
+    job yang menunggu replika lain tetap bisa dibatalkan.
+    """
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        return value, None
+
+    def run(job):
+        job.heartbeat = lambda: cache.touch(key)
+        return cache.get_or_compute(key, lambda: compute(job), counted=True, check=job.check)
+
+    return None, get_scheduler().submit(session, slot, key, run)
+
+def follow(job, progress, on_partial=None, render_interval_s=0.5, describe=None):
+    """Menunggu job di thread skrip sambil memperbarui progress bar dan hasil parsial.
+
+    progress adalah placeholder Streamlit (st.empty()); on_partial(partial) dipanggil paling
+    sering sekali per render_interval_s; describe(done, total) memberi teks progres. Bila siswa
+    mengubah input, Streamlit menghentikan skrip di pemanggilan progress berikutnya, sementara
+    job tetap berjalan sampai digantikan. Mengembalikan hasil akhir job.
+    """
+    last_render, last_partial = 0.0, None
+    while not job.wait(POLL_INTERVAL_S):
+        partial = job.partial
+        if on_partial is not None and partial is not last_partial and time.monotonic() - last_render >= render_interval_s:
+            on_partial(partial)
+            last_render, last_partial = time.monotonic(), partial
+        if job.total:
+            text = describe(job.done_count, job.total) if describe is not None else None
+            progress.progress(min(job.done_count / job.total, 1.0), text=text)
+        else:
+            progress.progress(0.0, text="Menunggu giliran..." if job.state == "antre" else None)
+    progress.empty()
+    return job.result()
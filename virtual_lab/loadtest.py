@@ -0,0 +1,471 @@
+"""Uji beban banyak sesi bersamaan untuk semua lab: latensi rerun, CPU per rerun, dan RSS.
+
+Setiap lab dijalankan sebagai satu server `streamlit run` (satu replika, di port bebas), lalu
+sejumlah sesi siswa tiruan terhubung lewat websocket seperti browser: mengirim BackMsg
+rerun_script dengan status widget, dan menunggu ForwardMsg script_finished. Skenario setiap
+lab meniru pemakaian kelas: menyeret slider (beberapa nilai berurutan dengan jeda pendek),
+memilih opsi, mengisi form lalu menekan tombolnya, dan membuka bagian dalam fragmen (rerun
+fragmen dikirim dengan fragment_id, seperti di browser). Nilai skenario diacak per sesi
+dengan seed tetap, jadi sesi tidak saling berbagi cache seluruhnya, tetapi setiap putaran dan
+setiap run memakai nilai yang sama.
+
+AppTest tidak dipakai: AppTest mengganti Runtime global di setiap run, sehingga beberapa
+AppTest tidak bisa berjalan bersamaan dalam satu proses. Klien websocket juga mengukur
+yang dirasakan siswa, termasuk serialisasi protobuf dan antrean server.
+
+Yang dilaporkan per lab:
+
+- p50/p95/p99 latensi rerun (dari kirim sampai script_finished), dan p95 muat halaman awal
+- CPU per rerun: waktu CPU proses server beserta proses anaknya (pool worker) dibagi jumlah rerun
+- RSS per sesi: kenaikan RSS setelah semua sesi memuat halaman, dibagi jumlah sesi
+- kenaikan RSS total selama uji, dan kenaikan setelah putaran pertama (putaran berikutnya
+  mengulang nilai yang sama, jadi RSS yang masih naik menandakan kebocoran, misalnya figure
+  yang terus bertambah, bukan cache yang sedang terisi)
+
+Hasil bisa disimpan lalu dibandingkan dengan baseline, seperti benchmark_core:
+
+    python -m virtual_lab.loadtest --sessions 20 --json baseline.json
+    python -m virtual_lab.loadtest --sessions 20 --baseline baseline.json   # kode 1 bila ada regresi
+
+Server mewarisi environment, kecuali VIRTUAL_LAB_WARM dan VIRTUAL_LAB_STORE yang bawaannya
+"off" agar hasil antar-run sebanding (tanpa pemanasan latar dan tanpa cache disk dari run
+sebelumnya). CPU dan RSS dibaca dari /proc, jadi hanya untuk Linux.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+from virtual_lab.formatting import format_bytes, format_time
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SESSIONS = 10
+DEFAULT_PASSES = 2
+DEFAULT_THINK_S = 0.5        # Jeda rata-rata antar-langkah (diacak 0,5x-1,5x)
+DRAG_PAUSE_S = 0.15          # Jeda antar-nilai saat menyeret slider
+DEFAULT_RAMP_S = 2.0         # Sesi mulai tersebar dalam rentang waktu ini
+DEFAULT_TIMEOUT_S = 120.0    # Batas waktu satu rerun
+START_TIMEOUT_S = 60.0       # Batas waktu server siap
+DEFAULT_THRESHOLD = 1.3      # Lebih lambat/boros dari baseline sebesar faktor ini = regresi
+MIN_COMPARE_S = 0.005        # Di bawah ini, selisih latensi/CPU dianggap derau
+MIN_COMPARE_BYTES = 8 * 1024**2
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# --- Skenario ---
+
+# Satu langkah: (label widget, nilai atau fungsi rng -> nilai, jeda sesudahnya; None = jeda pikir)
+
+def drag(label, low, high, moves, step=1):
+    """Menyeret slider: beberapa nilai acak di [low, high] berturut-turut dengan jeda pendek"""
+    def value(rng):
+        return round(round(rng.uniform(low, high) / step) * step, 10)
+    return [(label, value, DRAG_PAUSE_S) for _ in range(moves)]
+
+def pick(label, value):
+    """Satu input: opsi, angka, teks, kotak centang, atau tombol (True)"""
+    return [(label, value, None)]
+
+def choose(label, options):
+    return pick(label, lambda rng: rng.choice(options))
+
+PENGURUT = [
+    *pick("Masukkan bilangan pertama (a):", lambda rng: rng.randint(-100, 100)),
+    *pick("Masukkan bilangan kedua (b):", lambda rng: rng.randint(-100, 100)),
+    *pick("Masukkan bilangan ketiga (c):", lambda rng: rng.randint(-100, 100)),
+    *pick("Urutkan!", True),
+    *pick("Masukkan bilangan kedua (b):", lambda rng: rng.randint(-100, 100)),
+    *pick("Urutkan!", True),
+    *pick("Mode", "Massal (unggah CSV/XLSX)"),
+    *pick("Mode", "Tiga Bilangan"),
+]
+
+DERET = [
+    *drag("Beda (b)", -5.0, 5.0, 4, step=0.1),
+    *pick("Batas Suku (N)", lambda rng: rng.choice((100, 1_000, 10_000))),
+    *pick("Indeks n", lambda rng: f"10^{rng.randint(3, 15)}"),
+    *pick("Mode Numerik", "Domain log"),
+    *pick("Pilih Jenis Barisan", "Geometri"),
+    *drag("Rasio (r)", -2.0, 2.0, 4, step=0.1),
+    *pick("Batas Suku (N)", lambda rng: rng.choice((10_000, 100_000))),
+    *pick("Aktifkan sapuan parameter", True),
+    *drag("Jumlah nilai a", 50, 200, 1),
+    *pick("Hitung Sapuan", True),
+    *pick("Aktifkan sapuan parameter", False),
+    *pick("Mode Numerik", "Eksak (pecahan)"),
+    *pick("Pilih Jenis Barisan", "Aritmatika"),
+    *pick("Batas Suku (N)", 10),
+]
+
+CLT = [
+    *drag("Ukuran Sampel (n)", 2, 100, 4),
+    *drag("Rata-rata Populasi (μ)", 0, 100, 2),
+    *choose("Bentuk Populasi", ("Normal", "Eksponensial (miring)", "Lognormal (sangat miring)", "Bimodal (dua puncak)")),
+    *choose("Jumlah Sampel Simulasi", (1_000, 10_000, 100_000)),
+    *pick("Seed Acak", lambda rng: rng.randint(0, 1000)),
+    *pick("Terapkan Pengaturan", True),
+    *pick("Tampilkan sapuan n", True),
+    *pick("Tampilkan sapuan n", False),
+    *pick("Bentuk Populasi", "Normal"),
+    *pick("Jumlah Sampel Simulasi", 1_000),
+]
+
+TRANSFORMASI = [
+    *drag("Pergeseran X (tx)", -10, 10, 3),
+    *drag("Pergeseran Y (ty)", -10, 10, 3),
+    *pick("Pilih Jenis Transformasi", "Rotasi"),
+    *drag("Sudut Rotasi (derajat)", -360, 360, 4),
+    *pick("Pilih Jenis Transformasi", "Dilatasi"),
+    *drag("Faktor Skala (k)", 0.1, 5.0, 3, step=0.1),
+    *pick("P1 (x)", lambda rng: rng.randint(-5, 5)),
+    *pick("Terapkan Titik", True),
+    *pick("Pilih Jenis Transformasi", "Translasi"),
+]
+
+# Nama lab (sama dengan nama halaman di metrics) -> (file app, skenario)
+LABS = {
+    "pengurut": ("IPKKONVERTER/app.py", PENGURUT),
+    "deret-dan-barisan": ("deret dan barisan/app.py", DERET),
+    "deret": ("deretdanbarisan/app.py", DERET),
+    "clt": ("spldv/app.py", CLT),
+    "transformasi": ("transformasigeometri/app.py", TRANSFORMASI),
+}
+
+# --- Klien Sesi ---
+
+def widget_state(kind, proto, value):
+    """WidgetState yang dikirim browser untuk widget ini"""
+    state = WidgetState(id=proto.id)
+    if kind == "slider":
+        if proto.options:  # select_slider: teks opsi
+            state.string_array_value.data.append(str(value))
+        else:
+            state.double_array_value.data.extend(value if isinstance(value, (tuple, list)) else [value])
+    elif kind == "number_input":
+        state.double_value = value
+    elif kind in ("selectbox", "radio", "text_input"):
+        state.string_value = value
+    elif kind == "checkbox":
+        state.bool_value = value
+    elif kind == "button":
+        state.trigger_value = True
+    else:
+        raise ValueError(f"Jenis widget belum didukung: {kind}")
+    return state
+
+class Session:
+    """Satu siswa tiruan: satu websocket, status widget seperti di browser, dan catatan latensi"""
+
+    def __init__(self, index, seed, think_s, timeout_s):
+        self.index = index
+        self.seed = seed
+        self.think_s = think_s
+        self.timeout_s = timeout_s
+        self.widgets = {}      # label -> (jenis, proto, fragment_id) dari rerun terakhir
+        self.states = {}       # id widget -> WidgetState terakhir
+        self.loads = []
+        self.latencies = []
+        self.errors = []
+        self._ws = None
+
+    async def open(self, url, delay=0.0):
+        await asyncio.sleep(delay)
+        self._ws = await connect(url, max_size=None)
+        self.loads.append(await self.rerun())
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def rerun(self, fragment_id="", trigger=None):
+        """Mengirim satu rerun dan menunggu sampai selesai; mengembalikan latensi (detik)"""
+        message = BackMsg()
+        client = message.rerun_script
+        current = {proto.id for _, proto, _ in self.widgets.values()}
+        client.widget_states.widgets.extend(state for id, state in self.states.items() if id in current)
+        if trigger is not None:
+            client.widget_states.widgets.append(trigger)
+        if fragment_id:
+            client.fragment_id = fragment_id
+
+        start = time.perf_counter()
+        await self._ws.send(message.SerializeToString())
+        widgets = {}
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self._ws.recv(), self.timeout_s))
+            kind = forward.WhichOneof("type")
+            if kind == "script_finished":
+                break
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                proto = getattr(element, element_type)
+                if element_type == "exception":
+                    self.errors.append(proto.message)
+                elif "id" in proto.DESCRIPTOR.fields_by_name and "label" in proto.DESCRIPTOR.fields_by_name:
+                    widgets[proto.label] = (element_type, proto, forward.delta.fragment_id)
+        elapsed = time.perf_counter() - start
+
+        # Rerun fragmen hanya menggambar ulang widget di fragmen itu; widget lain tetap ada
+        if fragment_id:
+            self.widgets.update(widgets)
+        else:
+            self.widgets = widgets
+        return elapsed
+
+    async def step(self, label, value):
+        if label not in self.widgets:
+            self.errors.append(f"Widget tidak ditemukan: {label}")
+            return
+        kind, proto, fragment_id = self.widgets[label]
+        state = widget_state(kind, proto, value)
+        if kind == "button":
+            self.latencies.append(await self.rerun(fragment_id, trigger=state))
+            return
+        self.states[proto.id] = state
+        if not proto.form_id:  # input di form baru dikirim saat tombol form ditekan
+            self.latencies.append(await self.rerun(fragment_id))
+
+    async def play(self, scenario):
+        """Menjalankan skenario sekali; setiap putaran memakai nilai acak yang sama"""
+        rng = random.Random(f"{self.seed}-{self.index}")
+        for label, value, pause in scenario:
+            try:
+                await self.step(label, value(rng) if callable(value) else value)
+            except (asyncio.TimeoutError, ValueError) as e:
+                self.errors.append(f"{label}: {e!r}")
+            await asyncio.sleep((self.think_s if pause is None else pause) * rng.uniform(0.5, 1.5))
+
+# --- Server Lab ---
+
+def _read_stat(pid):
+    """Kolom /proc/<pid>/stat setelah nama proses"""
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().rsplit(")", 1)[1].split()
+
+def _process_tree(pid):
+    pids = [pid]
+    for current in pids:
+        try:
+            for tid in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{tid}/children") as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue  # proses anak sudah selesai
+    return pids
+
+class LabServer:
+    """Satu lab sebagai proses `streamlit run` di port bebas; CPU dan RSS dibaca dari /proc"""
+
+    def __init__(self, app, port=None):
+        self.app = REPO_ROOT / app
+        self.port = port or self._free_port()
+        self.url = f"ws://127.0.0.1:{self.port}/_stcore/stream"
+        self.process = None
+
+    @staticmethod
+    def _free_port():
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def __enter__(self):
+        env = dict(os.environ)
+        env.setdefault("VIRTUAL_LAB_WARM", "off")
+        env.setdefault("VIRTUAL_LAB_STORE", "off")
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", str(self.app), "--server.headless", "true",
+                "--server.port", str(self.port), "--server.fileWatcherType", "none",
+                "--browser.gatherUsageStats", "false",
+            ],
+            cwd=REPO_ROOT, env=env, stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + START_TIMEOUT_S
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1):
+                    return self
+            except OSError:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.__exit__(None, None, None)
+                    raise RuntimeError(f"Server {self.app.parent.name} tidak bisa dijalankan") from None
+                time.sleep(0.2)
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.log.close()
+
+    def cpu_seconds(self):
+        """CPU proses server dan anak-anaknya (termasuk anak yang sudah selesai)"""
+        total = 0
+        for pid in _process_tree(self.process.pid):
+            try:
+                fields = _read_stat(pid)
+            except OSError:
+                continue
+            # utime, stime; untuk proses server juga cutime, cstime (anak yang sudah selesai)
+            total += sum(int(value) for value in fields[11:15 if pid == self.process.pid else 13])
+        return total / _CLOCK_TICKS
+
+    def rss(self):
+        total = 0
+        for pid in _process_tree(self.process.pid):
+            try:
+                with open(f"/proc/{pid}/statm", "rb") as f:
+                    total += int(f.read().split()[1]) * _PAGE_SIZE
+            except OSError:
+                continue
+        return total
+
+# --- Pengukuran ---
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+async def load_lab(name, app, scenario, args):
+    """Menjalankan uji beban satu lab; mengembalikan dict hasil"""
+    with LabServer(app) as server:
+        # Sesi pemanasan: impor modul dan inisialisasi pertama tidak dihitung sebagai biaya sesi
+        warm = Session(-1, args.seed, args.think, args.timeout)
+        await warm.open(server.url)
+        await warm.close()
+        idle_rss = server.rss()
+
+        sessions = [Session(i, args.seed, args.think, args.timeout) for i in range(args.sessions)]
+        await asyncio.gather(*(s.open(server.url, i * args.ramp / args.sessions) for i, s in enumerate(sessions)))
+        loaded_rss, cpu_start = server.rss(), server.cpu_seconds()
+
+        pass_rss = []
+        for _ in range(args.passes):
+            await asyncio.gather(*(s.play(scenario) for s in sessions))
+            pass_rss.append(server.rss())
+        cpu = server.cpu_seconds() - cpu_start
+        await asyncio.gather(*(s.close() for s in sessions))
+
+    latencies = [latency for s in sessions for latency in s.latencies]
+    errors = [error for s in sessions for error in s.errors]
+    return {
+        "name": name,
+        "sessions": args.sessions,
+        "reruns": len(latencies),
+        "load_p95_s": percentile([load for s in sessions for load in s.loads], 0.95),
+        "p50_s": percentile(latencies, 0.50),
+        "p95_s": percentile(latencies, 0.95),
+        "p99_s": percentile(latencies, 0.99),
+        "cpu_per_rerun_s": cpu / max(1, len(latencies)),
+        "rss_idle_bytes": idle_rss,
+        "rss_per_session_bytes": max(0, loaded_rss - idle_rss) // args.sessions,
+        "rss_growth_bytes": pass_rss[-1] - idle_rss,
+        "rss_growth_after_first_pass_bytes": pass_rss[-1] - pass_rss[0],
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+    }
+
+def compare(result, base, threshold):
+    """Teks perbandingan dengan baseline dan apakah hasil ini regresi"""
+    if base is None:
+        return "baru", False
+    notes, regressed = [], False
+    for key, label, minimum in (
+        ("p95_s", "p95", MIN_COMPARE_S),
+        ("cpu_per_rerun_s", "CPU", MIN_COMPARE_S),
+        ("rss_per_session_bytes", "RSS/sesi", MIN_COMPARE_BYTES),
+        ("rss_growth_after_first_pass_bytes", "RSS naik", MIN_COMPARE_BYTES),
+    ):
+        now, before = result[key], base[key]
+        if before > 0:
+            notes.append(f"{label} {now / before:.2f}x")
+        else:
+            notes.append(f"{label} {format_bytes(before)} -> {format_bytes(max(0, now))}")
+        if now - before > minimum and now > threshold * max(before, 0):
+            regressed = True
+    if result["errors"] > base["errors"]:
+        notes.append(f"error {base['errors']} -> {result['errors']}")
+        regressed = True
+    return ", ".join(notes), regressed
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban banyak sesi bersamaan untuk semua lab")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help="Jumlah sesi bersamaan per lab")
+    parser.add_argument("--passes", type=int, default=DEFAULT_PASSES, help="Berapa kali skenario diulang")
+    parser.add_argument("--think", type=float, default=DEFAULT_THINK_S, help="Jeda rata-rata antar-langkah (detik)")
+    parser.add_argument("--ramp", type=float, default=DEFAULT_RAMP_S, help="Rentang waktu mulai sesi (detik)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Batas waktu satu rerun (detik)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed nilai skenario")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (misalnya sebagai baseline)")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Faktor regresi")
+    parser.add_argument("--filter", default="", help="Hanya lab yang namanya memuat teks ini")
+    args = parser.parse_args()
+
+    if not os.path.isdir("/proc/self"):
+        sys.exit("Uji beban membaca CPU dan RSS dari /proc (hanya Linux)")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(item["name"], item["sessions"]): item for item in json.load(f)["results"]}
+
+    results, regressions = [], []
+    print(
+        f"{'lab':<20} {'rerun':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'CPU/rerun':>10} {'RSS/sesi':>10} "
+        f"{'RSS naik':>10} {'naik p2+':>10} {'error':>6}  {'vs. baseline' if baseline else ''}"
+    )
+    for name, (app, scenario) in LABS.items():
+        if args.filter not in name:
+            continue
+        result = asyncio.run(load_lab(name, app, scenario, args))
+        results.append(result)
+        note = ""
+        if baseline:
+            note, regressed = compare(result, baseline.get((name, args.sessions)), args.threshold)
+            if regressed:
+                regressions.append(name)
+                note += "  <- REGRESI"
+        print(
+            f"{name:<20} {result['reruns']:>6} {format_time(result['p50_s']):>9} {format_time(result['p95_s']):>9} "
+            f"{format_time(result['p99_s']):>9} {format_time(result['cpu_per_rerun_s']):>10} "
+            f"{format_bytes(result['rss_per_session_bytes']):>10} {format_bytes(max(0, result['rss_growth_bytes'])):>10} "
+            f"{format_bytes(max(0, result['rss_growth_after_first_pass_bytes'])):>10} "
+            f"{result['errors']:>6}  {note}"
+        )
+        for error in result["error_samples"]:
+            print(f"    ! {error}")
+
+    if args.json:
+        settings = {key: getattr(args, key) for key in ("sessions", "passes", "think", "ramp", "seed")}
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "settings": settings, "results": results}, f, indent=2)
+        print(f"\nHasil disimpan ke {args.json}")
+    if regressions:
+        print(f"\n{len(regressions)} regresi (> {args.threshold}x baseline): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""Instrumentasi per rerun: waktu dan memori tiap fase skrip, per halaman dan per sesi.
+
+Setiap app memanggil begin_rerun() di awal skrip dan end_rerun() di akhir. Di antaranya,
+waktu dibagi ke fase-fase berikut (waktu eksklusif: fase bersarang tidak dihitung dua kali):
+
+- widget: membaca input sidebar (rerun_phase("widget") ... rerun_phase("skrip"))
+- hitung: perhitungan NumPy (otomatis di ResultCache.get_or_compute, atau span("hitung"))
+- tunggu: menunggu hasil yang sedang dihitung sesi/replika lain
+- gambar: menyiapkan figure matplotlib: artist, data, sumbu (otomatis di figure_manager.use)
+- png: merender figure (Agg) dan meng-encode PNG (otomatis di figure_to_png)
+- vega: membangun dan mengirim grafik Altair
+- tabel: serialisasi st.dataframe
+- skrip: sisanya (elemen Streamlit lain, tata letak)
+
+Untuk setiap fase dicatat durasi, jumlah pemanggilan, selisih RSS proses, dan bila
+VIRTUAL_LAB_TRACEMALLOC=1 juga selisih alokasi Python/NumPy (tracemalloc, memperlambat).
+
+Ekspor diatur lewat VIRTUAL_LAB_METRICS (dipisah koma, bawaan "off"):
+
+- prometheus: format teks Prometheus di http://127.0.0.1:9464/metrics (VIRTUAL_LAB_METRICS_PORT;
+  bila port dipakai replika lain, port berikutnya dicoba). Label: halaman dan fase; label sesi
+  sengaja tidak dipakai agar jumlah deret waktu tidak membengkak.
+- jsonl: satu baris JSON per rerun (dengan label sesi) di VIRTUAL_LAB_METRICS_DIR, satu file per
+  proses, dirotasi setiap 10 MB (5 cadangan).
+
+Modul ini tidak mengimpor Streamlit; tampilan fase rerun ada di panel debug (?debug=1).
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_ENV = "VIRTUAL_LAB_METRICS"              # "off", atau "prometheus", "jsonl", "prometheus,jsonl"
+METRICS_PORT_ENV = "VIRTUAL_LAB_METRICS_PORT"
+METRICS_DIR_ENV = "VIRTUAL_LAB_METRICS_DIR"
+TRACEMALLOC_ENV = "VIRTUAL_LAB_TRACEMALLOC"      # "1" untuk mencatat selisih alokasi per fase
+DEFAULT_PORT = 9464
+PORT_ATTEMPTS = 16                  # Port yang dicoba berurutan (satu per replika di host yang sama)
+DEFAULT_METRICS_DIR = os.path.join(tempfile.gettempdir(), "virtual_lab_metrics")
+JSONL_MAX_BYTES = 10 * 1024 * 1024
+JSONL_BACKUPS = 5
+
+PHASES = ("widget", "hitung", "tunggu", "gambar", "png", "vega", "tabel", "skrip")
+RERUN_BUCKETS_S = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RECENT_RERUNS = 200                 # Durasi rerun terakhir per halaman, untuk persentil di panel debug
+ACTIVE_SESSION_S = 300.0            # Sesi dianggap aktif bila rerun dalam 5 menit terakhir
+MAX_SESSIONS = 1024                 # Rerun terakhir per sesi yang disimpan untuk panel debug
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def current_rss():
+    """RSS proses saat ini (byte); RSS maksimum bila /proc tidak tersedia"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class Rerun:
+    """Catatan satu rerun skrip; waktu dibebankan ke fase yang sedang aktif (puncak tumpukan)"""
+
+    def __init__(self, page, session, trace_memory):
+        self.page = page
+        self.session = session
+        self.trace_memory = trace_memory
+        self.started = time.time()
+        self.phases = {}             # fase -> {"detik", "panggilan", "rss", "alokasi"}
+        self._stack = ["skrip"]
+        self._start = self._last = time.perf_counter()
+        self.rss_start = self._last_rss = current_rss()
+        self._last_traced = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+
+    def _charge(self):
+        """Membebankan waktu dan selisih memori sejak perpindahan fase terakhir ke fase aktif"""
+        now, rss = time.perf_counter(), current_rss()
+        phase = self.phases.setdefault(self._stack[-1], {"detik": 0.0, "panggilan": 0, "rss": 0, "alokasi": 0})
+        phase["detik"] += now - self._last
+        phase["rss"] += rss - self._last_rss
+        if self.trace_memory:
+            traced = tracemalloc.get_traced_memory()[0]
+            phase["alokasi"] += traced - self._last_traced
+            self._last_traced = traced
+        self._last, self._last_rss = now, rss
+
+    def _count(self, name):
+        self.phases.setdefault(name, {"detik": 0.0, "panggilan": 0, "rss": 0, "alokasi": 0})["panggilan"] += 1
+
+    def push(self, name):
+        self._charge()
+        self._stack.append(name)
+        self._count(name)
+
+    def pop(self):
+        self._charge()
+        self._stack.pop()
+
+    def set_base(self, name):
+        self._charge()
+        self._stack[0] = name
+        self._count(name)
+
+    def finish(self, status):
+        if status == "selesai":
+            self._charge()
+        # Rerun terputus berhenti pada perpindahan fase terakhirnya (bukan saat rerun berikutnya)
+        self.duration = self._last - self._start
+        self.rss_end = self._last_rss
+        self.status = status
+        if self.trace_memory:
+            self.traced_peak = tracemalloc.get_traced_memory()[1]
+        return self
+
+    def to_dict(self):
+        record = {
+            "waktu": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "halaman": self.page,
+            "sesi": self.session,
+            "pid": os.getpid(),
+            "status": self.status,
+            "durasi_ms": round(self.duration * 1e3, 3),
+            "rss_awal_mb": round(self.rss_start / 1024**2, 2),
+            "rss_akhir_mb": round(self.rss_end / 1024**2, 2),
+            "fase": {
+                name: {
+                    "ms": round(phase["detik"] * 1e3, 3),
+                    "panggilan": phase["panggilan"],
+                    "rss_delta_kb": round(phase["rss"] / 1024, 1),
+                    **({"alokasi_delta_kb": round(phase["alokasi"] / 1024, 1)} if self.trace_memory else {}),
+                }
+                for name, phase in self.phases.items()
+            },
+        }
+        if self.trace_memory:
+            record["alokasi_puncak_mb"] = round(self.traced_peak / 1024**2, 2)
+        return record
+
+# --- Agregat per Proses (untuk Prometheus dan panel debug) ---
+
+class _Aggregate:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reruns = {}          # (halaman, status) -> jumlah
+        self.buckets = {}         # halaman -> [jumlah per batas bucket]
+        self.duration_sum = {}    # halaman -> total detik
+        self.recent = {}          # halaman -> deque durasi terakhir
+        self.phase_seconds = {}   # (halaman, fase) -> total detik
+        self.phase_calls = {}     # (halaman, fase) -> jumlah
+        self.phase_rss = {}       # (halaman, fase) -> total selisih RSS (byte)
+        self.sessions = {}        # halaman -> {sesi: waktu rerun terakhir}
+        self.last = {}            # sesi -> dict rerun terakhir (urutan sisip = LRU)
+
+    def add(self, rerun):
+        page = rerun.page
+        with self.lock:
+            self.reruns[(page, rerun.status)] = self.reruns.get((page, rerun.status), 0) + 1
+            buckets = self.buckets.setdefault(page, [0] * len(RERUN_BUCKETS_S))
+            for i, bound in enumerate(RERUN_BUCKETS_S):
+                if rerun.duration <= bound:
+                    buckets[i] += 1
+            self.duration_sum[page] = self.duration_sum.get(page, 0.0) + rerun.duration
+            self.recent.setdefault(page, deque(maxlen=RECENT_RERUNS)).append(rerun.duration)
+            for name, phase in rerun.phases.items():
+                key = (page, name)
+                self.phase_seconds[key] = self.phase_seconds.get(key, 0.0) + phase["detik"]
+                self.phase_calls[key] = self.phase_calls.get(key, 0) + phase["panggilan"]
+                self.phase_rss[key] = self.phase_rss.get(key, 0) + phase["rss"]
+            self.sessions.setdefault(page, {})[rerun.session] = time.monotonic()
+            self.last.pop(rerun.session, None)
+            self.last[rerun.session] = rerun.to_dict()
+            while len(self.last) > MAX_SESSIONS:
+                self.last.pop(next(iter(self.last)))
+
+    def active_sessions(self, page):
+        cutoff = time.monotonic() - ACTIVE_SESSION_S
+        sessions = self.sessions.get(page, {})
+        for session in [s for s, seen in sessions.items() if seen < cutoff]:
+            del sessions[session]
+        return len(sessions)
+
+_aggregate = _Aggregate()
+_local = threading.local()
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text():
+    """Semua metrik proses ini dalam format teks Prometheus (versi 0.0.4)"""
+    agg = _aggregate
+    lines = []
+    with agg.lock:
+        lines += [
+            "# HELP virtual_lab_reruns_total Jumlah rerun skrip per halaman dan status.",
+            "# TYPE virtual_lab_reruns_total counter",
+        ]
+        for (page, status), count in sorted(agg.reruns.items()):
+            lines.append(f'virtual_lab_reruns_total{{page="{_label(page)}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP virtual_lab_rerun_seconds Durasi rerun skrip per halaman.",
+            "# TYPE virtual_lab_rerun_seconds histogram",
+        ]
+        for page, buckets in sorted(agg.buckets.items()):
+            label = _label(page)
+            for bound, count in zip(RERUN_BUCKETS_S, buckets):
+                lines.append(f'virtual_lab_rerun_seconds_bucket{{page="{label}",le="{bound}"}} {count}')
+            total = sum(count for (p, _), count in agg.reruns.items() if p == page)
+            lines.append(f'virtual_lab_rerun_seconds_bucket{{page="{label}",le="+Inf"}} {total}')
+            lines.append(f'virtual_lab_rerun_seconds_sum{{page="{label}"}} {agg.duration_sum[page]:.6f}')
+            lines.append(f'virtual_lab_rerun_seconds_count{{page="{label}"}} {total}')
+
+        for metric, values, help_text, fmt in (
+            ("virtual_lab_phase_seconds_total", agg.phase_seconds, "Waktu eksklusif per fase rerun.", "{:.6f}"),
+            ("virtual_lab_phase_calls_total", agg.phase_calls, "Jumlah pemanggilan per fase rerun.", "{}"),
+            ("virtual_lab_phase_rss_delta_bytes_total", agg.phase_rss, "Total selisih RSS proses selama fase.", "{}"),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for (page, phase), value in sorted(values.items()):
+                lines.append(f'{metric}{{page="{_label(page)}",phase="{phase}"}} {fmt.format(value)}')
+
+        lines += [
+            "# HELP virtual_lab_active_sessions Sesi dengan rerun dalam 5 menit terakhir.",
+            "# TYPE virtual_lab_active_sessions gauge",
+        ]
+        for page in sorted(agg.sessions):
+            lines.append(f'virtual_lab_active_sessions{{page="{_label(page)}"}} {agg.active_sessions(page)}')
+
+    lines += [
+        "# HELP virtual_lab_process_rss_bytes RSS proses Streamlit ini.",
+        "# TYPE virtual_lab_process_rss_bytes gauge",
+        f"virtual_lab_process_rss_bytes {current_rss()}",
+    ]
+    return "\n".join(lines) + "\n"
+
+# --- Eksportir (dinyalakan sekali per proses) ---
+
+_exporters_lock = threading.Lock()
+_exporters = None   # {"prometheus": port atau None, "jsonl": path atau None}
+_jsonl_logger = None
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # tanpa log per permintaan scrape
+
+def _start_prometheus():
+    port = int(os.environ.get(METRICS_PORT_ENV, DEFAULT_PORT))
+    for candidate in range(port, port + PORT_ATTEMPTS):
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", candidate), _MetricsHandler)
+        except OSError:
+            continue  # port dipakai replika lain
+        threading.Thread(target=server.serve_forever, name="virtual-lab-metrics", daemon=True).start()
+        return candidate
+    return None
+
+def _start_jsonl():
+    global _jsonl_logger
+    directory = os.environ.get(METRICS_DIR_ENV, DEFAULT_METRICS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"rerun-{os.getpid()}.jsonl")
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=JSONL_MAX_BYTES, backupCount=JSONL_BACKUPS)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _jsonl_logger = logging.getLogger(f"virtual_lab.metrics.{os.getpid()}")
+    _jsonl_logger.propagate = False
+    _jsonl_logger.setLevel(logging.INFO)
+    _jsonl_logger.addHandler(handler)
+    return path
+
+def exporters():
+    """Eksportir aktif proses ini: {"prometheus": port, "jsonl": path}, dinyalakan saat pertama dipanggil"""
+    global _exporters
+    with _exporters_lock:
+        if _exporters is None:
+            enabled = {name.strip() for name in os.environ.get(METRICS_ENV, "off").lower().split(",")}
+            _exporters = {
+                "prometheus": _start_prometheus() if "prometheus" in enabled else None,
+                "jsonl": _start_jsonl() if "jsonl" in enabled else None,
+            }
+            if os.environ.get(TRACEMALLOC_ENV) == "1" and not tracemalloc.is_tracing():
+                tracemalloc.start()
+        return _exporters
+
+# --- API untuk App ---
+
+def _record(rerun, status):
+    rerun.finish(status)
+    _aggregate.add(rerun)
+    if _jsonl_logger is not None:
+        _jsonl_logger.info(json.dumps(rerun.to_dict(), ensure_ascii=False))
+
+def begin_rerun(page, session):
+    """Mulai mencatat rerun halaman ini untuk sesi ini (di thread skrip yang sedang berjalan).
+
+    Rerun sebelumnya yang tidak sampai end_rerun() (error, st.stop, st.rerun) dicatat dengan
+    status "terputus".
+    """
+    exporters()
+    previous = getattr(_local, "rerun", None)
+    if previous is not None:
+        _record(previous, "terputus")
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    _local.rerun = Rerun(page, session, tracemalloc.is_tracing())
+
+def end_rerun():
+    """Menyelesaikan catatan rerun ini, memperbarui agregat dan menulis ke eksportir"""
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        return None
+    _local.rerun = None
+    _record(rerun, "selesai")
+    return rerun
+
+def rerun_phase(name):
+    """Waktu skrip berikutnya (di luar span) dibebankan ke fase name, misalnya "widget" lalu "skrip" """
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None:
+        rerun.set_base(name)
+
+@contextmanager
+def span(name):
+    """Membebankan waktu blok ini ke fase name; tanpa efek di luar rerun yang sedang dicatat"""
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        yield
+        return
+    rerun.push(name)
+    try:
+        yield
+    finally:
+        rerun.pop()
+
+def last_rerun(session):
+    """Catatan rerun terakhir yang selesai untuk sesi ini (dict), atau None"""
+    with _aggregate.lock:
+        return _aggregate.last.get(session)
+
+def page_summary():
+    """Ringkasan per halaman untuk panel debug: jumlah rerun, p50/p95/maks (ms), sesi aktif"""
+    rows = []
+    with _aggregate.lock:
+        for page, recent in sorted(_aggregate.recent.items()):
+            durations = sorted(recent)
+            rows.append({
+                "halaman": page,
+                "rerun": sum(count for (p, _), count in _aggregate.reruns.items() if p == page),
+                "p50 (ms)": round(durations[len(durations) // 2] * 1e3, 1),
+                "p95 (ms)": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1e3, 1),
+                "maks (ms)": round(durations[-1] * 1e3, 1),
+                "sesi aktif": _aggregate.active_sessions(page),
+            })
+    return rows
@@ -0,0 +1,125 @@
+"""Fungsi pengurutan bilangan untuk Pengurut Tiga Bilangan (tanpa Streamlit).
+
+Selain sort_numbers untuk tiga bilangan, modul ini juga mengurutkan lembar nilai dari file
+CSV/XLSX: setiap baris diurutkan dengan satu np.sort(axis=1) per potongan baris, atau seluruh
+baris diurutkan dan diberi peringkat menurut satu kolom (argsort stabil).
+"""
+
+import csv
+import io
+from collections import namedtuple
+
+import numpy as np
+
+# Jumlah baris per potongan pada pengurutan per baris (memori sementara sebatas satu potongan)
+SORT_CHUNK_ROWS = 100_000
+
+# Pemisah kolom CSV yang dikenali; selain koma, angka boleh memakai koma desimal ("85,5")
+CSV_DELIMITERS = ",;\t"
+
+def sort_numbers(a, b, c):
+    """Fungsi untuk mengurutkan tiga bilangan."""
+    numbers = [a, b, c]
+    # Menggunakan fungsi sort bawaan Python lebih sederhana dan efisien
+    numbers.sort()
+    return numbers
+
+# --- Lembar Nilai (CSV/XLSX) ---
+
+# Isi file: kolom teks (misalnya nama siswa) {nama: array teks}, nama kolom angka (urut seperti
+# di file), dan matriks nilai float64 (baris, kolom angka). Sel kosong, juga sel yang hilang
+# pada baris yang lebih pendek dari baris terpanjang, bernilai NaN. Berupa tuple agar ukuran
+# dan isinya bisa dihitung dan dibekukan oleh ResultCache.
+Sheet = namedtuple("Sheet", ["labels", "value_names", "values"])
+
+def _to_float(cells, decimal_comma):
+    """Array float dari sel teks; ValueError bila ada sel yang bukan angka (sel kosong = NaN)"""
+    cells = np.char.strip(cells)
+    if decimal_comma:
+        cells = np.char.replace(cells, ",", ".")
+    return np.where(cells == "", "nan", cells).astype(float)
+
+def _column_floats(cells, decimal_comma):
+    """Nilai float kolom, atau None bila kolom memuat teks"""
+    try:
+        return _to_float(cells, decimal_comma)
+    except ValueError:
+        return None
+
+def _parse_cells(rows, decimal_comma=False):
+    """Sheet dari daftar baris sel (panjang baris boleh berbeda)"""
+    rows = [row for row in rows if "".join(map(str, row)).strip()]
+    if not rows:
+        raise ValueError("File tidak berisi data")
+    width = max(map(len, rows))
+    cells = np.array([row if len(row) == width else list(row) + [""] * (width - len(row)) for row in rows], dtype=str)
+
+    # Setiap kolom dikonversi sekali: baris pertama terpisah, karena bisa jadi header
+    body = [_column_floats(cells[1:, j], decimal_comma) for j in range(width)]
+    first = [_column_floats(cells[:1, j], decimal_comma) for j in range(width)]
+    # Baris pertama adalah header bila ada kolom yang angka di bawahnya tetapi bukan angka di atasnya
+    if any(body[j] is not None and first[j] is None for j in range(width)):
+        header = [cell.strip() or f"Kolom {j + 1}" for j, cell in enumerate(cells[0])]
+        cells = cells[1:]
+        columns = body
+    else:
+        header = [f"Kolom {j + 1}" for j in range(width)]
+        columns = [
+            np.concatenate([first[j], body[j]]) if body[j] is not None and first[j] is not None else None
+            for j in range(width)
+        ]
+    if all(column is None for column in columns):
+        raise ValueError("Tidak ada kolom angka yang bisa diurutkan")
+
+    labels = {header[j]: cells[:, j] for j in range(width) if columns[j] is None}
+    value_names = [header[j] for j in range(width) if columns[j] is not None]
+    values = np.column_stack([column for column in columns if column is not None])
+    return Sheet(labels, value_names, values)
+
+def load_sheet(data, filename):
+    """Membaca lembar nilai dari isi file CSV (pemisah , ; atau tab) atau XLSX (lembar pertama)"""
+    if filename.lower().endswith(".xlsx"):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError("Membaca file XLSX membutuhkan paket openpyxl (pip install openpyxl)") from None
+        workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+        try:
+            rows = [["" if cell is None else cell for cell in row] for row in workbook.worksheets[0].iter_rows(values_only=True)]
+        finally:
+            workbook.close()
+        return _parse_cells(rows)
+
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    try:
+        delimiter = csv.Sniffer().sniff(text[:64 * 1024], delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ","  # satu kolom saja, atau format tidak jelas
+    rows = list(csv.reader(io.StringIO(text), delimiter=delimiter))
+    return _parse_cells(rows, decimal_comma=delimiter != ",")
+
+def sort_rows(values, descending=False, chunk_rows=SORT_CHUNK_ROWS):
+    """Mengurutkan nilai di setiap baris, satu np.sort(axis=1) per potongan baris.
+
+    Sel kosong (NaN) selalu berada di akhir baris, juga pada urutan turun.
+    """
+    result = np.empty_like(values)
+    for start in range(0, len(values), chunk_rows):
+        block = values[start:start + chunk_rows]
+        if descending:
+            # Urutan turun = urutan naik dari -x; NaN tetap di akhir
+            result[start:start + chunk_rows] = -np.sort(-block, axis=1)
+        else:
+            result[start:start + chunk_rows] = np.sort(block, axis=1)
+    return result
+
+def rank_rows(column, descending=False):
+    """(urutan baris, peringkat 1..M) menurut satu kolom, dengan argsort stabil.
+
+    Nilai yang sama tetap berurutan seperti di file dan mendapat peringkat berurutan;
+    baris dengan sel kosong mendapat peringkat terakhir.
+    """
+    order = np.argsort(-column if descending else column, kind="stable")
+    ranks = np.empty(len(column), dtype=np.int64)
+    ranks[order] = np.arange(1, len(column) + 1)
+    return order, ranks
@@ -0,0 +1,86 @@
+"""Identitas sesi Streamlit untuk sumber daya yang dimiliki per sesi (misalnya pool figure).
+
+Streamlit tidak punya callback saat sesi berakhir, jadi satu thread pemeriksa per proses
+mencocokkan setiap pemilik dengan session_id Streamlit-nya secara berkala. Sesi yang tidak
+aktif lagi (tab ditutup) lebih lama dari SESSION_GRACE_S dianggap berakhir: job latarnya
+dibatalkan dan figure miliknya di pool ditutup. Masa tenggang ini membiarkan sesi yang hanya
+terputus sebentar (jaringan, tidur laptop) tersambung kembali tanpa kehilangan job-nya.
+"""
+
+import sys
+import threading
+import time
+import uuid
+
+import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+SESSION_KEY = "_virtual_lab_sesi"
+SESSION_POLL_S = 15.0      # Jeda pemeriksaan sesi yang sudah berakhir
+SESSION_GRACE_S = 60.0     # Sesi tidak aktif selama ini dianggap berakhir
+
+_sessions = {}             # pemilik -> [session_id Streamlit, waktu pertama terlihat tidak aktif]
+_sessions_lock = threading.Lock()
+_reaper = None
+
+def session_owner():
+    """ID unik sesi ini; tetap sama di setiap rerun selama tab browser masih terbuka"""
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = uuid.uuid4().hex
+    owner = st.session_state[SESSION_KEY]
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        _watch(owner, ctx.session_id)
+    return owner
+
+def _watch(owner, session_id):
+    global _reaper
+    with _sessions_lock:
+        entry = _sessions.get(owner)
+        if entry is None or entry[0] != session_id:
+            _sessions[owner] = [session_id, None]
+        if _reaper is None:
+            _reaper = threading.Thread(target=_reap, name="virtual-lab-sesi", daemon=True)
+            _reaper.start()
+
+def end_session(owner):
+    """Melepas sumber daya sesi yang sudah berakhir.
+
+    Modul yang belum diimpor proses ini (belum pernah dipakai) tidak punya sumber daya
+    untuk dilepas, jadi tidak diimpor di sini.
+    """
+    jobs = sys.modules.get("virtual_lab.jobs")
+    if jobs is not None:
+        jobs.cancel_session(owner)
+    figures = sys.modules.get("virtual_lab.figures")
+    if figures is not None:
+        figures.figure_manager.release_owner(owner)
+
+def reap_sessions(now=None):
+    """Mengakhiri pemilik yang sesinya tidak aktif lebih lama dari SESSION_GRACE_S"""
+    if not runtime.exists():
+        return []
+    instance = runtime.get_instance()
+    now = time.monotonic() if now is None else now
+    ended = []
+    with _sessions_lock:
+        for owner, entry in list(_sessions.items()):
+            if instance.is_active_session(entry[0]):
+                entry[1] = None
+            elif entry[1] is None:
+                entry[1] = now
+            elif now - entry[1] >= SESSION_GRACE_S:
+                del _sessions[owner]
+                ended.append(owner)
+    for owner in ended:
+        end_session(owner)
+    return ended
+
+def _reap():
+    while True:
+        time.sleep(SESSION_POLL_S)
+        try:
+            reap_sessions()
+        except Exception:  # thread pemeriksa tidak boleh mati karena satu kegagalan
+            pass
@@ -0,0 +1,371 @@
+"""Fungsi simulasi sampling untuk Virtual Lab Distribusi Normal (tanpa Streamlit)."""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+# Batas memori default untuk satu blok sampel (MB), berlaku per proses worker
+DEFAULT_MEMORY_BUDGET_MB = 64
+
+# Jumlah sampel per aliran acak (stream). Nilainya tetap, sehingga pembagian N menjadi
+# blok dan seed tiap blok tidak bergantung pada jumlah worker -> hasil identik bit demi bit.
+BLOCK_SAMPLES = 250_000
+
+# Di bawah N ini, biaya mengirim tugas ke proses lain lebih besar dari manfaatnya
+PARALLEL_MIN_SAMPLES = 1_000_000
+
+# Jumlah bin histogram streaming per rentang 8 SE (rentang +/- 4 SE di sekitar mu)
+STREAMING_BINS_PER_8SE = 30
+
+# Parameter bentuk populasi non-normal
+BERNOULLI_P = 0.2      # Peluang sukses populasi Bernoulli (miring)
+LOGNORMAL_S = 0.75     # Simpangan baku log untuk populasi lognormal (miring ke kanan)
+BIMODAL_SHIFT = 0.9    # Jarak puncak populasi bimodal dari mu, dalam satuan sigma
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def rows_per_chunk(n, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    """Jumlah baris sampel (masing-masing berukuran n) yang muat dalam batas memori"""
+    return max(1, int(memory_budget_mb * 2**20) // (8 * n))
+
+
+def draw_population(rng, population, mu, sigma, size):
+    """Mengambil nilai acak dari populasi pilihan (semua berrata-rata mu dan simpangan baku sigma)"""
+    if population == "normal":
+        return rng.normal(loc=mu, scale=sigma, size=size)
+    if population == "uniform":
+        # Seragam pada [mu - sqrt(3) sigma, mu + sqrt(3) sigma]
+        half_width = np.sqrt(3) * sigma
+        return rng.uniform(mu - half_width, mu + half_width, size=size)
+    if population == "exponential":
+        # Eksponensial dengan skala sigma, digeser agar rata-ratanya mu
+        return mu - sigma + rng.exponential(scale=sigma, size=size)
+    if population == "bernoulli":
+        # Bernoulli(p) yang dibakukan: nilai mu + sigma (B - p) / sqrt(p(1-p))
+        p = BERNOULLI_P
+        return mu + sigma * ((rng.random(size=size) < p) - p) / np.sqrt(p * (1 - p))
+    if population == "lognormal":
+        # Lognormal(0, s) yang dibakukan -> populasi miring ke kanan
+        s = LOGNORMAL_S
+        mean, std = np.exp(s**2 / 2), np.sqrt((np.exp(s**2) - 1) * np.exp(s**2))
+        return mu + sigma * (rng.lognormal(0.0, s, size=size) - mean) / std
+    if population == "bimodal":
+        # Campuran 50:50 dua normal di mu -/+ d sigma, variansi total tetap sigma^2
+        d = BIMODAL_SHIFT
+        sign = np.where(rng.random(size=size) < 0.5, -1.0, 1.0)
+        return mu + sign * d * sigma + rng.normal(0.0, sigma * np.sqrt(1 - d**2), size=size)
+    raise ValueError(f"Populasi tidak dikenal: {population}")
+
+
+def _exact_means(rng, population, mu, sigma, n, N):
+    """Jalur cepat: N rata-rata sampel langsung dari distribusi jumlahnya, tanpa N x n nilai.
+
+    Mengembalikan None bila populasi tidak memiliki distribusi jumlah yang murah.
+    """
+    if population == "normal":
+        # Rata-rata sampel normal tepat berdistribusi Normal(mu, sigma / sqrt(n))
+        return rng.normal(loc=mu, scale=sigma / np.sqrt(n), size=N)
+    if population == "exponential":
+        # Jumlah n eksponensial(skala sigma) berdistribusi Gamma(n, sigma)
+        return mu - sigma + rng.gamma(shape=n, scale=sigma, size=N) / n
+    if population == "bernoulli":
+        # Jumlah n Bernoulli(p) berdistribusi Binomial(n, p)
+        p = BERNOULLI_P
+        return mu + sigma * (rng.binomial(n, p, size=N) / n - p) / np.sqrt(p * (1 - p))
+    if population == "bimodal":
+        # Banyaknya anggota komponen kanan ~ Binomial(n, 1/2); sisanya jumlah normal biasa
+        d = BIMODAL_SHIFT
+        k = rng.binomial(n, 0.5, size=N)
+        spread = rng.normal(0.0, sigma * np.sqrt(1 - d**2) / np.sqrt(n), size=N)
+        return mu + (2 * k / n - 1) * d * sigma + spread
+    return None
+
+
+def sample_means(mu, sigma, n, N, rng=None, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                 population="normal", fast_path=True):
+    """Menghasilkan N rata-rata sampel berukuran n dari populasi pilihan (rata-rata mu, simpangan baku sigma).
+
+    Bila fast_path aktif dan distribusi jumlahnya diketahui (normal, eksponensial, Bernoulli,
+    bimodal), rata-rata diambil langsung dari distribusi tersebut. Selain itu sampel diambil
+    per blok berukuran (baris, n) dari numpy.random.Generator lalu direduksi dengan
+    mean(axis=1), sehingga memori puncak untuk sampel mentah tidak melebihi
+    memory_budget_mb berapa pun nilai N.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    if fast_path:
+        means = _exact_means(rng, population, mu, sigma, n, N)
+        if means is not None:
+            return means
+
+    chunk = rows_per_chunk(n, memory_budget_mb)
+    means = np.empty(N)
+    for start in range(0, N, chunk):
+        stop = min(start + chunk, N)
+        block = draw_population(rng, population, mu, sigma, (stop - start, n))
+        block.mean(axis=1, out=means[start:stop])
+    return means
+
+
+def sweep_sample_sizes(mu, sigma, n_max, N, rng=None, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                       population="normal", bins=100, on_chunk=None):
+    """Distribusi rata-rata sampel untuk setiap ukuran n = 2..n_max dari satu matriks (N, n_max).
+
+    Rata-rata untuk semua panjang awalan didapat dari satu cumsum per blok, jadi 99 simulasi
+    terpisah menjadi satu. Mengembalikan (n_values, se_empiris, edges, counts) dengan counts
+    berbentuk (len(n_values), bins): histogram rata-rata sampel untuk tiap n pada tepi yang sama.
+    Bila on_chunk diberikan, fungsi itu dipanggil dengan (baris selesai, N) sebelum setiap blok
+    (boleh melempar untuk membatalkan sapuan).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    n_values = np.arange(2, n_max + 1)
+    # Tepi histogram cukup lebar untuk n terkecil (sebaran paling lebar)
+    half_width = 4 * sigma / np.sqrt(n_values[0])
+    edges = np.linspace(mu - half_width, mu + half_width, bins + 1)
+
+    counts = np.zeros((len(n_values), bins), dtype=np.int64)
+    sum_dev = np.zeros(len(n_values))
+    sum_sq_dev = np.zeros(len(n_values))
+    row_offsets = np.arange(len(n_values))[None, :] * bins
+
+    chunk = rows_per_chunk(n_max, memory_budget_mb)
+    for start in range(0, N, chunk):
+        if on_chunk is not None:
+            on_chunk(start, N)
+        rows = min(chunk, N - start)
+        block = draw_population(rng, population, mu, sigma, (rows, n_max))
+        # Rata-rata tiap awalan: cumsum / n, hanya untuk n >= 2
+        prefix_means = np.cumsum(block, axis=1)[:, 1:] / n_values
+
+        deviations = prefix_means - mu   # dipusatkan agar jumlah kuadrat tetap akurat
+        sum_dev += deviations.sum(axis=0)
+        sum_sq_dev += (deviations ** 2).sum(axis=0)
+
+        # Semua histogram sekaligus: indeks bin digeser per n lalu dihitung dengan satu bincount
+        # (nilai di luar tepi histogram diabaikan)
+        bin_idx = np.searchsorted(edges, prefix_means, side="right") - 1
+        inside = (bin_idx >= 0) & (bin_idx < bins)
+        flat_idx = (bin_idx + row_offsets)[inside]
+        counts += np.bincount(flat_idx, minlength=counts.size).reshape(counts.shape)
+
+    mean_dev = sum_dev / N
+    se = np.sqrt(np.maximum(sum_sq_dev / N - mean_dev ** 2, 0) * N / max(N - 1, 1))
+    return n_values, se, edges, counts
+
+
+def population_pdf(x, population, mu, sigma):
+    """Fungsi kepadatan populasi pada titik x (None untuk populasi diskret Bernoulli)"""
+    if population == "normal":
+        return normal_pdf(x, mu, sigma)
+    if population == "uniform":
+        half_width = np.sqrt(3) * sigma
+        return np.where(np.abs(x - mu) <= half_width, 1 / (2 * half_width), 0.0)
+    if population == "exponential":
+        z = x - (mu - sigma)
+        return np.where(z >= 0, np.exp(-np.maximum(z, 0) / sigma) / sigma, 0.0)
+    if population == "bernoulli":
+        return None
+    if population == "lognormal":
+        s = LOGNORMAL_S
+        mean, std = np.exp(s**2 / 2), np.sqrt((np.exp(s**2) - 1) * np.exp(s**2))
+        y = mean + (x - mu) * std / sigma  # nilai lognormal asli
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pdf = np.exp(-np.log(y) ** 2 / (2 * s**2)) / (y * s * np.sqrt(2 * np.pi))
+        return np.where(y > 0, pdf, 0.0) * std / sigma
+    if population == "bimodal":
+        d = BIMODAL_SHIFT
+        spread = sigma * np.sqrt(1 - d**2)
+        return 0.5 * normal_pdf(x, mu - d * sigma, spread) + 0.5 * normal_pdf(x, mu + d * sigma, spread)
+    raise ValueError(f"Populasi tidak dikenal: {population}")
+
+
+def bernoulli_support(mu, sigma):
+    """Dua nilai populasi Bernoulli yang dibakukan beserta peluangnya"""
+    p = BERNOULLI_P
+    scale = sigma / np.sqrt(p * (1 - p))
+    return np.array([mu - p * scale, mu + (1 - p) * scale]), np.array([1 - p, p])
+
+
+def normal_pdf(x, mu, sigma):
+    """Kepadatan Normal(mu, sigma)"""
+    return np.exp(-0.5 * ((x - mu) / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+
+
+def _block_means(task):
+    """Tugas satu worker: rata-rata sampel untuk satu blok dengan aliran acaknya sendiri"""
+    mu, sigma, n, rows, seed_seq, memory_budget_mb, population = task
+    return sample_means(mu, sigma, n, rows, np.random.default_rng(seed_seq), memory_budget_mb, population)
+
+
+@contextmanager
+def _main_script_hidden():
+    """Mengganti entri __main__ di sys.modules dengan modul kosong selama proses worker dibuat.
+
+    Proses "spawn" menjalankan ulang file __main__, dan di Streamlit itu adalah app.py
+    (seluruh app ikut berjalan di setiap worker). Worker cukup mengimpor modul ini. Modul
+    app sesi lain tidak diubah, dan entri hanya dikembalikan bila belum diganti rerun lain.
+    """
+    main = sys.modules.get("__main__")
+    stub = sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        if sys.modules.get("__main__") is stub:
+            if main is not None:
+                sys.modules["__main__"] = main
+            else:
+                del sys.modules["__main__"]
+
+
+def _get_pool(workers):
+    """Process pool yang dipakai ulang antar-rerun (dibuat ulang bila jumlah worker berubah).
+
+    Semua worker dijalankan sekaligus saat pool dibuat, di bawah satu kunci per proses, jadi
+    __main__ hanya disembunyikan sekali di sini dan submit berikutnya tidak membuat worker baru.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # "spawn" aman dipakai dari server Streamlit yang multi-thread
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            # Setiap submit membuat worker baru selama belum ada yang menganggur, dan tidak ada
+            # worker yang menganggur sebelum tugas pertamanya selesai: semua worker dibuat di sini
+            with _main_script_hidden():
+                warmup = [pool.submit(os.getpid) for _ in range(workers)]
+            for future in warmup:
+                future.result()
+            _pool, _pool_workers = pool, workers
+        return _pool
+
+
+def iter_block_means(mu, sigma, n, N, seed=None, workers=1, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                     population="normal", check_cancelled=None):
+    """Menghasilkan rata-rata sampel blok demi blok, dalam urutan blok yang tetap.
+
+    N dibagi menjadi blok berukuran BLOCK_SAMPLES; blok ke-i memakai aliran acak anak ke-i
+    dari np.random.SeedSequence(seed). Untuk seed yang sama, hasilnya identik bit demi bit
+    berapa pun jumlah worker. Pada mode paralel paling banyak 2 x workers blok sedang
+    dikerjakan atau menunggu diambil, sehingga memori tetap terbatas. check_cancelled()
+    dipanggil sebelum setiap blok dan boleh melempar; blok paralel yang belum mulai dibatalkan.
+    """
+    check = check_cancelled if check_cancelled is not None else (lambda: None)
+    children = np.random.SeedSequence(seed).spawn(-(-N // BLOCK_SAMPLES))
+    tasks = [
+        (mu, sigma, n, min(BLOCK_SAMPLES, N - i * BLOCK_SAMPLES), child, memory_budget_mb, population)
+        for i, child in enumerate(children)
+    ]
+
+    if workers > 1 and len(tasks) > 1 and N >= PARALLEL_MIN_SAMPLES:
+        pool = _get_pool(workers)
+        pending = deque()
+        try:
+            for task in tasks:
+                check()
+                pending.append(pool.submit(_block_means, task))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                check()
+                yield pending.popleft().result()
+        finally:
+            # Dibatalkan atau generator ditutup lebih awal: blok yang belum mulai tidak dikerjakan
+            for future in pending:
+                future.cancel()
+    else:
+        for task in tasks:
+            check()
+            yield _block_means(task)
+
+
+def simulate_sample_means(mu, sigma, n, N, seed=None, workers=1, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                          population="normal", check_cancelled=None):
+    """Menghasilkan N rata-rata sampel secara reprodusibel, opsional paralel di beberapa proses"""
+    blocks = iter_block_means(mu, sigma, n, N, seed, workers, memory_budget_mb, population, check_cancelled)
+    return np.concatenate(list(blocks))
+
+
+def streaming_edges(mu, sigma, n, bins_per_8se=STREAMING_BINS_PER_8SE):
+    """Tepi histogram tetap pada rentang mu +/- 4 sigma, dengan lebar bin mengikuti SE = sigma / sqrt(n)"""
+    se = sigma / np.sqrt(n)
+    bins = int(np.ceil(bins_per_8se * sigma / se))
+    return np.linspace(mu - 4 * sigma, mu + 4 * sigma, bins + 1)
+
+
+def iter_streaming_histogram(mu, sigma, n, N, seed=None, workers=1, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                             population="normal", check_cancelled=None):
+    """Histogram dan statistik rata-rata sampel yang diperbarui blok demi blok.
+
+    Setiap langkah menghasilkan dict berisi edges, counts (jumlah per bin), count (sampel yang
+    sudah diproses), outside (sampel di luar tepi histogram), mean dan std berjalan. Rata-rata
+    mentah tidak pernah disimpan seluruhnya, jadi memori tetap konstan berapa pun N. Array
+    counts yang sama diperbarui di setiap langkah.
+    """
+    edges = streaming_edges(mu, sigma, n)
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    count, mean, m2 = 0, 0.0, 0.0
+
+    for means in iter_block_means(mu, sigma, n, N, seed, workers, memory_budget_mb, population, check_cancelled):
+        counts += np.histogram(means, bins=edges)[0]
+
+        # Penggabungan mean/variansi berjalan (Chan dkk.) dengan statistik blok baru
+        block_count, block_mean = len(means), means.mean()
+        block_m2 = np.sum((means - block_mean) ** 2)
+        delta = block_mean - mean
+        total = count + block_count
+        mean += delta * block_count / total
+        m2 += block_m2 + delta**2 * count * block_count / total
+        count = total
+
+        yield {
+            "edges": edges,
+            "counts": counts,
+            "count": count,
+            "outside": count - int(counts.sum()),
+            "mean": mean,
+            "std": np.sqrt(m2 / max(count - 1, 1)),
+        }
+
+
+def simulate_histogram(mu, sigma, n, N, seed, workers=1, population="normal", streaming=True,
+                       memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, on_progress=None, render_interval_s=0.5,
+                       check_cancelled=None):
+    """Menjalankan simulasi dan mengembalikan (rata-rata histogram, density, edges).
+
+    Pada mode streaming, histogram dibangun blok demi blok tanpa menyimpan semua rata-rata
+    sampel. Bila on_progress diberikan, fungsi itu dipanggil dengan (jumlah sampel, rata-rata,
+    density, edges) sementara paling sering sekali per render_interval_s. check_cancelled()
+    dipanggil di setiap batas blok (lihat iter_block_means).
+    """
+    # Simulasi Pengambilan Sampel (Distribusi Rata-rata Sampel)
+    # Sampel diambil per blok (baris, n) sesuai batas memori, lalu dirata-ratakan per baris.
+    # Untuk N besar, blok-blok dibagi ke beberapa proses dengan aliran acak independen.
+    # Populasi normal, eksponensial, Bernoulli dan bimodal memakai distribusi jumlah yang eksak.
+    if streaming:
+        last_render = 0.0
+        snapshots = iter_streaming_histogram(mu, sigma, n, N, seed, workers, memory_budget_mb, population, check_cancelled)
+        for snapshot in snapshots:
+            edges = snapshot["edges"]
+            density = snapshot["counts"] / (snapshot["count"] * np.diff(edges))
+            if snapshot["count"] == N:
+                break
+            # Gambar ulang dibatasi agar waktu render tidak mendominasi simulasi
+            if on_progress is not None and time.perf_counter() - last_render >= render_interval_s:
+                on_progress(snapshot["count"], snapshot["mean"], density, edges)
+                last_render = time.perf_counter()
+        return float(snapshot["mean"]), density, edges
+
+    sample_means = simulate_sample_means(mu, sigma, n, N, seed, workers, memory_budget_mb, population, check_cancelled)
+    density, edges = np.histogram(sample_means, bins=30, density=True)
+    return float(np.mean(sample_means)), density, edges
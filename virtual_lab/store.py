@@ -0,0 +1,233 @@
+"""Penyimpanan hasil di disk, dipakai bersama oleh semua proses/replika di satu host.
+
+Setiap entri adalah satu file .npz bernama hash SHA-256 dari (nama cache, kunci).
+File ditulis ke file sementara lalu di-rename (os.replace), sehingga proses lain tidak
+pernah membaca file setengah jadi. Isi file hanya array NumPy dan tata letak JSON
+(tanpa pickle). Bila total ukuran melewati batas, file yang paling lama tidak dipakai dihapus.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+STORE_ENV = "VIRTUAL_LAB_STORE"          # Direktori penyimpanan; "off" untuk menonaktifkan
+STORE_MB_ENV = "VIRTUAL_LAB_STORE_MB"    # Batas ukuran total (MB)
+DEFAULT_STORE_DIR = os.path.join(tempfile.gettempdir(), "virtual_lab_store")
+DEFAULT_STORE_MB = 1024
+MAX_ITEM_BYTES = 64 * 1024 * 1024        # Entri lebih besar dari ini tidak disimpan ke disk
+STORE_FORMAT = 1                         # Naikkan bila format isi file berubah
+LOCK_STALE_S = 600.0                     # Kunci lebih tua dari ini dianggap milik proses yang mati
+LOCK_POLL_S = 0.05
+RESCAN_EVERY_WRITES = 100                # Ukuran direktori dihitung ulang penuh setiap sekian tulisan
+
+def _pack(value, arrays):
+    """Mengubah nilai (tuple/list/array/bytes/str/angka) menjadi tata letak JSON + array bernama"""
+    if isinstance(value, (tuple, list)):
+        return {"t" if isinstance(value, tuple) else "l": [_pack(item, arrays) for item in value]}
+    if value is None or (isinstance(value, (bool, int, float, str)) and not isinstance(value, np.generic)):
+        if isinstance(value, float) and not np.isfinite(value):
+            return {"f": repr(value)}
+        return {"v": value}
+    name = f"a{len(arrays)}"
+    if isinstance(value, bytes):
+        arrays[name] = np.frombuffer(value, dtype=np.uint8)
+        return {"b": name}
+    value = np.asarray(value)
+    if value.dtype == object:
+        raise TypeError(f"tipe tidak bisa disimpan ke disk: {type(value).__name__}")
+    arrays[name] = value
+    return {"a": name, "s": value.ndim == 0}
+
+def _unpack(layout, arrays):
+    if "t" in layout:
+        return tuple(_unpack(item, arrays) for item in layout["t"])
+    if "l" in layout:
+        return [_unpack(item, arrays) for item in layout["l"]]
+    if "v" in layout:
+        return layout["v"]
+    if "f" in layout:
+        return float(layout["f"])
+    if "b" in layout:
+        return arrays[layout["b"]].tobytes()
+    value = arrays[layout["a"]]
+    return value[()] if layout["s"] else value
+
+class DiskStore:
+    """Direktori file .npz berbatas ukuran, aman untuk banyak proses"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+        self.evictions = 0
+        self._approx_bytes = None   # perkiraan ukuran direktori (tulisan proses lain tidak terhitung)
+
+    def path_for(self, namespace, key, suffix=".npz"):
+        digest = hashlib.sha256(repr((STORE_FORMAT, namespace, key)).encode()).hexdigest()
+        return os.path.join(self.directory, digest + suffix)
+
+    def contains(self, namespace, key):
+        return os.path.exists(self.path_for(namespace, key))
+
+    def acquire(self, namespace, key):
+        """Membuat file kunci untuk key; False bila proses lain sedang menghitungnya"""
+        path = self.path_for(namespace, key, ".lock")
+        for _ in range(2):
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(path) < LOCK_STALE_S:
+                        return False
+                    os.remove(path)  # kunci basi: pemiliknya berhenti sebelum selesai
+                except FileNotFoundError:
+                    pass
+        return False
+
+    def touch_lock(self, namespace, key):
+        """Memperbarui waktu kunci agar proses yang bekerja lama tidak dianggap basi"""
+        try:
+            os.utime(self.path_for(namespace, key, ".lock"))
+        except FileNotFoundError:
+            pass
+
+    def release(self, namespace, key):
+        try:
+            os.remove(self.path_for(namespace, key, ".lock"))
+        except FileNotFoundError:
+            pass
+
+    def wait(self, namespace, key, check=None):
+        """Menunggu proses lain selesai menghitung key, lalu memuat hasilnya (None bila gagal).
+
+        Menunggu selama kunci masih diperbarui pemiliknya (touch_lock), jadi perhitungan yang
+        lebih lama dari LOCK_STALE_S tetap ditunggu. check() dipanggil di setiap putaran dan
+        boleh melempar (misalnya JobCancelled), sehingga penunggu bisa berhenti kapan saja.
+        """
+        lock_path = self.path_for(namespace, key, ".lock")
+        while True:
+            try:
+                if time.time() - os.path.getmtime(lock_path) >= LOCK_STALE_S:
+                    break  # pemilik kunci berhenti tanpa melepasnya
+            except FileNotFoundError:
+                break
+            if check is not None:
+                check()
+            time.sleep(LOCK_POLL_S)
+        return self.load(namespace, key)
+
+    def load(self, namespace, key):
+        """Nilai tersimpan untuk key, atau None bila tidak ada (atau baru saja dihapus proses lain)"""
+        path = self.path_for(namespace, key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            os.utime(path)  # tandai baru dipakai (untuk urutan LRU)
+        except (FileNotFoundError, ValueError, OSError, KeyError):
+            return None
+        self.reads += 1
+        return _unpack(json.loads(arrays.pop("__layout__").item()), arrays)
+
+    def save(self, namespace, key, value):
+        """Menulis nilai secara atomik; nilai yang terlalu besar atau tidak didukung dilewati"""
+        arrays = {}
+        try:
+            layout = _pack(value, arrays)
+        except TypeError:
+            return False
+        if sum(array.nbytes for array in arrays.values()) > MAX_ITEM_BYTES:
+            return False
+        arrays["__layout__"] = np.array(json.dumps(layout))
+
+        path = self.path_for(namespace, key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.writes += 1
+        with self._lock:
+            if self._approx_bytes is not None:
+                self._approx_bytes += size
+            rescan = (
+                self._approx_bytes is None or self._approx_bytes > self.max_bytes
+                or self.writes % RESCAN_EVERY_WRITES == 0
+            )
+        if rescan:
+            self._enforce_limit()
+        return True
+
+    def _enforce_limit(self):
+        """Menghapus file yang paling lama tidak dipakai sampai total ukuran di bawah batas"""
+        with self._lock:
+            files = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".npz"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except FileNotFoundError:
+                    pass  # sudah dihapus proses lain
+                total -= size
+            self._approx_bytes = total
+
+    def usage(self):
+        """(jumlah file, total byte) di direktori penyimpanan"""
+        count = total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    total += entry.stat().st_size
+                    count += 1
+                except FileNotFoundError:
+                    pass
+        return count, total
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """DiskStore bersama sesuai variabel lingkungan, atau None bila dinonaktifkan"""
+    global _store
+    directory = os.environ.get(STORE_ENV, DEFAULT_STORE_DIR)
+    if directory.lower() == "off":
+        return None
+    with _store_lock:
+        if _store is None:
+            max_mb = float(os.environ.get(STORE_MB_ENV, DEFAULT_STORE_MB))
+            _store = DiskStore(directory, int(max_mb * 1024 * 1024))
+        return _store
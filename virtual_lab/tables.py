@@ -0,0 +1,118 @@
+"""Tabel hasil berbasis Arrow: dipaginasi di server, dengan ekspor CSV/Parquet hasil lengkap.
+
+Kolom tabel adalah array NumPy 1-D yang sudah ada (misalnya U_n, S_n atau koordinat titik).
+Yang dikirim ke browser hanya jendela baris halaman yang sedang dibuka, sebagai pyarrow.Table:
+array kontigu dibungkus tanpa disalin (pa.array memakai buffer NumPy yang sama), dan tidak ada
+konversi ke pandas. Pemilih halaman ada di dalam fragmen, jadi pindah halaman hanya
+menjalankan ulang tabel itu.
+
+Ekspor dibuat saat tombol unduh diklik (di thread terpisah, tanpa rerun) dan ditulis per batch
+EXPORT_BATCH_ROWS baris ke file sementara, jadi tidak ada salinan seluruh tabel dalam bentuk
+DataFrame. File yang sudah jadi tetap disimpan Streamlit utuh sebagai bytes di memori server
+(media file manager) selama sesi berjalan, karena itu ekspor dibatasi sebanyak baris pertama
+VIRTUAL_LAB_EXPORT_MAX_ROWS.
+
+pyarrow diimpor saat dipakai, agar start dingin halaman tidak bertambah (lihat importtime).
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import streamlit as st
+
+from virtual_lab.fragments import fragment_metrics
+from virtual_lab.metrics import span
+
+PAGE_ROWS = 1000             # Jumlah baris per halaman tabel
+EXPORT_BATCH_ROWS = 1_000_000
+EXPORT_MAX_ROWS_ENV = "VIRTUAL_LAB_EXPORT_MAX_ROWS"
+DEFAULT_EXPORT_MAX_ROWS = 2_000_000   # ~100 MB CSV untuk beberapa kolom desimal
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+def row_count(columns):
+    return len(next(iter(columns.values())))
+
+def arrow_window(columns, start, stop, digits=None):
+    """pyarrow.Table untuk baris [start, stop); kolom kontigu yang tidak dibulatkan tidak disalin.
+
+    digits: jumlah desimal untuk semua kolom desimal, atau dict {nama kolom: desimal}.
+    NaN (sel kosong) menjadi null, sehingga tampil dan diekspor sebagai sel kosong.
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for name, values in columns.items():
+        window = values[start:stop]
+        places = digits.get(name) if isinstance(digits, dict) else digits
+        if places is not None and np.issubdtype(window.dtype, np.floating):
+            window = np.round(window, places)  # pembulatan tampilan, hanya untuk jendela ini
+        arrays.append(pa.array(np.ascontiguousarray(window), from_pandas=True))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+def export_max_rows():
+    return int(os.environ.get(EXPORT_MAX_ROWS_ENV, DEFAULT_EXPORT_MAX_ROWS))
+
+def write_export(columns, fmt, batch_rows=EXPORT_BATCH_ROWS, max_rows=None):
+    """Isi file ekspor (bytes) untuk max_rows baris pertama, ditulis per batch lewat file sementara"""
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+
+    total = row_count(columns) if max_rows is None else min(row_count(columns), max_rows)
+    schema = arrow_window(columns, 0, 0).schema
+    with tempfile.TemporaryFile() as sink:
+        writer = pa_csv.CSVWriter(sink, schema) if fmt == "CSV" else pa_parquet.ParquetWriter(sink, schema)
+        try:
+            for start in range(0, total, batch_rows):
+                writer.write_table(arrow_window(columns, start, min(start + batch_rows, total)))
+        finally:
+            writer.close()
+        sink.seek(0)
+        return sink.read()
+
+@st.fragment
+def _paged_table(page, key, columns, digits, height):
+    with fragment_metrics(page, "tabel"):
+        total = row_count(columns)
+        pages = max(1, -(-total // PAGE_ROWS))
+        start = 0
+        if pages > 1:
+            number = st.number_input(
+                f"Halaman (dari {pages:,})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_halaman_{pages}"
+            )
+            start = (int(number) - 1) * PAGE_ROWS
+            st.caption(f"Baris {start + 1:,}–{min(start + PAGE_ROWS, total):,} dari {total:,}.")
+        with span("tabel"):
+            st.dataframe(arrow_window(columns, start, min(start + PAGE_ROWS, total), digits), height=height)
+
+def paged_table(page, key, columns, digits=None, height=300):
+    """Tabel satu halaman (PAGE_ROWS baris) dari kolom NumPy {nama: array}, dengan pemilih halaman.
+
+    page adalah nama halaman untuk metrics, key membedakan tabel di halaman yang sama, dan digits
+    membulatkan kolom desimal untuk tampilan saja (lihat arrow_window).
+    """
+    _paged_table(page, key, columns, digits, height)
+
+def export_buttons(columns, file_stem, key):
+    """Tombol unduh CSV dan Parquet (dibuat saat diklik, tanpa rerun), paling banyak export_max_rows() baris"""
+    total = row_count(columns)
+    rows = min(total, export_max_rows())
+    count = f"{rows:,} baris" if rows == total else f"{rows:,} baris pertama dari {total:,}"
+    for column, (label, (extension, mime)) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+        column.download_button(
+            f"⬇️ {label} ({count})",
+            data=lambda fmt=label: write_export(columns, fmt, max_rows=rows),
+            file_name=f"{file_stem}.{extension}",
+            mime=mime,
+            key=f"{key}_{extension}",
+            on_click="ignore",
+        )
+    if rows < total:
+        st.caption(
+            f"Ekspor dibatasi {rows:,} baris pertama karena file unduhan disimpan utuh di memori server "
+            f"(atur lewat {EXPORT_MAX_ROWS_ENV})."
+        )
@@ -0,0 +1,343 @@
+"""Matriks transformasi geometri 3x3 (koordinat homogen) dan pipeline transformasi (tanpa Streamlit).
+
+Bisa juga dijalankan sebagai skrip untuk mentransformasi file titik yang lebih besar dari RAM:
+
+    python -m virtual_lab.transformasi titik.npy hasil.npy --step rotasi:90,0,0 --step translasi:3,2
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+
+# Jenis transformasi yang bisa dipakai sebagai langkah pipeline
+TRANSFORM_TYPES = ("Translasi", "Rotasi", "Refleksi", "Dilatasi")
+REFLECTION_AXES = ("sumbu-X", "sumbu-Y", "garis y=x", "garis y=-x", "titik (0,0)")
+
+# Jumlah titik per potongan (chunk) pada transformasi out-of-core (~16 MB untuk float64)
+DEFAULT_CHUNK_POINTS = 1_000_000
+
+# --- Fungsi Transformasi Geometri ---
+
+def apply_transform(points, matrix):
+    """Menerapkan matriks transformasi ke koordinat titik."""
+    # Mengalikan Matriks Transformasi dengan Matriks Koordinat
+    transformed_points = matrix @ points
+    return transformed_points
+
+# 1. Translasi (Pergeseran)
+def get_translation_matrix(tx, ty):
+    """Matriks Translasi 3x3"""
+    return np.array([
+        [1, 0, tx],
+        [0, 1, ty],
+        [0, 0, 1]
+    ])
+
+# 2. Rotasi (Perputaran)
+def get_rotation_matrix(angle_deg, cx=0, cy=0):
+    """Matriks Rotasi 3x3 terhadap titik (cx, cy)"""
+    angle_rad = np.radians(angle_deg)
+    cos_a = np.cos(angle_rad)
+    sin_a = np.sin(angle_rad)
+    
+    # 1. Geser ke Pusat (cx, cy)
+    T_to_center = get_translation_matrix(-cx, -cy)
+    # 2. Rotasi di Origin
+    R = np.array([
+        [cos_a, -sin_a, 0],
+        [sin_a, cos_a, 0],
+        [0, 0, 1]
+    ])
+    # 3. Geser kembali
+    T_from_center = get_translation_matrix(cx, cy)
+    
+    # Kombinasi: T_from_center @ R @ T_to_center
+    return T_from_center @ R @ T_to_center
+
+# 3. Refleksi (Pencerminan)
+def get_reflection_matrix(axis_type):
+    """Matriks Refleksi 3x3"""
+    if axis_type == "sumbu-X": # Refleksi thd y=0
+        return np.array([
+            [1, 0, 0],
+            [0, -1, 0],
+            [0, 0, 1]
+        ])
+    elif axis_type == "sumbu-Y": # Refleksi thd x=0
+        return np.array([
+            [-1, 0, 0],
+            [0, 1, 0],
+            [0, 0, 1]
+        ])
+    elif axis_type == "garis y=x":
+        return np.array([
+            [0, 1, 0],
+            [1, 0, 0],
+            [0, 0, 1]
+        ])
+    elif axis_type == "garis y=-x":
+        return np.array([
+            [0, -1, 0],
+            [-1, 0, 0],
+            [0, 0, 1]
+        ])
+    # Bisa ditambahkan refleksi terhadap titik (0,0) / Origin
+    elif axis_type == "titik (0,0)":
+        return np.array([
+            [-1, 0, 0],
+            [0, -1, 0],
+            [0, 0, 1]
+        ])
+
+# 4. Dilatasi (Perkalian)
+def get_dilation_matrix(k, cx=0, cy=0):
+    """Matriks Dilatasi 3x3 terhadap titik (cx, cy)"""
+    # 1. Geser ke Pusat (cx, cy)
+    T_to_center = get_translation_matrix(-cx, -cy)
+    # 2. Dilatasi di Origin
+    D = np.array([
+        [k, 0, 0],
+        [0, k, 0],
+        [0, 0, 1]
+    ])
+    # 3. Geser kembali
+    T_from_center = get_translation_matrix(cx, cy)
+    
+    # Kombinasi: T_from_center @ D @ T_to_center
+    return T_from_center @ D @ T_to_center
+
+# --- Pipeline Transformasi ---
+
+def get_step_matrix(transform_type, params):
+    """Matriks 3x3 untuk satu langkah pipeline, misalnya ("Rotasi", (90, 0, 0))"""
+    if transform_type == "Translasi":
+        return get_translation_matrix(*params)
+    elif transform_type == "Rotasi":
+        return get_rotation_matrix(*params)
+    elif transform_type == "Refleksi":
+        return get_reflection_matrix(*params)
+    elif transform_type == "Dilatasi":
+        return get_dilation_matrix(*params)
+    raise ValueError(f"Jenis transformasi tidak dikenal: {transform_type}")
+
+def compose_transforms(steps):
+    """Menggabungkan daftar langkah (jenis, parameter) menjadi satu matriks 3x3.
+
+    Langkah pertama diterapkan lebih dulu, jadi hasilnya M_k @ ... @ M_2 @ M_1. Titik
+    cukup dikalikan sekali dengan matriks gabungan ini, bukan sekali per langkah.
+    """
+    composed = np.identity(3)
+    for transform_type, params in steps:
+        composed = get_step_matrix(transform_type, params) @ composed
+    return composed
+
+def apply_transform_xy(xy, matrix):
+    """Menerapkan matriks homogen 3x3 ke titik berbentuk (M, 2) dengan satu perkalian matriks.
+
+    Baris homogen berisi angka 1 tidak perlu dibuat: bagian linear dikalikan lalu
+    translasinya ditambahkan lewat broadcasting.
+    """
+    xy = np.asarray(xy, dtype=float)
+    return xy @ matrix[:2, :2].T + matrix[:2, 2]
+
+def load_points(data, filename):
+    """Membaca titik (M, 2) dari isi file CSV atau .npy: satu titik per baris.
+
+    CSV tanpa header harus berisi tepat dua kolom (x, y); CSV dengan header boleh berisi
+    kolom lain asalkan ada kolom bernama x dan y. Bentuk lain, misalnya (2, M), ditolak
+    alih-alih ditebak, karena (2, 2) atau (3, 3) bisa dibaca dua arah.
+    """
+    if filename.lower().endswith(".npy"):
+        points = np.load(io.BytesIO(data), allow_pickle=False)
+    else:
+        text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+        header = [name.strip().lower() for name in text.lstrip().split("\n", 1)[0].split(",")]
+        try:
+            [float(value) for value in header]
+        except ValueError:
+            # Baris pertama adalah header: kolom x dan y dicari menurut nama
+            if "x" not in header or "y" not in header:
+                raise ValueError(f"Header CSV harus memuat kolom x dan y, ditemukan: {', '.join(header)}") from None
+            points = np.loadtxt(
+                io.StringIO(text), delimiter=",", skiprows=1, ndmin=2, usecols=(header.index("x"), header.index("y"))
+            )
+        else:
+            points = np.loadtxt(io.StringIO(text), delimiter=",", ndmin=2)
+
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f"Bentuk titik tidak valid: {points.shape}, harus (M, 2) dengan satu titik (x, y) per baris")
+    return points
+
+# --- Animasi Transformasi ---
+
+def interpolate_matrices(transform_type, params, frames):
+    """Matriks (frames, 3, 3) yang bergerak dari identitas ke transformasi pilihan.
+
+    Rotasi memutar 0 -> sudut, dilatasi menskalakan 1 -> k, translasi menggeser 0 -> (tx, ty).
+    Refleksi terhadap titik diputar 180° terhadap titik itu. Refleksi terhadap garis dianimasikan
+    sebagai bidang yang dibalik 180° di ruang 3D dengan garis cermin sebagai poros, lalu dilihat
+    dari atas: bentuk menyempit tegak lurus garis cermin (determinan cos(πt)), tepat segaris
+    dengan cermin di tengah animasi (bidang terlihat dari samping), lalu melebar lagi dalam
+    keadaan tercermin. Titik di garis cermin tidak bergerak.
+    """
+    t = np.linspace(0.0, 1.0, frames)
+    matrices = np.zeros((frames, 3, 3))
+    matrices[:, 2, 2] = 1
+
+    if transform_type == "Translasi":
+        tx, ty = params
+        matrices[:, 0, 0] = matrices[:, 1, 1] = 1
+        matrices[:, 0, 2] = t * tx
+        matrices[:, 1, 2] = t * ty
+    elif transform_type == "Rotasi":
+        angle_deg, cx, cy = (tuple(params) + (0, 0))[:3]
+        angle_rad = np.radians(angle_deg) * t
+        cos_a, sin_a = np.cos(angle_rad), np.sin(angle_rad)
+        # Sama dengan T_from_center @ R @ T_to_center untuk setiap sudut sekaligus
+        matrices[:, 0, 0], matrices[:, 0, 1] = cos_a, -sin_a
+        matrices[:, 1, 0], matrices[:, 1, 1] = sin_a, cos_a
+        matrices[:, 0, 2] = cx - cos_a * cx + sin_a * cy
+        matrices[:, 1, 2] = cy - sin_a * cx - cos_a * cy
+    elif transform_type == "Dilatasi":
+        k, cx, cy = (tuple(params) + (0, 0))[:3]
+        scale = 1 + (k - 1) * t
+        matrices[:, 0, 0] = matrices[:, 1, 1] = scale
+        matrices[:, 0, 2] = cx * (1 - scale)
+        matrices[:, 1, 2] = cy * (1 - scale)
+    elif transform_type == "Refleksi":
+        target = get_step_matrix(transform_type, params)
+        if np.linalg.det(target[:2, :2]) > 0:
+            # Refleksi titik (-I) = rotasi 180° terhadap pusatnya; luas tidak pernah nol
+            cx, cy = target[:2, 2] / 2
+            return interpolate_matrices("Rotasi", (180, cx, cy), frames)
+        # Proyeksi dari atas rotasi 3D sebesar πt terhadap garis cermin: I + (1 - cos πt)/2 (R - I)
+        flip = (1 - np.cos(np.pi * t)) / 2
+        matrices = np.identity(3) + flip[:, None, None] * (target - np.identity(3))
+    else:
+        raise ValueError(f"Jenis transformasi tidak dikenal: {transform_type}")
+    return matrices
+
+def pipeline_frame_matrices(steps, frames_per_step):
+    """Matriks animasi untuk seluruh pipeline: tiap langkah dianimasikan bergantian di atas langkah sebelumnya"""
+    prefix = np.identity(3)
+    parts = []
+    for transform_type, params in steps:
+        # Perkalian batch: (frames, 3, 3) @ (3, 3)
+        parts.append(interpolate_matrices(transform_type, params, frames_per_step) @ prefix)
+        prefix = get_step_matrix(transform_type, params) @ prefix
+    return np.concatenate(parts)
+
+def apply_transform_frames(matrices, xy):
+    """Menerapkan semua matriks (T, 3, 3) ke titik (M, 2) dalam satu einsum; hasil (T, M, 2)"""
+    xy = np.asarray(xy, dtype=float)
+    return np.einsum("tij,mj->tmi", matrices[:, :2, :2], xy) + matrices[:, None, :2, 2]
+
+def frames_to_svg(original_xy, frames_xy, duration_s=3.0, size=480, min_extent=10):
+    """Animasi SVG (SMIL) yang dijalankan di browser: satu poligon dengan atribut points yang berubah"""
+    all_x = np.concatenate([original_xy[:, 0], frames_xy[:, :, 0].ravel()])
+    all_y = np.concatenate([original_xy[:, 1], frames_xy[:, :, 1].ravel()])
+    padding = 2
+    x_min, x_max = min(all_x.min() - padding, -min_extent), max(all_x.max() + padding, min_extent)
+    y_min, y_max = min(all_y.min() - padding, -min_extent), max(all_y.max() + padding, min_extent)
+    width, height = x_max - x_min, y_max - y_min
+    stroke = max(width, height) / 300
+
+    def to_points(xy):
+        # Sumbu y SVG mengarah ke bawah, jadi y dibalik
+        return " ".join(f"{x:.3f},{-y:.3f}" for x, y in xy)
+
+    values = ";".join(to_points(frame) for frame in frames_xy)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size * height / width:.0f}" '
+        f'viewBox="{x_min:.3f} {-y_max:.3f} {width:.3f} {height:.3f}">'
+        f'<line x1="{x_min:.3f}" y1="0" x2="{x_max:.3f}" y2="0" stroke="gray" stroke-width="{stroke / 2:.4f}"/>'
+        f'<line x1="0" y1="{-y_max:.3f}" x2="0" y2="{-y_min:.3f}" stroke="gray" stroke-width="{stroke / 2:.4f}"/>'
+        f'<polygon points="{to_points(original_xy)}" fill="blue" fill-opacity="0.1" stroke="blue" stroke-width="{stroke:.4f}"/>'
+        f'<polygon points="{to_points(frames_xy[0])}" fill="red" fill-opacity="0.15" stroke="red" '
+        f'stroke-width="{stroke:.4f}" stroke-dasharray="{stroke * 4:.4f}">'
+        f'<animate attributeName="points" dur="{duration_s}s" repeatCount="indefinite" values="{values}"/>'
+        f'</polygon></svg>'
+    )
+
+# --- Transformasi Out-of-Core (memmap) ---
+
+def open_points(path, dtype=np.float64):
+    """Membuka file titik (M, 2) tanpa memuatnya ke RAM: .npy lewat mmap, selain itu biner mentah"""
+    if str(path).lower().endswith(".npy"):
+        points = np.load(path, mmap_mode="r")
+    else:
+        points = np.memmap(path, dtype=dtype, mode="r").reshape(-1, 2)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f"Bentuk titik tidak valid: {points.shape}, harus (M, 2)")
+    return points
+
+def create_points(path, count, dtype=np.float64):
+    """Membuat file keluaran (M, 2) sebagai memmap yang bisa ditulis (.npy atau biner mentah)"""
+    if str(path).lower().endswith(".npy"):
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(count, 2))
+    return np.memmap(path, dtype=dtype, mode="w+", shape=(count, 2))
+
+def apply_transform_memmap(source, target, matrix, chunk_points=DEFAULT_CHUNK_POINTS, on_chunk=None):
+    """Menerapkan matriks homogen 3x3 ke titik (M, 2) potongan demi potongan.
+
+    source dan target boleh berupa np.memmap; hanya satu potongan yang berada di memori pada
+    satu waktu, dan baris homogen berisi angka 1 tidak pernah dibuat. Bila on_chunk diberikan,
+    fungsi itu dipanggil dengan (titik selesai, jumlah titik) sebelum setiap potongan (boleh
+    melempar untuk membatalkan). Mengembalikan (jumlah titik, detik).
+    """
+    linear = np.ascontiguousarray(matrix[:2, :2].T, dtype=float)
+    shift = np.asarray(matrix[:2, 2], dtype=float)
+    count = source.shape[0]
+
+    start_time = time.perf_counter()
+    for start in range(0, count, chunk_points):
+        if on_chunk is not None:
+            on_chunk(start, count)
+        stop = min(start + chunk_points, count)
+        out = target[start:stop]
+        np.matmul(source[start:stop], linear, out=out)
+        out += shift
+    if isinstance(target, np.memmap):
+        target.flush()
+    return count, time.perf_counter() - start_time
+
+def transform_file(source_path, target_path, matrix, chunk_points=DEFAULT_CHUNK_POINTS, dtype=np.float64):
+    """Mentransformasi file titik ke file baru; mengembalikan (jumlah titik, detik, titik per detik)"""
+    source = open_points(source_path, dtype)
+    target = create_points(target_path, source.shape[0], np.result_type(source.dtype, np.float32))
+    count, elapsed = apply_transform_memmap(source, target, matrix, chunk_points)
+    del target  # Tutup memmap keluaran
+    return count, elapsed, count / elapsed if elapsed > 0 else float("inf")
+
+def parse_step(text):
+    """Membaca langkah pipeline dari teks, misalnya 'rotasi:90,0,0' atau 'refleksi:garis y=x'"""
+    name, _, args = text.partition(":")
+    matches = [t for t in TRANSFORM_TYPES if t.lower() == name.strip().lower()]
+    if not matches:
+        raise ValueError(f"Jenis transformasi tidak dikenal: {name} (pilih dari {', '.join(TRANSFORM_TYPES)})")
+    transform_type = matches[0]
+    if transform_type == "Refleksi":
+        if args.strip() not in REFLECTION_AXES:
+            raise ValueError(f"Sumbu refleksi tidak dikenal: {args} (pilih dari {', '.join(REFLECTION_AXES)})")
+        return transform_type, (args.strip(),)
+    return transform_type, tuple(float(value) for value in args.split(",") if value.strip())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transformasi geometri out-of-core untuk file titik (M, 2).")
+    parser.add_argument("source", help="File titik masukan (.npy atau biner mentah x,y)")
+    parser.add_argument("target", help="File keluaran (.npy atau biner mentah)")
+    parser.add_argument("--step", action="append", required=True, type=parse_step,
+                        help="Langkah pipeline, misalnya rotasi:90,0,0 (boleh diulang, diterapkan berurutan)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK_POINTS, help="Jumlah titik per potongan")
+    parser.add_argument("--dtype", default="float64", help="Tipe data untuk file biner mentah")
+    args = parser.parse_args(argv)
+
+    matrix = compose_transforms(args.step)
+    count, elapsed, throughput = transform_file(args.source, args.target, matrix, args.chunk, np.dtype(args.dtype))
+    print(f"{count:,} titik dalam {elapsed:.3f} detik ({throughput:,.0f} titik/detik)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Pemanas cache: menghitung lebih dulu kombinasi slider ke DiskStore di proses latar.
+
+Saat app pertama kali dimuat, start_warmer() menjalankan satu proses latar per lab
+(python -m virtual_lab.warmer), dan hanya satu per host lewat file kunci di direktori store.
+Proses itu mengambil daftar tugas dari modul lab (fungsi warm_tasks), melewati kunci yang
+sudah ada di disk, dan menulis progres ke file status JSON kecil yang dibaca panel debug.
+
+Bisa juga dijalankan langsung, misalnya saat deploy:
+
+    python -m virtual_lab.warmer clt --preset penuh
+"""
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from virtual_lab.store import get_store
+
+WARM_ENV = "VIRTUAL_LAB_WARM"   # Nama preset ("kecil", "penuh") atau "off"
+DEFAULT_PRESET = "kecil"
+STATUS_INTERVAL_S = 1.0         # Jeda minimum antar-penulisan file status
+WARM_LOCK = "pemanas"           # Namespace file kunci pemanas di store
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Lab -> modul yang berisi warm_tasks
+LABS = {
+    "deret": "virtual_lab.deret",
+    "clt": "virtual_lab.grafik_clt",
+    "transformasi": "virtual_lab.grafik_transformasi",
+}
+
+_started = set()
+_started_lock = threading.Lock()
+
+def _import_lab(lab):
+    return importlib.import_module(LABS[lab])
+
+def status_path(store, lab):
+    return os.path.join(store.directory, f"pemanas-{lab}.json")
+
+def _write_status(store, lab, status):
+    """Menulis file status secara atomik (tmp + os.replace)"""
+    fd, tmp_path = tempfile.mkstemp(dir=store.directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(status, f)
+    os.replace(tmp_path, status_path(store, lab))
+
+def read_status(store=None):
+    """Status terakhir semua pemanas di host ini (daftar dict), untuk panel debug"""
+    store = store or get_store()
+    if store is None:
+        return []
+    statuses = []
+    for lab in LABS:
+        try:
+            with open(status_path(store, lab)) as f:
+                statuses.append(json.load(f))
+        except (FileNotFoundError, ValueError):
+            pass
+    return statuses
+
+def warm(lab, preset=DEFAULT_PRESET, store=None, on_status=None):
+    """Menghitung semua tugas pemanasan lab ke store; mengembalikan status akhir.
+
+    Mengembalikan None bila pemanas lab yang sama sedang berjalan di proses lain.
+    """
+    store = store or get_store()
+    if store is None or not store.acquire(WARM_LOCK, lab):
+        return None
+    try:
+        tasks = _import_lab(lab).warm_tasks(preset)
+        started = time.time()
+        status = {
+            "lab": lab, "preset": preset, "state": "berjalan", "total": len(tasks),
+            "selesai": 0, "dihitung": 0, "sudah ada": 0, "gagal": 0,
+            "mulai": started, "diperbarui": started, "galat terakhir": None,
+        }
+        last_write = 0.0
+        for namespace, key, compute in tasks:
+            if store.contains(namespace, key):
+                status["sudah ada"] += 1
+            else:
+                try:
+                    store.save(namespace, key, compute())
+                    status["dihitung"] += 1
+                except Exception as e:  # satu kombinasi gagal tidak menghentikan pemanasan
+                    status["gagal"] += 1
+                    status["galat terakhir"] = repr(e)
+            status["selesai"] += 1
+
+            if time.monotonic() - last_write >= STATUS_INTERVAL_S or status["selesai"] == status["total"]:
+                if status["selesai"] == status["total"]:
+                    status["state"] = "selesai"
+                status["diperbarui"] = time.time()
+                _write_status(store, lab, status)
+                store.touch_lock(WARM_LOCK, lab)  # tanda pemanas masih hidup (bukan kunci basi)
+                if on_status is not None:
+                    on_status(status)
+                last_write = time.monotonic()
+        return status
+    finally:
+        store.release(WARM_LOCK, lab)
+
+def start_warmer(lab, preset=None):
+    """Menjalankan pemanas lab di proses latar, sekali per proses server (startup tidak tertahan)"""
+    preset = preset or os.environ.get(WARM_ENV, DEFAULT_PRESET)
+    if preset == "off" or get_store() is None:
+        return None
+    with _started_lock:
+        if lab in _started:
+            return None
+        _started.add(lab)
+    # Proses Python baru (bukan multiprocessing): di Streamlit, __main__ adalah app.py,
+    # dan proses "spawn" akan menjalankan ulang seluruh app
+    return subprocess.Popen(
+        [sys.executable, "-m", "virtual_lab.warmer", lab, "--preset", preset, "--latar"],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+    )
+
+def coverage(status):
+    """Proporsi domain slider yang sudah tersedia di disk (0..1)"""
+    if not status["total"]:
+        return 1.0
+    return (status["dihitung"] + status["sudah ada"]) / status["total"]
+
+def rate(status):
+    """Kombinasi per detik sejak pemanas mulai"""
+    elapsed = max(status["diperbarui"] - status["mulai"], 1e-9)
+    return status["selesai"] / elapsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Menghitung lebih dulu kombinasi slider Virtual Lab ke cache disk.")
+    parser.add_argument("lab", choices=[*LABS, "semua"])
+    parser.add_argument("--preset", default=os.environ.get(WARM_ENV, DEFAULT_PRESET))
+    parser.add_argument("--latar", action="store_true", help="prioritas rendah, tanpa keluaran (dipakai start_warmer)")
+    args = parser.parse_args(argv)
+
+    if args.latar:
+        # Proses latar tidak boleh mengganggu sesi siswa
+        if hasattr(os, "nice"):
+            os.nice(10)
+        for lab in LABS if args.lab == "semua" else (args.lab,):
+            warm(lab, args.preset)
+        return
+
+    def report(status):
+        print(
+            f"\r{status['lab']}: {status['selesai']:,}/{status['total']:,} "
+            f"(cakupan {coverage(status):.1%}, {rate(status):.1f}/s, gagal {status['gagal']})",
+            end="", flush=True,
+        )
+
+    for lab in LABS if args.lab == "semua" else (args.lab,):
+        if warm(lab, args.preset, on_status=report) is None:
+            print(f"{lab}: pemanas sedang berjalan di proses lain (atau store nonaktif), dilewati.")
+        else:
+            print()
+
+if __name__ == "__main__":
+    main()